@@ -1,13 +1,9 @@
 from fastapi import APIRouter, Depends
-from app.services.alpaca import AlpacaService
+from app.services.alpaca import AlpacaService, get_alpaca_service
 
 router = APIRouter()
 
 
-def get_alpaca_service():
-    return AlpacaService()
-
-
 @router.get("/account")
 async def get_account(alpaca_service: AlpacaService = Depends(get_alpaca_service)):
     return await alpaca_service.get_account_info()
@@ -15,9 +11,9 @@ async def get_account(alpaca_service: AlpacaService = Depends(get_alpaca_service
 
 @router.get("/positions")
 async def get_positions(alpaca_service: AlpacaService = Depends(get_alpaca_service)):
-    return alpaca_service.get_open_positions()
+    return await alpaca_service.get_open_positions_async()
 
 
 @router.get("/orders")
 async def get_orders(alpaca_service: AlpacaService = Depends(get_alpaca_service)):
-    return alpaca_service.get_orders()
+    return await alpaca_service.get_orders_async()
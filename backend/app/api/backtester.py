@@ -1,23 +1,224 @@
-from fastapi import APIRouter, Depends
-from ..backtester.backtester import Backtester
-from ..services.alpaca import get_alpaca_service
-from ..strategies.base import get_strategy
+import functools
+import json
+import logging
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from ..backtester.batch import run_batch
+from ..backtester.engine import VectorizedBacktester
+from ..backtester.optimizer import METRICS, optimize
+from ..backtester.walk_forward import walk_forward
+from ..core.executors import executors
+from ..services.alpaca import AlpacaService, get_alpaca_service
 
 router = APIRouter()
 
 
+class BacktestRequest(BaseModel):
+    symbol: str
+    strategy_name: str
+    start_date: str
+    end_date: str
+    timeframe: str = "1Day"
+    initial_capital: float = 100000
+    strategy_params: dict = Field(default_factory=dict)
+
+
+class BatchBacktestRequest(BaseModel):
+    symbols: List[str]
+    strategies: List[str]
+    start_date: str
+    end_date: str
+    timeframe: str = "1Day"
+    initial_capital: float = 100000
+    strategy_params: dict = Field(default_factory=dict)
+    include_trades: bool = False
+
+
+class OptimizeRequest(BaseModel):
+    symbol: str
+    strategy_name: str
+    start_date: str
+    end_date: str
+    param_grid: dict
+    metric: str = "return_pct"
+    top: int = 20
+    timeframe: str = "1Day"
+    initial_capital: float = 100000
+
+
+class WalkForwardRequest(BaseModel):
+    symbol: str
+    strategy_name: str
+    start_date: str
+    end_date: str
+    param_grid: dict
+    train_bars: int
+    test_bars: int
+    step_bars: int = None
+    anchored: bool = False
+    metric: str = "return_pct"
+    timeframe: str = "1Day"
+    initial_capital: float = 100000
+
+
 @router.post("/backtest")
 def run_backtest(
-    symbol: str,
-    strategy_name: str,
-    start_date: str,
-    end_date: str,
-    alpaca_service=Depends(get_alpaca_service),
+    body: BacktestRequest,
+    request: Request,
+    alpaca_service: AlpacaService = Depends(get_alpaca_service),
 ):
-    strategy = get_strategy(strategy_name)
-    if not strategy:
-        return {"error": f"Strategy '{strategy_name}' not found."}
+    strategy = request.app.state.strategy_manager.get_strategy_instance(
+        body.strategy_name, symbol=body.symbol, **body.strategy_params
+    )
+    if strategy is None:
+        raise HTTPException(
+            status_code=404, detail=f"Strategy '{body.strategy_name}' not found."
+        )
 
-    backtester = Backtester(alpaca_service, strategy, start_date, end_date)
-    results = backtester.run(symbol)
+    backtester = VectorizedBacktester(
+        alpaca_service, strategy, body.start_date, body.end_date, body.initial_capital
+    )
+    try:
+        results = backtester.run(body.symbol, body.timeframe)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error running backtest for {body.symbol}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error running backtest: {e}")
+    if "error" in results:
+        raise HTTPException(status_code=404, detail=results["error"])
     return results
+
+
+@router.post("/backtest/batch")
+async def run_batch_backtest(
+    body: BatchBacktestRequest,
+    request: Request,
+    alpaca_service: AlpacaService = Depends(get_alpaca_service),
+):
+    """Streams one JSON line per (symbol, strategy) result, in completion order."""
+    available = {
+        s["name"] for s in request.app.state.strategy_manager.get_available_strategies()
+    }
+    unknown = [name for name in body.strategies if name not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=404, detail=f"Strategies not found: {', '.join(unknown)}."
+        )
+
+    async def lines():
+        async for result in run_batch(
+            alpaca_service,
+            body.symbols,
+            body.strategies,
+            body.start_date,
+            body.end_date,
+            timeframe=body.timeframe,
+            initial_capital=body.initial_capital,
+            strategy_params=body.strategy_params,
+            include_trades=body.include_trades,
+        ):
+            yield json.dumps(result, default=str) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/backtest/optimize")
+async def optimize_strategy(
+    body: OptimizeRequest,
+    request: Request,
+    alpaca_service: AlpacaService = Depends(get_alpaca_service),
+):
+    """Sweeps ``param_grid`` for one strategy and symbol, ranked by ``metric``."""
+    available = {
+        s["name"] for s in request.app.state.strategy_manager.get_available_strategies()
+    }
+    if body.strategy_name not in available:
+        raise HTTPException(
+            status_code=404, detail=f"Strategy '{body.strategy_name}' not found."
+        )
+    if body.metric not in METRICS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown metric '{body.metric}', expected one of {list(METRICS)}.",
+        )
+
+    bars = (
+        await executors.run_io(
+            functools.partial(
+                alpaca_service.get_bars,
+                body.symbol,
+                body.timeframe,
+                start=body.start_date,
+                end=body.end_date,
+            )
+        )
+    ).df
+    if bars.empty:
+        raise HTTPException(status_code=404, detail="No data found.")
+    try:
+        results = await executors.run_on_bars(
+            optimize,
+            bars,
+            body.strategy_name,
+            body.param_grid,
+            metric=body.metric,
+            top=body.top,
+            initial_capital=body.initial_capital,
+        )
+    except Exception as e:
+        logging.error(f"Error optimizing {body.strategy_name} on {body.symbol}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error optimizing strategy: {e}")
+    return {"symbol": body.symbol, **results}
+
+
+@router.post("/backtest/walk-forward")
+async def walk_forward_strategy(
+    body: WalkForwardRequest,
+    request: Request,
+    alpaca_service: AlpacaService = Depends(get_alpaca_service),
+):
+    """Re-optimizes on rolling train windows and stitches the out-of-sample test windows."""
+    available = {
+        s["name"] for s in request.app.state.strategy_manager.get_available_strategies()
+    }
+    if body.strategy_name not in available:
+        raise HTTPException(
+            status_code=404, detail=f"Strategy '{body.strategy_name}' not found."
+        )
+
+    bars = (
+        await executors.run_io(
+            functools.partial(
+                alpaca_service.get_bars,
+                body.symbol,
+                body.timeframe,
+                start=body.start_date,
+                end=body.end_date,
+            )
+        )
+    ).df
+    if bars.empty:
+        raise HTTPException(status_code=404, detail="No data found.")
+    try:
+        results = await walk_forward(
+            bars,
+            body.strategy_name,
+            body.param_grid,
+            body.train_bars,
+            body.test_bars,
+            step=body.step_bars,
+            anchored=body.anchored,
+            metric=body.metric,
+            initial_capital=body.initial_capital,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(
+            f"Error running walk-forward for {body.strategy_name} on {body.symbol}: {e}"
+        )
+        raise HTTPException(status_code=500, detail=f"Error running walk-forward: {e}")
+    return {"symbol": body.symbol, **results}
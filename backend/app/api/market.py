@@ -1,12 +1,11 @@
 from fastapi import APIRouter, Depends
-from app.services.alpaca import AlpacaService
+from app.services.alpaca import AlpacaService, get_alpaca_service
 
 router = APIRouter()
 
 
 @router.get("/status")
-def get_market_status():
-    alpaca_service = AlpacaService()
+def get_market_status(alpaca_service: AlpacaService = Depends(get_alpaca_service)):
     clock = alpaca_service.get_clock()
     return {
         "is_open": clock.is_open,
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Request
+from app.indicators.cache import indicator_cache
+from app.services.alpaca import AlpacaService, get_alpaca_service
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def get_metrics(
+    request: Request, alpaca_service: AlpacaService = Depends(get_alpaca_service)
+):
+    strategy_manager = getattr(request.app.state, "strategy_manager", None)
+    return {
+        "rate_limiter": alpaca_service.rate_limiter.stats(),
+        "request_coalescing": alpaca_service.async_api.single_flight.stats(),
+        "bars_coalescing": alpaca_service._bars_flight.stats(),
+        "indicator_cache": indicator_cache.stats(),
+        "strategy_evaluations": (
+            strategy_manager.get_evaluation_stats() if strategy_manager else []
+        ),
+    }
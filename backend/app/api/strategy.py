@@ -35,7 +35,9 @@ async def start_strategy(
         strategy_instance = strategy_manager.get_strategy_instance(
             strategy_name, symbol=symbol, **strategy_params
         )
-        strategy_manager.active_strategies.append(strategy_instance)
+        if strategy_instance is None:
+            raise ValueError(f"Strategy '{strategy_name}' not found.")
+        strategy_manager.add_strategy(strategy_instance)
         await strategy_manager.telegram_service.send_message(
             f"Strategy {strategy_name} started for {symbol}"
         )
@@ -51,11 +53,7 @@ async def stop_strategy(
     symbol: str,
 ):
     strategy_manager = request.app.state.strategy_manager
-    strategy_manager.active_strategies = [
-        s
-        for s in strategy_manager.active_strategies
-        if not (s.name == strategy_name and s.symbol == symbol)
-    ]
+    strategy_manager.remove_strategy(strategy_name, symbol)
     await strategy_manager.telegram_service.send_message(
         f"Strategy {strategy_name} stopped for {symbol}"
     )
@@ -81,7 +79,9 @@ async def train_ai_strategy(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
     async def train_in_background():
-        await asyncio.to_thread(ai_strategy.train, symbol, start_date=start_date, end_date=end_date)
+        await asyncio.to_thread(
+            ai_strategy.train, symbol, start_date=start_date, end_date=end_date
+        )
 
     asyncio.create_task(train_in_background())
 
@@ -0,0 +1,138 @@
+import asyncio
+import functools
+import logging
+from app.backtester.engine import VectorizedBacktester
+from app.core.executors import SharedBars, executors
+from app.core.strategy_manager import discover_strategies
+
+
+@functools.lru_cache(maxsize=None)
+def _strategy_classes():
+    # Discovered once per worker process
+    return discover_strategies()
+
+
+def get_strategy_class(strategy_name: str):
+    strategy_info = _strategy_classes().get(strategy_name)
+    if strategy_info is None:
+        raise ValueError(f"Strategy '{strategy_name}' not found.")
+    return strategy_info["class"]
+
+
+def build_strategy(strategy_name: str, symbol: str = None, params: dict = None):
+    """Instantiates a strategy for backtesting only: it has no services attached."""
+    strategy_class = get_strategy_class(strategy_name)
+    return strategy_class(
+        None, None, None, None, None, None, symbol=symbol, **(params or {})
+    )
+
+
+def backtest_job(
+    bars, strategy_name, params, symbol, initial_capital, include_trades=False
+):
+    """Backtests one strategy on one symbol's bars. Runs in a worker process."""
+    strategy = build_strategy(strategy_name, symbol, params)
+    backtester = VectorizedBacktester(None, strategy, None, None, initial_capital)
+    results = backtester.simulate(bars, strategy.generate_signals(bars.copy()), symbol)
+    if not include_trades:
+        results.pop("trades")
+    return {
+        "symbol": symbol,
+        "strategy_name": strategy_name,
+        "params": params,
+        **results,
+    }
+
+
+async def run_batch(
+    alpaca_service,
+    symbols: list,
+    strategies: list,
+    start_date: str,
+    end_date: str,
+    timeframe: str = "1Day",
+    initial_capital: float = 100000,
+    strategy_params: dict = None,
+    include_trades: bool = False,
+    max_symbols_in_flight: int = 8,
+):
+    """
+    Backtests every strategy on every symbol, yielding each job's result as it completes.
+
+    Each symbol's bars are fetched once (through the bar store, so repeated
+    batches hit the disk cache), copied once into shared memory and backtested
+    by every strategy in the process pool. A failed job yields a result with
+    an ``error`` instead of stopping the batch.
+
+    :param strategy_params: Constructor parameters per strategy name.
+    :param max_symbols_in_flight: Symbols whose bars are held in memory at once.
+    """
+    strategy_params = strategy_params or {}
+    results = asyncio.Queue()
+    slots = asyncio.Semaphore(max_symbols_in_flight)
+
+    async def run_job(shared, symbol, strategy_name):
+        params = strategy_params.get(strategy_name, {})
+        try:
+            result = await executors.run_on_shared(
+                backtest_job,
+                shared,
+                strategy_name,
+                params,
+                symbol,
+                initial_capital,
+                include_trades,
+            )
+        except Exception as e:
+            logging.error(f"Backtest of {strategy_name} on {symbol} failed: {e}")
+            result = {
+                "symbol": symbol,
+                "strategy_name": strategy_name,
+                "params": params,
+                "error": str(e),
+            }
+        await results.put(result)
+
+    async def run_symbol(symbol):
+        async with slots:
+            try:
+                bars = (
+                    await executors.run_io(
+                        functools.partial(
+                            alpaca_service.get_bars,
+                            symbol,
+                            timeframe,
+                            start=start_date,
+                            end=end_date,
+                        )
+                    )
+                ).df
+                if bars.empty:
+                    raise ValueError("No data found.")
+            except Exception as e:
+                error = getattr(e, "detail", None) or str(e)
+                for strategy_name in strategies:
+                    await results.put(
+                        {
+                            "symbol": symbol,
+                            "strategy_name": strategy_name,
+                            "error": error,
+                        }
+                    )
+                return
+            with SharedBars(bars) as shared:
+                await asyncio.gather(
+                    *(
+                        run_job(shared, symbol, strategy_name)
+                        for strategy_name in strategies
+                    )
+                )
+
+    tasks = [asyncio.create_task(run_symbol(symbol)) for symbol in symbols]
+    try:
+        for _ in range(len(symbols) * len(strategies)):
+            yield await results.get()
+    finally:
+        # Stops the remaining jobs when the consumer goes away early
+        for task in tasks:
+            task.cancel()
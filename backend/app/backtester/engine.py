@@ -0,0 +1,229 @@
+import logging
+import numpy as np
+import pandas as pd
+
+
+def signal_events(bars: pd.DataFrame, signals: pd.DataFrame) -> np.ndarray:
+    """
+    Returns the strategy's entry (1) and exit (-1) events aligned with ``bars``.
+
+    Strategies mark events in ``signal``; the AI strategy keeps its predicted
+    state there and the events in ``position``, which takes precedence.
+    """
+    column = "position" if "position" in signals.columns else "signal"
+    events = signals[column].reindex(bars.index)
+    return np.nan_to_num(events.to_numpy(dtype="float64"))
+
+
+def rolling_atr(bars: pd.DataFrame, period: int = 14) -> np.ndarray:
+    """
+    ``RiskManager.calculate_atr`` as an array, from a cumulative sum of the
+    true range instead of a rolling window.
+
+    As with the rolling mean, a missing true range only makes the windows that
+    contain it NaN.
+    """
+    high = bars["high"].to_numpy(dtype="float64")
+    low = bars["low"].to_numpy(dtype="float64")
+    previous_close = np.concatenate(
+        ([np.nan], bars["close"].to_numpy(dtype="float64")[:-1])
+    )
+    true_range = np.fmax(
+        high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close))
+    )
+    missing = np.isnan(true_range)
+    total = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, true_range))))
+    gaps = np.concatenate(([0], np.cumsum(missing)))
+    rows = np.arange(len(true_range))
+    window_start = np.maximum(rows + 1 - period, 0)
+    atr = (total[rows + 1] - total[window_start]) / period
+    complete = (rows + 1 >= period) & (gaps[rows + 1] == gaps[window_start])
+    return np.where(complete, atr, np.nan)
+
+
+def holding_mask(events: np.ndarray) -> np.ndarray:
+    """
+    Long from an entry event until the next exit event; repeated events are ignored.
+
+    ``events`` is one column of events per bar, or a (bars, columns) matrix
+    with one column per parameter combination.
+    """
+    rows = np.arange(len(events)).reshape((-1,) + (1,) * (events.ndim - 1))
+    positions = np.where(events != 0, rows, -1)
+    np.maximum.accumulate(positions, axis=0, out=positions)
+    last_event = np.take_along_axis(events, np.maximum(positions, 0), axis=0)
+    return (positions >= 0) & (last_event > 0)
+
+
+def position_sizes(
+    close: np.ndarray, atr: np.ndarray, initial_capital, risk_percentage, atr_multiplier
+):
+    """
+    Shares bought when entering at each bar, following the RiskManager rules:
+    an ATR stop (2% below the entry without a valid ATR), ``risk_percentage`` of
+    the initial capital at risk, and a cost capped at the initial capital.
+    """
+    valid_atr = np.isfinite(atr) & (atr > 0)
+    stop = np.where(valid_atr, close - atr * atr_multiplier, close * 0.98)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        qty = (initial_capital * risk_percentage) / (close - stop)
+        qty = np.minimum(qty, initial_capital / close)
+    return np.where(np.isfinite(qty) & (qty > 0) & (stop > 0), qty, 0.0)
+
+
+def simulate_events(
+    close: np.ndarray, sizes: np.ndarray, events: np.ndarray, initial_capital
+) -> dict:
+    """
+    Simulates a (bars, columns) matrix of entry/exit events against one price series.
+
+    :param sizes: Shares bought per bar on entry, from ``position_sizes``.
+    :return: ``entries``, ``exits``, ``bought``, ``sold`` (shares per bar) and
+             ``equity``, each a (bars, columns) matrix.
+    """
+    holding = holding_mask(events)
+    was_holding = np.zeros_like(holding)
+    was_holding[1:] = holding[:-1]
+    entries = holding & ~was_holding
+    exits = was_holding & ~holding
+
+    bought = np.where(entries, sizes[:, None], 0.0)
+    # Every bar of a holding period carries the size bought at its entry
+    last_entry = np.where(entries, np.arange(len(close))[:, None], 0)
+    np.maximum.accumulate(last_entry, axis=0, out=last_entry)
+    position = np.where(holding, np.take_along_axis(bought, last_entry, axis=0), 0.0)
+    sold = np.zeros_like(position)
+    sold[1:] = np.where(exits[1:], position[:-1], 0.0)
+
+    prices = close[:, None]
+    equity = (
+        initial_capital
+        + np.cumsum((sold - bought) * prices, axis=0)
+        + position * prices
+    )
+    return {
+        "entries": entries,
+        "exits": exits,
+        "bought": bought,
+        "sold": sold,
+        "equity": equity,
+    }
+
+
+class VectorizedBacktester:
+    """
+    Long-only backtester computed with array operations instead of a per-bar loop.
+
+    Follows the same rules as ``Backtester``: fills at the close of the signal
+    bar, one position at a time, sized like ``RiskManager`` to risk
+    ``risk_percentage`` of the initial capital with an ATR stop. The only
+    difference is that a position's cost is capped at the initial capital
+    rather than the buy being skipped when cash runs short, which keeps every
+    trade independent of the ones before it.
+    """
+
+    def __init__(
+        self,
+        alpaca_service,
+        strategy,
+        start_date,
+        end_date,
+        initial_capital=100000,
+        risk_percentage=0.01,
+        atr_period=14,
+        atr_multiplier=2.0,
+    ):
+        self.alpaca_service = alpaca_service
+        self.strategy = strategy
+        self.start_date = start_date
+        self.end_date = end_date
+        self.initial_capital = initial_capital
+        self.risk_percentage = risk_percentage
+        self.atr_period = atr_period
+        self.atr_multiplier = atr_multiplier
+        self.equity_curve = None
+
+    def run(self, symbol, timeframe="1Day"):
+        logging.info(
+            f"Starting vectorized backtest for {symbol} from {self.start_date} to {self.end_date}"
+        )
+        bars = self.alpaca_service.get_bars(
+            symbol=symbol, timeframe=timeframe, start=self.start_date, end=self.end_date
+        ).df
+        if bars.empty:
+            logging.warning(f"No data found for {symbol} in the given date range.")
+            return {"error": "No data found."}
+        return self.simulate(bars, self.strategy.generate_signals(bars.copy()), symbol)
+
+    def simulate(
+        self, bars: pd.DataFrame, signals: pd.DataFrame, symbol: str = None
+    ) -> dict:
+        """
+        Turns ``signals`` into fills, an equity curve and a trade list.
+
+        :param bars: OHLC bars the signals were generated from.
+        :param signals: Frame with a ``signal`` (or ``position``) column of 1/-1 events.
+        :return: Performance summary in the same shape as ``Backtester.run``.
+        """
+        close = bars["close"].to_numpy(dtype="float64")
+        sizes = position_sizes(
+            close,
+            rolling_atr(bars, self.atr_period),
+            self.initial_capital,
+            self.risk_percentage,
+            self.atr_multiplier,
+        )
+        events = signal_events(bars, signals)[:, None]
+        result = simulate_events(close, sizes, events, self.initial_capital)
+        equity = result["equity"][:, 0]
+        self.equity_curve = pd.Series(equity, index=bars.index, name="equity")
+
+        trades = self._trades(
+            bars.index,
+            close,
+            result["entries"][:, 0],
+            result["bought"][:, 0],
+            result["sold"][:, 0],
+            symbol,
+        )
+        return self._performance(equity, trades)
+
+    @staticmethod
+    def _trades(index, close, entries, bought, sold, symbol) -> list:
+        quantities = bought + sold
+        rows = np.flatnonzero(quantities > 0)
+        sides = np.where(entries[rows], "buy", "sell")
+        frame = pd.DataFrame(
+            {
+                "date": index[rows].map(pd.Timestamp.isoformat),
+                "symbol": symbol,
+                "side": sides,
+                "qty": quantities[rows],
+                "price": close[rows],
+            }
+        )
+        return frame.to_dict("records")
+
+    def _performance(self, equity: np.ndarray, trades: list) -> dict:
+        final_value = float(equity[-1]) if len(equity) else float(self.initial_capital)
+        if not trades:
+            return {
+                "message": "No trades were executed.",
+                "initial_capital": self.initial_capital,
+                "final_portfolio_value": final_value,
+                "net_profit": 0,
+                "return_pct": 0,
+                "trades": [],
+            }
+
+        net_profit = final_value - self.initial_capital
+        peak = np.maximum.accumulate(equity)
+        return {
+            "initial_capital": self.initial_capital,
+            "final_portfolio_value": round(final_value, 2),
+            "net_profit": round(net_profit, 2),
+            "return_pct": round((net_profit / self.initial_capital) * 100, 2),
+            "max_drawdown_pct": round(float(np.max((peak - equity) / peak)) * 100, 2),
+            "total_trades": len(trades),
+            "trades": trades,
+        }
@@ -0,0 +1,349 @@
+import inspect
+import itertools
+import numpy as np
+import pandas as pd
+from app.backtester.batch import build_strategy, get_strategy_class
+from app.backtester.engine import (
+    position_sizes,
+    rolling_atr,
+    signal_events,
+    simulate_events,
+)
+
+# Metric name -> True when higher is better
+METRICS = {
+    "return_pct": True,
+    "final_portfolio_value": True,
+    "sharpe": True,
+    "max_drawdown_pct": False,
+    "total_trades": True,
+}
+
+# Upper bound on bars x combinations simulated at once, to bound memory
+MAX_CELLS = 4_000_000
+
+
+def _seeded_ema(values: pd.Series, length: int) -> pd.Series:
+    """``ta.ema``: the SMA of the first ``length`` values, then ``ewm(adjust=False)``."""
+    start = values.first_valid_index()
+    if start is None:
+        return values * np.nan
+    tail = values.loc[start:].copy()
+    seed = tail.iloc[:length].mean()
+    tail.iloc[: length - 1] = np.nan
+    if len(tail) >= length:
+        tail.iloc[length - 1] = seed
+    ema = tail.ewm(span=length, adjust=False).mean()
+    ema.iloc[: length - 1] = np.nan
+    return ema.reindex(values.index)
+
+
+def _rsi(close: pd.Series, length: int) -> pd.Series:
+    change = close.diff()
+    gains = change.clip(lower=0).ewm(alpha=1 / length, min_periods=length).mean()
+    losses = change.clip(upper=0).ewm(alpha=1 / length, min_periods=length).mean()
+    return 100 * gains / (gains + losses.abs())
+
+
+class IndicatorColumns:
+    """
+    Indicator series over one bars frame, each computed once per parameter set
+    and shared by every combination (and every walk-forward window) using it.
+    """
+
+    def __init__(self, bars: pd.DataFrame):
+        self.bars = bars
+        self.close = bars["close"].astype("float64")
+        self._columns = {}
+
+    def get(self, name: str, *params) -> np.ndarray:
+        key = (name,) + params
+        column = self._columns.get(key)
+        if column is None:
+            column = self._columns[key] = np.asarray(
+                getattr(self, f"_{name}")(*params), dtype="float64"
+            )
+        return column
+
+    def stack(self, name: str, *params: np.ndarray) -> np.ndarray:
+        """Returns a (bars, combinations) matrix of ``name`` for each combination's params."""
+        keys = list(zip(*(np.asarray(p).tolist() for p in params)))
+        unique = sorted(set(keys))
+        matrix = np.column_stack([self.get(name, *key) for key in unique])
+        position = {key: i for i, key in enumerate(unique)}
+        return matrix[:, [position[key] for key in keys]]
+
+    def signals(self, strategy_name: str, params: dict) -> np.ndarray:
+        """Events from the strategy's own ``generate_signals``, once per parameter set."""
+        key = ("signals", strategy_name, tuple(sorted(params.items())))
+        events = self._columns.get(key)
+        if events is None:
+            strategy = build_strategy(strategy_name, params=params)
+            events = self._columns[key] = signal_events(
+                self.bars, strategy.generate_signals(self.bars.copy())
+            )
+        return events
+
+    def _sma(self, length):
+        return self.close.rolling(length).mean()
+
+    def _ema(self, length):
+        return _seeded_ema(self.close, length)
+
+    def _std(self, length, ddof):
+        return self.close.rolling(length).std(ddof=ddof)
+
+    def _rsi(self, length):
+        return _rsi(self.close, length)
+
+    def _midprice(self, length):
+        return 0.5 * (
+            self.bars["low"].rolling(length).min()
+            + self.bars["high"].rolling(length).max()
+        )
+
+    def _span_a(self, tenkan, kijun):
+        span = 0.5 * (self.get("midprice", tenkan) + self.get("midprice", kijun))
+        return pd.Series(span).shift(kijun - 1)
+
+    def _span_b(self, kijun, senkou):
+        return pd.Series(self.get("midprice", senkou)).shift(kijun - 1)
+
+
+def _crossings(difference: np.ndarray) -> np.ndarray:
+    """1 where ``difference`` turns positive, -1 where it turns negative, as the crossover strategies do."""
+    previous = np.full_like(difference, np.nan)
+    previous[1:] = difference[:-1]
+    with np.errstate(invalid="ignore"):
+        return ((difference > 0) & (previous < 0)).astype("int8") - (
+            (difference < 0) & (previous > 0)
+        ).astype("int8")
+
+
+def _bands(close, mid, deviation, width) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        lower, upper = mid - width * deviation, mid + width * deviation
+        return np.where(close > upper, -1, np.where(close < lower, 1, 0)).astype("int8")
+
+
+def _sma_crossover(columns, fast_period, slow_period):
+    return _crossings(
+        columns.stack("sma", fast_period) - columns.stack("sma", slow_period)
+    )
+
+
+def _ema_crossover(columns, fast_period, slow_period):
+    return _crossings(
+        columns.stack("ema", fast_period) - columns.stack("ema", slow_period)
+    )
+
+
+def _rsi_levels(columns, period, overbought, oversold):
+    rsi = columns.stack("rsi", period)
+    with np.errstate(invalid="ignore"):
+        return np.where(rsi > overbought, -1, np.where(rsi < oversold, 1, 0)).astype(
+            "int8"
+        )
+
+
+def _bollinger_bands(columns, length, std_dev):
+    close = columns.close.to_numpy()[:, None]
+    ddof = np.zeros_like(length)
+    return _bands(
+        close, columns.stack("sma", length), columns.stack("std", length, ddof), std_dev
+    )
+
+
+def _mean_reversion(columns, sma_period, deviation_threshold):
+    close = columns.close.to_numpy()[:, None]
+    ddof = np.ones_like(sma_period)
+    return _bands(
+        close,
+        columns.stack("sma", sma_period),
+        columns.stack("std", sma_period, ddof),
+        deviation_threshold,
+    )
+
+
+def _ichimoku_cloud(columns, tenkan, kijun, senkou):
+    close = columns.close.to_numpy()[:, None]
+    span_a = columns.stack("span_a", tenkan, kijun)
+    span_b = columns.stack("span_b", kijun, senkou)
+    with np.errstate(invalid="ignore"):
+        above = (close > span_a) & (close > span_b)
+        below = (close < span_a) & (close < span_b)
+    return np.where(above, 1, np.where(below, -1, 0)).astype("int8")
+
+
+# Strategies whose generate_signals is reproduced for a whole grid at once
+SIGNAL_KERNELS = {
+    "sma_crossover": _sma_crossover,
+    "ema_crossover": _ema_crossover,
+    "rsi": _rsi_levels,
+    "bollinger_bands": _bollinger_bands,
+    "mean_reversion": _mean_reversion,
+    "ichimoku_cloud": _ichimoku_cloud,
+}
+
+
+def expand_grid(param_grid: dict) -> list:
+    """Every combination of the values in ``param_grid``, as a list of dicts."""
+    names = list(param_grid)
+    return [
+        dict(zip(names, values)) for values in itertools.product(*param_grid.values())
+    ]
+
+
+def _strategy_defaults(strategy_name: str) -> dict:
+    signature = inspect.signature(get_strategy_class(strategy_name).__init__)
+    return {
+        name: parameter.default
+        for name, parameter in signature.parameters.items()
+        if parameter.default is not inspect.Parameter.empty
+    }
+
+
+def grid_events(
+    columns: IndicatorColumns, strategy_name: str, combinations: list
+) -> np.ndarray:
+    """
+    Entry/exit events for each parameter combination, as a (bars, combinations) matrix.
+
+    Strategies with a signal kernel get every combination from shared indicator
+    columns; any other strategy (or a grid over parameters the kernel doesn't
+    know) falls back to calling ``generate_signals`` once per combination.
+    """
+    kernel = SIGNAL_KERNELS.get(strategy_name)
+    if kernel is not None:
+        names = list(inspect.signature(kernel).parameters)[1:]
+        if all(set(combination) <= set(names) for combination in combinations):
+            defaults = _strategy_defaults(strategy_name)
+            params = {
+                name: np.array(
+                    [
+                        combination.get(name, defaults[name])
+                        for combination in combinations
+                    ]
+                )
+                for name in names
+            }
+            return kernel(columns, **params)
+
+    return np.column_stack(
+        [columns.signals(strategy_name, combination) for combination in combinations]
+    )
+
+
+def summarize(
+    equity: np.ndarray, trades: np.ndarray, index: pd.DatetimeIndex, initial_capital
+) -> dict:
+    """Per-column performance metrics of a (bars, columns) equity matrix, as arrays."""
+    final = equity[-1]
+    peak = np.maximum.accumulate(equity, axis=0)
+    returns = np.diff(equity, axis=0) / equity[:-1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = returns.mean(axis=0) / returns.std(axis=0)
+    years = (
+        (index[-1] - index[0]).total_seconds() / (365.25 * 86400)
+        if len(index) > 1
+        else 0
+    )
+    bars_per_year = (len(index) - 1) / years if years > 0 else 0
+    return {
+        "final_portfolio_value": np.round(final, 2),
+        "return_pct": np.round((final - initial_capital) / initial_capital * 100, 2),
+        "max_drawdown_pct": np.round(((peak - equity) / peak).max(axis=0) * 100, 2),
+        "sharpe": np.round(np.nan_to_num(sharpe * np.sqrt(bars_per_year)), 4),
+        "total_trades": trades,
+    }
+
+
+def evaluate_grid(
+    columns: IndicatorColumns,
+    strategy_name: str,
+    combinations: list,
+    initial_capital: float = 100000,
+    rows: slice = slice(None),
+    risk_percentage: float = 0.01,
+    atr_period: int = 14,
+    atr_multiplier: float = 2.0,
+) -> dict:
+    """
+    Backtests every combination on ``columns.bars[rows]`` with the vectorized engine.
+
+    Signals come from the whole history, so indicators are warmed up before
+    ``rows`` starts; only the fills and equity are limited to ``rows``.
+
+    :return: Metric arrays with one value per combination.
+    """
+    bars = columns.bars
+    close = columns.close.to_numpy()
+    sizes = position_sizes(
+        close,
+        rolling_atr(bars, atr_period),
+        initial_capital,
+        risk_percentage,
+        atr_multiplier,
+    )[rows]
+    close, index = close[rows], bars.index[rows]
+    chunk = max(1, MAX_CELLS // max(len(close), 1))
+    metrics = []
+    for start in range(0, len(combinations), chunk):
+        events = grid_events(
+            columns, strategy_name, combinations[start : start + chunk]
+        )[rows]
+        result = simulate_events(close, sizes, events, initial_capital)
+        trades = ((result["bought"] > 0) | (result["sold"] > 0)).sum(axis=0)
+        metrics.append(summarize(result["equity"], trades, index, initial_capital))
+    return {name: np.concatenate([m[name] for m in metrics]) for name in metrics[0]}
+
+
+def rank(metrics: dict, metric: str) -> np.ndarray:
+    """Combination indices from best to worst by ``metric``."""
+    order = np.argsort(metrics[metric], kind="stable")
+    return order[::-1] if METRICS[metric] else order
+
+
+def optimize(
+    bars: pd.DataFrame,
+    strategy_name: str,
+    param_grid: dict,
+    metric: str = "return_pct",
+    top: int = 20,
+    initial_capital: float = 100000,
+) -> dict:
+    """
+    Sweeps ``param_grid`` for a strategy on ``bars`` and ranks the combinations.
+
+    :param param_grid: Constructor parameter name -> list of values to try.
+    :param metric: One of ``METRICS``; drawdown ranks lowest first.
+    :param top: Number of ranked combinations returned.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {list(METRICS)}.")
+    combinations = expand_grid(param_grid)
+    if not combinations or bars.empty:
+        return {
+            "strategy_name": strategy_name,
+            "metric": metric,
+            "combinations": 0,
+            "results": [],
+        }
+
+    metrics = evaluate_grid(
+        IndicatorColumns(bars), strategy_name, combinations, initial_capital
+    )
+    order = rank(metrics, metric)
+    results = [
+        {
+            "params": combinations[i],
+            **{name: values[i].item() for name, values in metrics.items()},
+        }
+        for i in order[:top]
+    ]
+    return {
+        "strategy_name": strategy_name,
+        "metric": metric,
+        "combinations": len(combinations),
+        "results": results,
+    }
@@ -0,0 +1,338 @@
+import asyncio
+import contextlib
+import itertools
+import logging
+import queue
+import time
+import numpy as np
+import pandas as pd
+from app.core.connection_manager import ConnectionManager
+from app.core.risk_manager import RiskManager
+from app.core.strategy_manager import StrategyManager
+from app.core.timeframes import MARKET_TZ, bar_window, trade_timestamp_ns
+from app.core.trade_tape import TradeTape, TradeTapeWriter
+from app.services.simulated_alpaca import ReplayTrade, SimulatedAlpacaService
+
+# Stages of the stream's trade handler, timed separately; "handler" is all of them
+STAGES = ("tape", "fills", "bars", "strategies", "handler")
+
+# A paced replay sleeps only when it is at least this far ahead of schedule
+PACING_SLACK_NS = 200_000
+
+
+def trades_from_frame(trades: pd.DataFrame, symbol: str = None) -> list:
+    """
+    Converts recorded trades, e.g. the ``.df`` of Alpaca's historical trades, to ``ReplayTrade``s.
+
+    :param trades: Trades indexed by timestamp, with ``price``, ``size`` and,
+                   unless ``symbol`` is given, ``symbol`` columns.
+    """
+    trades = trades.sort_index(kind="stable")
+    symbols = trades["symbol"].tolist() if symbol is None else itertools.repeat(symbol)
+    conditions = (
+        trades["conditions"].tolist()
+        if "conditions" in trades
+        else itertools.repeat(())
+    )
+    return [
+        ReplayTrade(*fields)
+        for fields in zip(
+            symbols,
+            trades.index.asi8.tolist(),
+            trades["price"].tolist(),
+            trades["size"].tolist(),
+            conditions,
+        )
+    ]
+
+
+def trades_from_tape(
+    tape: TradeTape, day: str, symbols=None, start: str = None, end: str = None
+) -> list:
+    """
+    Reads a recorded day's trades as ``ReplayTrade``s.
+
+    :param symbols: Only replays these symbols; all of them if None.
+    :param start: Skips trades before this time, e.g. ``"2024-05-01 09:30"`` (New York time).
+    :param end: Skips trades from this time on.
+    """
+    records = tape.records(day)
+    keep = np.ones(len(records), dtype=bool)
+    names = tape.symbols
+    if symbols is not None:
+        symbols = set(symbols)
+        wanted = [i for i, name in enumerate(names) if name in symbols]
+        keep &= np.isin(records["symbol_id"], wanted)
+    timestamps = records["timestamp"]
+    if start is not None:
+        keep &= timestamps >= pd.Timestamp(start, tz=MARKET_TZ).value
+    if end is not None:
+        keep &= timestamps < pd.Timestamp(end, tz=MARKET_TZ).value
+    records = records[keep]
+    return [
+        ReplayTrade(
+            names[symbol_id], timestamp, price, size, list(conditions.decode("ascii"))
+        )
+        for symbol_id, timestamp, price, size, conditions in zip(
+            records["symbol_id"].tolist(),
+            records["timestamp"].tolist(),
+            records["price"].tolist(),
+            records["size"].tolist(),
+            records["conditions"].tolist(),
+        )
+    ]
+
+
+def trades_from_bars(bars: pd.DataFrame, symbol: str, timeframe: str) -> list:
+    """
+    Synthesizes four trades per bar that rebuild it: the open, the extreme on the
+    way to the close, the other extreme and the close, spread evenly over the
+    bar's window and sharing its volume.
+    """
+    opens, highs, lows, closes = (
+        bars[c].to_numpy(dtype="float64") for c in ("open", "high", "low", "close")
+    )
+    rising = closes >= opens
+    prices = np.column_stack(
+        [opens, np.where(rising, lows, highs), np.where(rising, highs, lows), closes]
+    ).ravel()
+    starts = bars.index.asi8
+    ends = np.array(
+        [bar_window(int(start), timeframe)[1] for start in starts], dtype="int64"
+    )
+    timestamps = (
+        starts[:, None] + (ends - starts)[:, None] * np.arange(1, 5) // 5
+    ).ravel()
+    sizes = np.repeat(bars["volume"].to_numpy(dtype="float64") / 4, 4)
+    return [
+        ReplayTrade(symbol, timestamp, price, size)
+        for timestamp, price, size in zip(
+            timestamps.tolist(), prices.tolist(), sizes.tolist()
+        )
+    ]
+
+
+class _Notifications:
+    """Stands in for the Telegram and Google Sheets services, counting what strategies send."""
+
+    def __init__(self):
+        self.messages = 0
+        self.exports = 0
+
+    async def send_message(self, message):
+        self.messages += 1
+
+    def export_trades(self):
+        self.exports += 1
+
+
+@contextlib.contextmanager
+def _quiet_logging(enabled: bool):
+    previous = logging.root.manager.disable
+    if enabled:
+        logging.disable(max(previous, logging.INFO))
+    try:
+        yield
+    finally:
+        logging.disable(previous)
+
+
+def _percentiles(values: np.ndarray) -> dict:
+    if not len(values):
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "p50": round(float(p50), 1),
+        "p90": round(float(p90), 1),
+        "p99": round(float(p99), 1),
+        "max": round(float(values.max()), 1),
+    }
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop wakes a task that sleeps ``interval`` seconds.
+
+    The lag is how long other work held the loop past the wake-up, which is
+    how long a trade arriving from the stream would wait to be read.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.lags = []
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._probe())
+
+    async def _probe(self):
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(time.perf_counter() - before - self.interval)
+
+    async def stop(self) -> np.ndarray:
+        """Stops probing; returns the lags seen, in milliseconds."""
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        return np.maximum(np.array(self.lags, dtype="float64"), 0) * 1000
+
+
+class ReplayBacktester:
+    """
+    Replays trades through the live trading path.
+
+    Each trade goes to the bar buffers and ``StrategyManager.run_strategy_on_trade``
+    as it would from the stream's trade handler, so strategies run their
+    ``run_on_trade`` against a ``SimulatedAlpacaService`` instead of Alpaca.
+    Evaluation policies behave as they do live, except that throttling is
+    measured in wall-clock time, which passes faster than the replayed trades'
+    time unless they are replayed at their own pace (``speed=1``).
+    """
+
+    def __init__(
+        self, service: SimulatedAlpacaService, risk_manager: RiskManager = None
+    ):
+        self.service = service
+        self.notifications = _Notifications()
+        self.strategy_manager = StrategyManager(
+            service,
+            risk_manager or RiskManager(account_equity=service.initial_capital),
+            self.notifications,
+            self.notifications,
+            ConnectionManager(),
+            queue.Queue(),
+        )
+
+    def add_strategy(self, name: str, symbol: str, **params):
+        strategy = self.strategy_manager.get_strategy_instance(
+            name, symbol=symbol, **params
+        )
+        if strategy is None:
+            raise ValueError(f"Strategy '{name}' not found.")
+        self.strategy_manager.add_strategy(strategy)
+        return strategy
+
+    async def run(
+        self,
+        trades,
+        quiet: bool = True,
+        speed: float = None,
+        tape: TradeTapeWriter = None,
+        lag_interval: float = 0.005,
+    ) -> dict:
+        """
+        Replays ``trades`` in order through the stages of the stream's trade handler.
+
+        :param trades: Iterable of stream-like trades, such as ``ReplayTrade``s.
+        :param quiet: Silences info logging while replaying; warnings and errors still show.
+        :param speed: Replays at ``speed`` times the pace of the trades' timestamps
+                      (1 for real time), or as fast as the strategies process them if None.
+        :param tape: Also records each trade to this writer, as the live handler
+                     does when ``TRADE_TAPE_DIR`` is set.
+        :param lag_interval: Seconds between the event-loop lag probe's wake-ups.
+        :return: Sustained throughput, latency percentiles in microseconds per
+                 stage, how far trades were handled behind their schedule and
+                 the event loop's lag in milliseconds, evaluation stats per
+                 strategy and the simulated account.
+        """
+        service = self.service
+        buffers = service.bar_buffers
+        run_on_trade = self.strategy_manager.run_strategy_on_trade
+        clock = time.perf_counter_ns
+        stages = {name: [] for name in STAGES}
+        delays = []
+        first_ns = last_ns = None
+        monitor = LoopLagMonitor(lag_interval)
+        with _quiet_logging(quiet):
+            monitor.start()
+            started = clock()
+            for trade in trades:
+                if speed is not None:
+                    ts_ns = trade_timestamp_ns(trade)
+                    if first_ns is None:
+                        first_ns = ts_ns
+                    last_ns = ts_ns
+                    due = started + (ts_ns - first_ns) / speed
+                    ahead = due - clock()
+                    if ahead > PACING_SLACK_NS:
+                        await asyncio.sleep(ahead / 10**9)
+                    delays.append(max(clock() - due, 0))
+
+                logging.info(f"Received trade: {trade}")
+                begin = clock()
+                if tape is not None:
+                    tape.record(trade)
+                recorded = clock()
+                service.on_trade(trade)
+                filled = clock()
+                buffers.on_trade(trade)
+                buffered = clock()
+                await run_on_trade(trade)
+                done = clock()
+                stages["tape"].append(recorded - begin)
+                stages["fills"].append(filled - recorded)
+                stages["bars"].append(buffered - filled)
+                stages["strategies"].append(done - buffered)
+                stages["handler"].append(done - begin)
+                # Lets evaluations scheduled in the background (throttle, bar_close) run
+                await asyncio.sleep(0)
+            for strategy in self.strategy_manager.active_strategies:
+                await strategy.evaluation.wait_idle()
+            elapsed = (clock() - started) / 10**9
+            lags = await monitor.stop()
+
+        count = len(stages["handler"])
+        stage_latency = {
+            name: _percentiles(np.array(values, dtype="float64") / 1000)
+            for name, values in stages.items()
+            if tape is not None or name != "tape"
+        }
+        results = {
+            "trades": count,
+            "seconds": round(elapsed, 3),
+            "trades_per_second": round(count / elapsed, 1) if elapsed > 0 else 0.0,
+            "latency_us": stage_latency["strategies"],
+            "stage_latency_us": stage_latency,
+            "loop_lag_ms": _percentiles(lags),
+            "evaluations": self.strategy_manager.get_evaluation_stats(),
+            "notifications": self.notifications.messages,
+            "account": service.summary(),
+        }
+        if speed is not None:
+            span = (last_ns - first_ns) / 10**9 / speed if count else 0.0
+            results["speed"] = speed
+            results["offered_trades_per_second"] = (
+                round(count / span, 1) if span > 0 else 0.0
+            )
+            results["delay_ms"] = _percentiles(
+                np.array(delays, dtype="float64") / 10**6
+            )
+        return results
+
+
+async def replay_bars(
+    strategy_name: str,
+    symbol: str,
+    bars: pd.DataFrame,
+    timeframe: str = "1Day",
+    warmup: int = 100,
+    initial_capital: float = 100000,
+    strategy_params: dict = None,
+    quiet: bool = True,
+) -> dict:
+    """
+    Replays historical ``bars`` through the live path as synthetic trades (see ``trades_from_bars``).
+
+    :param warmup: Leading bars that are only served as history for seeding
+                   the bar buffers, not replayed.
+    """
+    service = SimulatedAlpacaService({symbol: {str(timeframe): bars}}, initial_capital)
+    replay = ReplayBacktester(service)
+    replay.add_strategy(
+        strategy_name, symbol, timeframe=timeframe, **(strategy_params or {})
+    )
+    return await replay.run(
+        trades_from_bars(bars.iloc[warmup:], symbol, timeframe), quiet
+    )
@@ -0,0 +1,210 @@
+import asyncio
+import numpy as np
+import pandas as pd
+from app.backtester.engine import position_sizes, rolling_atr, simulate_events
+from app.backtester.optimizer import (
+    METRICS,
+    IndicatorColumns,
+    evaluate_grid,
+    expand_grid,
+    grid_events,
+    rank,
+    summarize,
+)
+from app.core.executors import SharedBars, executors
+
+# Indicator columns per shared bars block, kept by each worker process so the
+# windows it runs on the same history reuse each other's indicators
+_columns_by_block = {}
+_MAX_BLOCKS = 4
+
+
+def walk_forward_windows(
+    rows: int, train_bars: int, test_bars: int, step: int = None, anchored: bool = False
+) -> list:
+    """
+    Consecutive (train, test) row slices covering ``rows`` bars.
+
+    :param step: Bars between window starts, ``test_bars`` by default. Test
+                 windows must not overlap, since they are chained into one
+                 out-of-sample curve; a larger step leaves gaps between them.
+    :param anchored: Train windows all start at the first bar and grow, instead of rolling.
+    """
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("train_bars and test_bars must be positive.")
+    step = step or test_bars
+    if step < test_bars:
+        raise ValueError(
+            f"step ({step}) must be at least test_bars ({test_bars}) so test windows don't overlap."
+        )
+    windows = []
+    start = 0
+    while start + train_bars + test_bars <= rows:
+        split = start + train_bars
+        windows.append(
+            (slice(0 if anchored else start, split), slice(split, split + test_bars))
+        )
+        start += step
+    return windows
+
+
+def evaluate_window(
+    columns: IndicatorColumns,
+    strategy_name: str,
+    combinations: list,
+    train: slice,
+    test: slice,
+    metric: str = "return_pct",
+    initial_capital: float = 100000,
+    risk_percentage: float = 0.01,
+    atr_period: int = 14,
+    atr_multiplier: float = 2.0,
+) -> dict:
+    """
+    Picks the best combination on ``train`` and backtests it on ``test``.
+
+    :return: The chosen ``params``, their ``in_sample`` metrics and the
+             out-of-sample ``equity`` starting from ``initial_capital``.
+    """
+    metrics = evaluate_grid(
+        columns,
+        strategy_name,
+        combinations,
+        initial_capital,
+        train,
+        risk_percentage,
+        atr_period,
+        atr_multiplier,
+    )
+    best = int(rank(metrics, metric)[0])
+
+    close = columns.close.to_numpy()
+    sizes = position_sizes(
+        close,
+        rolling_atr(columns.bars, atr_period),
+        initial_capital,
+        risk_percentage,
+        atr_multiplier,
+    )
+    events = grid_events(columns, strategy_name, [combinations[best]])[test]
+    result = simulate_events(close[test], sizes[test], events, initial_capital)
+    trades = int(((result["bought"] > 0) | (result["sold"] > 0)).sum())
+    return {
+        "params": combinations[best],
+        "in_sample": {name: values[best].item() for name, values in metrics.items()},
+        "equity": result["equity"][:, 0],
+        "trades": trades,
+    }
+
+
+def _window_job(
+    handle, strategy_name, combinations, train, test, metric, initial_capital
+):
+    name = handle[0]
+    columns = _columns_by_block.get(name)
+    if columns is None:
+        if len(_columns_by_block) >= _MAX_BLOCKS:
+            _columns_by_block.pop(next(iter(_columns_by_block)))
+        columns = _columns_by_block[name] = IndicatorColumns(SharedBars.read(handle))
+    return evaluate_window(
+        columns, strategy_name, combinations, train, test, metric, initial_capital
+    )
+
+
+def stitch(
+    index: pd.DatetimeIndex, windows: list, results: list, initial_capital: float
+) -> pd.Series:
+    """
+    Chains the out-of-sample equity of consecutive test windows into one curve.
+
+    Every window was simulated from ``initial_capital``; since position sizes
+    scale with capital, each one is rescaled to start from the previous
+    window's closing equity.
+    """
+    capital = initial_capital
+    pieces = []
+    for (_, test), result in zip(windows, results):
+        equity = result["equity"] * (capital / initial_capital)
+        pieces.append(pd.Series(equity, index=index[test]))
+        capital = equity[-1]
+    return pd.concat(pieces) if pieces else pd.Series(dtype="float64")
+
+
+async def walk_forward(
+    bars: pd.DataFrame,
+    strategy_name: str,
+    param_grid: dict,
+    train_bars: int,
+    test_bars: int,
+    step: int = None,
+    anchored: bool = False,
+    metric: str = "return_pct",
+    initial_capital: float = 100000,
+) -> dict:
+    """
+    Re-optimizes ``param_grid`` on each train window and trades the winner on
+    the following test window, with every window running in the process pool.
+
+    Bars are handed to the workers once through shared memory, and each worker
+    computes an indicator at most once for all the windows it runs. Positions
+    still open at the end of a test window are valued at its last close.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {list(METRICS)}.")
+    combinations = expand_grid(param_grid)
+    windows = walk_forward_windows(len(bars), train_bars, test_bars, step, anchored)
+    if not combinations or not windows:
+        raise ValueError(
+            "Not enough bars or parameters for a single walk-forward window."
+        )
+
+    with SharedBars(bars) as shared:
+        results = await asyncio.gather(
+            *(
+                executors.run_cpu(
+                    _window_job,
+                    shared.handle,
+                    strategy_name,
+                    combinations,
+                    train,
+                    test,
+                    metric,
+                    initial_capital,
+                )
+                for train, test in windows
+            )
+        )
+
+    index = bars.index
+    equity = stitch(index, windows, results, initial_capital)
+    values = equity.to_numpy()[:, None]
+    trades = np.array([sum(result["trades"] for result in results)])
+    summary = {
+        name: value[0].item()
+        for name, value in summarize(
+            values, trades, equity.index, initial_capital
+        ).items()
+    }
+    return {
+        "strategy_name": strategy_name,
+        "metric": metric,
+        "windows": [
+            {
+                "train_start": index[train.start].isoformat(),
+                "train_end": index[train.stop - 1].isoformat(),
+                "test_start": index[test.start].isoformat(),
+                "test_end": index[test.stop - 1].isoformat(),
+                "params": result["params"],
+                "in_sample": result["in_sample"],
+                "out_of_sample_return_pct": round(
+                    (result["equity"][-1] / initial_capital - 1) * 100, 2
+                ),
+            }
+            for (train, test), result in zip(windows, results)
+        ],
+        "out_of_sample": summary,
+        "equity_curve": [
+            {"date": date.isoformat(), "equity": round(value, 2)}
+            for date, value in equity.items()
+        ],
+    }
@@ -0,0 +1,271 @@
+import logging
+from collections import namedtuple
+import numpy as np
+from app.core.timeframes import SUPPORTED_TIMEFRAMES, bar_window, trade_timestamp_ns
+
+logger = logging.getLogger(__name__)
+
+Bar = namedtuple(
+    "Bar",
+    ["timestamp", "open", "high", "low", "close", "volume", "trade_count", "vwap"],
+)
+
+
+class _Accumulators:
+    """Column arrays holding the forming bar of one timeframe, one row per symbol."""
+
+    def __init__(self, capacity: int):
+        self.open = np.zeros(capacity)
+        self.high = np.zeros(capacity)
+        self.low = np.zeros(capacity)
+        self.close = np.zeros(capacity)
+        self.volume = np.zeros(capacity)
+        self.notional = np.zeros(capacity)
+        self.trade_count = np.zeros(capacity, dtype="int64")
+        self.active = np.zeros(capacity, dtype=bool)
+
+    def grow(self, capacity: int):
+        for name, column in vars(self).items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def reset(self, rows):
+        self.volume[rows] = 0
+        self.notional[rows] = 0
+        self.trade_count[rows] = 0
+
+
+class BarAggregator:
+    """
+    Aggregates streamed trades into OHLCV bars for several timeframes at once.
+
+    Every timeframe keeps one row of numpy accumulators per symbol for the bar
+    currently forming. Bar boundaries are shared by all symbols, so when a trade
+    crosses a boundary every forming bar of that timeframe is finalized in one
+    pass and handed to the listeners as a ``Bar``.
+
+    By default only symbols registered with ``track`` are aggregated; pass
+    ``track_all=True`` to aggregate every symbol seen on the stream.
+    """
+
+    def __init__(
+        self, timeframes=SUPPORTED_TIMEFRAMES, capacity: int = 256, track_all=False
+    ):
+        self.timeframes = [str(tf) for tf in timeframes]
+        self.track_all = track_all
+        self._symbol_ids = {}
+        self._symbols = []
+        self._capacity = capacity
+        self._accumulators = {tf: _Accumulators(capacity) for tf in self.timeframes}
+        self._windows = {tf: (None, None) for tf in self.timeframes}
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """Registers ``listener(symbol, timeframe, bar)``, called for every finalized bar."""
+        self._listeners.append(listener)
+
+    def _symbol_id(self, symbol: str) -> int:
+        row = self._symbol_ids.get(symbol)
+        if row is None:
+            row = len(self._symbols)
+            if row >= self._capacity:
+                self._capacity *= 2
+                for accumulators in self._accumulators.values():
+                    accumulators.grow(self._capacity)
+            self._symbol_ids[symbol] = row
+            self._symbols.append(symbol)
+        return row
+
+    def track(self, symbol: str, timeframe: str):
+        """Starts (or restarts) aggregating ``symbol`` for ``timeframe`` from the next trade."""
+        row = self._symbol_id(symbol)
+        accumulators = self._accumulators[str(timeframe)]
+        accumulators.active[row] = True
+        accumulators.reset(row)
+
+    def untrack(self, symbol: str, timeframe: str):
+        row = self._symbol_ids.get(symbol)
+        if row is not None:
+            self._accumulators[str(timeframe)].active[row] = False
+
+    def on_trade(self, trade):
+        self.add_trade(
+            trade.symbol,
+            trade_timestamp_ns(trade),
+            float(trade.price),
+            float(trade.size),
+        )
+
+    def add_trade(self, symbol: str, ts_ns: int, price: float, size: float):
+        row = self._symbol_ids.get(symbol)
+        if row is None:
+            if not self.track_all:
+                return
+            row = self._symbol_id(symbol)
+            for accumulators in self._accumulators.values():
+                accumulators.active[row] = True
+
+        for timeframe in self.timeframes:
+            accumulators = self._accumulators[timeframe]
+            if not accumulators.active[row]:
+                continue
+            start, end = self._windows[timeframe]
+            if end is None or ts_ns >= end:
+                self._roll(timeframe, ts_ns)
+            elif ts_ns < start:
+                # Late print for a bar that has already been finalized
+                continue
+            if accumulators.trade_count[row] == 0:
+                accumulators.open[row] = price
+                accumulators.high[row] = price
+                accumulators.low[row] = price
+            else:
+                if price > accumulators.high[row]:
+                    accumulators.high[row] = price
+                if price < accumulators.low[row]:
+                    accumulators.low[row] = price
+            accumulators.close[row] = price
+            accumulators.volume[row] += size
+            accumulators.notional[row] += price * size
+            accumulators.trade_count[row] += 1
+
+    def add_trades(self, symbols, timestamps, prices, sizes):
+        """
+        Vectorized ingestion of a time-ordered batch of trades.
+
+        :param symbols: Sequence of symbols, one per trade.
+        :param timestamps: Trade timestamps as integer nanoseconds, ascending.
+        """
+        timestamps = np.asarray(timestamps, dtype="int64")
+        prices = np.asarray(prices, dtype="float64")
+        sizes = np.asarray(sizes, dtype="float64")
+        if self.track_all:
+            for symbol in set(symbols):
+                if symbol not in self._symbol_ids:
+                    row = self._symbol_id(symbol)
+                    for accumulators in self._accumulators.values():
+                        accumulators.active[row] = True
+        rows = np.fromiter(
+            (self._symbol_ids.get(s, -1) for s in symbols),
+            dtype="int64",
+            count=len(timestamps),
+        )
+        known = rows >= 0
+        rows, timestamps, prices, sizes = (
+            rows[known],
+            timestamps[known],
+            prices[known],
+            sizes[known],
+        )
+
+        for timeframe in self.timeframes:
+            accumulators = self._accumulators[timeframe]
+            selected = accumulators.active[rows]
+            tf_rows, tf_ts = rows[selected], timestamps[selected]
+            tf_prices, tf_sizes = prices[selected], sizes[selected]
+            lo = 0
+            while lo < len(tf_ts):
+                start, end = self._windows[timeframe]
+                if end is None or tf_ts[lo] >= end:
+                    self._roll(timeframe, int(tf_ts[lo]))
+                    start, end = self._windows[timeframe]
+                hi = int(np.searchsorted(tf_ts, end, side="left"))
+                chunk = slice(lo, hi)
+                in_window = tf_ts[chunk] >= start
+                self._accumulate(
+                    accumulators,
+                    tf_rows[chunk][in_window],
+                    tf_prices[chunk][in_window],
+                    tf_sizes[chunk][in_window],
+                )
+                lo = hi
+
+    @staticmethod
+    def _accumulate(accumulators, rows, prices, sizes):
+        if not len(rows):
+            return
+        # First and last trade of each symbol within the chunk
+        order = np.arange(len(rows))
+        first = np.full(len(accumulators.close), len(rows))
+        np.minimum.at(first, rows, order)
+        last = np.full(len(accumulators.close), -1)
+        np.maximum.at(last, rows, order)
+        touched = np.flatnonzero(last >= 0)
+
+        fresh = touched[accumulators.trade_count[touched] == 0]
+        accumulators.open[fresh] = prices[first[fresh]]
+        accumulators.high[fresh] = -np.inf
+        accumulators.low[fresh] = np.inf
+        np.maximum.at(accumulators.high, rows, prices)
+        np.minimum.at(accumulators.low, rows, prices)
+        accumulators.close[touched] = prices[last[touched]]
+        np.add.at(accumulators.volume, rows, sizes)
+        np.add.at(accumulators.notional, rows, prices * sizes)
+        np.add.at(accumulators.trade_count, rows, 1)
+
+    def _roll(self, timeframe: str, ts_ns: int):
+        """Finalizes every forming bar of ``timeframe`` and moves to the window holding ``ts_ns``."""
+        start, end = self._windows[timeframe]
+        if start is not None:
+            self._finalize(timeframe, start)
+        self._windows[timeframe] = bar_window(ts_ns, timeframe)
+
+    def close_elapsed(self, now_ns: int):
+        """Finalizes bars whose window has ended, for use when no trade crosses the boundary."""
+        for timeframe in self.timeframes:
+            start, end = self._windows[timeframe]
+            if end is not None and now_ns >= end:
+                self._finalize(timeframe, start)
+                self._windows[timeframe] = (None, None)
+
+    def _finalize(self, timeframe: str, start: int):
+        accumulators = self._accumulators[timeframe]
+        n = len(self._symbols)
+        rows = np.flatnonzero(accumulators.trade_count[:n] > 0)
+        if not len(rows):
+            return
+        vwap = accumulators.notional[rows] / np.where(
+            accumulators.volume[rows] > 0, accumulators.volume[rows], 1
+        )
+        bars = [
+            (
+                self._symbols[row],
+                Bar(
+                    start,
+                    float(accumulators.open[row]),
+                    float(accumulators.high[row]),
+                    float(accumulators.low[row]),
+                    float(accumulators.close[row]),
+                    float(accumulators.volume[row]),
+                    int(accumulators.trade_count[row]),
+                    float(bar_vwap),
+                ),
+            )
+            for row, bar_vwap in zip(rows, vwap)
+        ]
+        accumulators.reset(rows)
+        for symbol, bar in bars:
+            for listener in self._listeners:
+                try:
+                    listener(symbol, timeframe, bar)
+                except Exception as e:
+                    logger.error(f"Bar listener failed for {symbol} {timeframe}: {e}")
+
+    def partial_bar(self, symbol: str, timeframe: str):
+        """Returns the still-forming bar for ``symbol``/``timeframe``, or None if it has no trades yet."""
+        row = self._symbol_ids.get(symbol)
+        accumulators = self._accumulators[str(timeframe)]
+        if row is None or accumulators.trade_count[row] == 0:
+            return None
+        volume = accumulators.volume[row]
+        return Bar(
+            self._windows[str(timeframe)][0],
+            float(accumulators.open[row]),
+            float(accumulators.high[row]),
+            float(accumulators.low[row]),
+            float(accumulators.close[row]),
+            float(volume),
+            int(accumulators.trade_count[row]),
+            float(accumulators.notional[row] / volume) if volume > 0 else float("nan"),
+        )
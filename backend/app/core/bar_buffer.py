@@ -0,0 +1,198 @@
+import itertools
+import logging
+import numpy as np
+import pandas as pd
+from app.core.bar_aggregator import BarAggregator
+from app.core.timeframes import lookback_start
+
+logger = logging.getLogger(__name__)
+
+BUFFER_COLUMNS = ["open", "high", "low", "close", "volume"]
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(BUFFER_COLUMNS))
+
+# Seed generations are unique across buffers, so values cached for one buffer's
+# bars are never served for another's (e.g. a replay's) on the same symbol
+_generations = itertools.count(1)
+
+
+class BarBuffer:
+    """Fixed-capacity ring buffer of the most recent OHLCV bars for one symbol/timeframe."""
+
+    def __init__(self, timeframe: str, capacity: int = 500):
+        self.timeframe = timeframe
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity, dtype="int64")
+        self._values = np.zeros((capacity, len(BUFFER_COLUMNS)), dtype="float64")
+        self._count = 0
+        self.seeded_for = 0
+        self.generation = 0
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    @property
+    def last_timestamp(self):
+        if not self._count:
+            return None
+        return int(self._timestamps[(self._count - 1) % self.capacity])
+
+    @property
+    def count(self) -> int:
+        """Number of bars appended since the last seed, including those overwritten since."""
+        return self._count
+
+    def row(self, n: int):
+        """Returns the ``(timestamp, values)`` of the ``n``-th bar appended since the last seed."""
+        if not self._count - len(self) <= n < self._count:
+            raise IndexError(f"Bar {n} is no longer in the buffer.")
+        pos = n % self.capacity
+        return int(self._timestamps[pos]), self._values[pos]
+
+    def seed(self, bars: pd.DataFrame):
+        """Replaces the buffer contents with the newest rows of ``bars``."""
+        bars = bars.tail(self.capacity)
+        n = len(bars)
+        self._timestamps[:n] = bars.index.asi8
+        self._values[:n] = bars[BUFFER_COLUMNS].to_numpy(dtype="float64")
+        self._count = n
+        self.generation = next(_generations)
+
+    def append(self, timestamp: int, open_, high, low, close, volume):
+        pos = self._count % self.capacity
+        self._timestamps[pos] = timestamp
+        self._values[pos] = (open_, high, low, close, volume)
+        self._count += 1
+
+    @staticmethod
+    def _merged(row: np.ndarray, bar) -> np.ndarray:
+        """Folds trades aggregated since seeding into a bar that was still forming when fetched."""
+        merged = row.copy()
+        merged[HIGH] = max(row[HIGH], bar.high)
+        merged[LOW] = min(row[LOW], bar.low)
+        merged[CLOSE] = bar.close
+        merged[VOLUME] += bar.volume
+        return merged
+
+    def commit(self, bar):
+        """Adds a finalized bar from the aggregator."""
+        last = self.last_timestamp
+        if last is not None and bar.timestamp == last:
+            pos = (self._count - 1) % self.capacity
+            self._values[pos] = self._merged(self._values[pos], bar)
+        elif last is None or bar.timestamp > last:
+            self.append(
+                bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume
+            )
+
+    def to_frame(self, limit: int = None, partial=None) -> pd.DataFrame:
+        """
+        Returns the newest ``limit`` bars, including ``partial`` (the forming bar
+        from the aggregator) as the last row when given.
+        """
+        timestamps, values = self._timestamps, self._values
+        count = self._count
+        last = self.last_timestamp
+        if partial is not None and last is not None and partial.timestamp == last:
+            values = values.copy()
+            values[(count - 1) % self.capacity] = self._merged(
+                values[(count - 1) % self.capacity], partial
+            )
+            partial = None
+        elif partial is not None and last is not None and partial.timestamp < last:
+            partial = None
+
+        n = min(count, self.capacity)
+        if limit is not None:
+            n = min(n, limit - 1 if partial is not None else limit)
+        positions = np.arange(count - n, count) % self.capacity
+        ts, rows = timestamps[positions], values[positions]
+        if partial is not None:
+            ts = np.append(ts, partial.timestamp)
+            rows = np.vstack(
+                [
+                    rows,
+                    [
+                        [
+                            partial.open,
+                            partial.high,
+                            partial.low,
+                            partial.close,
+                            partial.volume,
+                        ]
+                    ],
+                ]
+            )
+        index = pd.DatetimeIndex(pd.to_datetime(ts, utc=True), name="timestamp")
+        return pd.DataFrame(rows, index=index, columns=BUFFER_COLUMNS)
+
+
+class BarBuffers:
+    """
+    Per-symbol rolling bar buffers kept current by the trade stream.
+
+    Buffers are created and seeded from the REST API the first time a strategy
+    asks for a symbol/timeframe. From then on the ``BarAggregator`` builds bars
+    from the streamed trades: finalized bars are appended to the buffer and the
+    forming bar is added when the buffer is read, so reading recent bars needs
+    no network round trip.
+    """
+
+    def __init__(self, capacity: int = 500, aggregator: BarAggregator = None):
+        self.capacity = capacity
+        self.aggregator = aggregator or BarAggregator()
+        self.aggregator.add_listener(self._on_bar)
+        self._buffers = {}
+
+    def get(self, symbol: str, timeframe: str):
+        return self._buffers.get(symbol, {}).get(str(timeframe))
+
+    def discard(self, symbol: str):
+        """Drops the buffers of ``symbol``, e.g. once its trades are no longer streamed."""
+        for timeframe in self._buffers.pop(symbol, {}):
+            self.aggregator.untrack(symbol, timeframe)
+
+    def on_trade(self, trade):
+        self.aggregator.on_trade(trade)
+
+    def _on_bar(self, symbol, timeframe, bar):
+        buffer = self.get(symbol, timeframe)
+        if buffer is not None:
+            buffer.commit(bar)
+
+    async def ensure(
+        self, symbol: str, timeframe: str, limit: int, get_bars
+    ) -> BarBuffer:
+        """
+        Returns the buffer for ``symbol``/``timeframe``, seeding it if needed.
+
+        :param get_bars: ``AlpacaService.get_bars_async``-compatible coroutine function
+                         used for seeding.
+        """
+        buffer = self.get(symbol, timeframe)
+        if buffer is not None and buffer.seeded_for >= limit:
+            return buffer
+        if buffer is None or buffer.capacity < limit:
+            buffer = BarBuffer(timeframe, capacity=max(self.capacity, limit))
+        bars = (
+            await get_bars(
+                symbol, timeframe, start=lookback_start(timeframe, limit).isoformat()
+            )
+        ).df
+        if not bars.empty:
+            buffer.seed(bars)
+        buffer.seeded_for = limit
+        self._buffers.setdefault(symbol, {})[str(timeframe)] = buffer
+        # The seed already holds every trade so far; aggregate from here on
+        self.aggregator.track(symbol, timeframe)
+        logger.info(
+            f"Seeded {timeframe} bar buffer for {symbol} with {len(buffer)} bars."
+        )
+        return buffer
+
+    async def get_frame(
+        self, symbol: str, timeframe: str, limit: int, get_bars
+    ) -> pd.DataFrame:
+        buffer = await self.ensure(symbol, timeframe, limit, get_bars)
+        return buffer.to_frame(
+            limit, partial=self.aggregator.partial_bar(symbol, timeframe)
+        )
@@ -0,0 +1,294 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from app.core.timeframes import lookback_start
+
+logger = logging.getLogger(__name__)
+
+
+class CachedBars:
+    """Minimal stand-in for Alpaca's ``BarsV2`` so callers can keep using ``.df``."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    def __len__(self):
+        return len(self.df)
+
+
+def _to_ns(value) -> int:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.value
+
+
+def _to_iso(ns: int) -> str:
+    return pd.Timestamp(ns, tz="UTC").isoformat()
+
+
+def _add_interval(coverage: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Adds ``[start, end]`` to a sorted list of disjoint intervals, merging overlaps."""
+    intervals = sorted([tuple(row) for row in coverage] + [(start, end)])
+    merged = []
+    for s, e in intervals:
+        if merged and s <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], e)
+        else:
+            merged.append([s, e])
+    return np.array(merged, dtype="int64").reshape(-1, 2)
+
+
+def _missing_intervals(coverage: np.ndarray, start: int, end: int) -> list:
+    """Returns the parts of ``[start, end]`` not covered by ``coverage``."""
+    missing = []
+    cursor = start
+    for s, e in coverage:
+        if e < cursor:
+            continue
+        if s > end:
+            break
+        if s > cursor:
+            missing.append((cursor, s))
+        cursor = max(cursor, e)
+        if cursor >= end:
+            break
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+
+class BarStore:
+    """
+    Disk-backed columnar cache of OHLCV bars keyed by (symbol, timeframe).
+
+    Each series is kept as one ``.npz`` file holding a column per field plus the
+    time ranges it is known to cover. Reads are served from memory; only the
+    ranges that are not covered yet (typically the tail since the last sync) are
+    fetched from the API and merged in. At most ``max_series`` series are kept
+    in memory; the least recently used are dropped and reloaded from disk.
+    """
+
+    def __init__(
+        self, root: str, refresh_interval: float = 15.0, max_series: int = 256
+    ):
+        self.root = root
+        self.refresh_interval = refresh_interval
+        self.max_series = max_series
+        self._series = OrderedDict()
+        self._synced_at = {}
+        # Guards the dicts above; disk reads and writes hold only their series' lock
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def _path(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(
+            self.root, str(timeframe), f"{symbol.replace('/', '_')}.npz"
+        )
+
+    def _key_lock(self, key) -> threading.RLock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.RLock())
+
+    def _remember(self, key, df: pd.DataFrame, coverage: np.ndarray):
+        with self._lock:
+            self._series[key] = (df, coverage)
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_series:
+                evicted, _ = self._series.popitem(last=False)
+                self._synced_at.pop(evicted, None)
+
+    def cached(self, symbol: str, timeframe: str) -> bool:
+        """Whether the series is held in memory."""
+        return (symbol, str(timeframe)) in self._series
+
+    def _load(self, symbol: str, timeframe: str):
+        key = (symbol, str(timeframe))
+        with self._lock:
+            if key in self._series:
+                self._series.move_to_end(key)
+                return self._series[key]
+        with self._key_lock(key):
+            with self._lock:
+                if key in self._series:
+                    return self._series[key]
+            path = self._path(symbol, timeframe)
+            df = pd.DataFrame()
+            coverage = np.empty((0, 2), dtype="int64")
+            if os.path.exists(path):
+                try:
+                    with np.load(path) as data:
+                        index = pd.DatetimeIndex(
+                            pd.to_datetime(data["timestamp"], utc=True),
+                            name="timestamp",
+                        )
+                        df = pd.DataFrame(
+                            {
+                                name: data[name]
+                                for name in data.files
+                                if name not in ("timestamp", "coverage")
+                            },
+                            index=index,
+                        )
+                        coverage = data["coverage"]
+                except Exception as e:
+                    logger.warning(f"Discarding unreadable bar cache {path}: {e}")
+            self._remember(key, df, coverage)
+            return df, coverage
+
+    def _save(
+        self, symbol: str, timeframe: str, df: pd.DataFrame, coverage: np.ndarray
+    ):
+        path = self._path(symbol, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        columns = {
+            name: df[name].to_numpy(dtype="float64")
+            for name in df.columns
+            if pd.api.types.is_numeric_dtype(df[name])
+        }
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            timestamp=df.index.asi8 if len(df) else np.empty(0, dtype="int64"),
+            coverage=coverage,
+            **columns,
+        )
+        os.replace(tmp_path, path)
+
+    def missing_ranges(
+        self, symbol, timeframe, start=None, end=None, limit=None
+    ) -> list:
+        """
+        Works out which REST requests are needed to answer a ``get_bars`` call.
+
+        :return: A list of keyword dicts for ``REST.get_bars`` (empty if the cache
+                 can answer on its own).
+        """
+        df, coverage = self._load(symbol, timeframe)
+        key = (symbol, str(timeframe))
+        now = time.time_ns()
+        end_ns = min(_to_ns(end), now) if end is not None else now
+
+        if start is None:
+            if df.empty:
+                # Nothing to anchor a range on yet, so fall back to the original request.
+                return [{"limit": limit, "end": end}]
+            start_ns = int(df.index.asi8[0])
+            if limit is not None and np.searchsorted(
+                df.index.asi8, end_ns, side="right"
+            ) < int(limit):
+                # Fewer bars cached than asked for: go back far enough for the rest
+                head = lookback_start(
+                    timeframe, int(limit), now=pd.Timestamp(end_ns, tz="UTC")
+                )
+                start_ns = min(start_ns, head.value)
+        else:
+            start_ns = _to_ns(start)
+
+        recently_synced = (
+            now - self._synced_at.get(key, 0) < self.refresh_interval * 1e9
+        )
+        if end is None and recently_synced and len(coverage):
+            end_ns = min(end_ns, int(coverage[-1][1]))
+        if end_ns <= start_ns:
+            return []
+
+        missing = _missing_intervals(coverage, start_ns, end_ns)
+        if missing and not df.empty:
+            # The newest stored bar may still have been forming when it was fetched.
+            last_bar = int(df.index.asi8[-1])
+            s, e = missing[-1]
+            if start_ns <= last_bar < s:
+                missing[-1] = (last_bar, e)
+
+        return [
+            {
+                "start": _to_iso(s),
+                "end": None if end is None and e == end_ns else _to_iso(e),
+            }
+            for s, e in missing
+        ]
+
+    def merge(
+        self,
+        symbol,
+        timeframe,
+        fetched: pd.DataFrame,
+        params: dict,
+        fetched_at: int = None,
+    ):
+        """Merges freshly fetched bars into the cache and persists them."""
+        fetched_at = fetched_at or time.time_ns()
+        key = (symbol, str(timeframe))
+        with self._key_lock(key):
+            df, coverage = self._load(symbol, timeframe)
+            if not fetched.empty:
+                fetched = fetched.drop(columns=["symbol"], errors="ignore")
+                if fetched.index.tz is None:
+                    fetched.index = fetched.index.tz_localize("UTC")
+                fetched.index = fetched.index.tz_convert("UTC").rename("timestamp")
+                combined = pd.concat([df, fetched]) if not df.empty else fetched
+                df = combined[~combined.index.duplicated(keep="last")].sort_index()
+
+            if params.get("start") is not None:
+                covered_from = _to_ns(params["start"])
+            elif not fetched.empty:
+                covered_from = int(fetched.index.asi8[0])
+            else:
+                covered_from = None
+            if covered_from is not None:
+                covered_to = (
+                    min(_to_ns(params["end"]), fetched_at)
+                    if params.get("end") is not None
+                    else fetched_at
+                )
+                coverage = _add_interval(coverage, covered_from, covered_to)
+
+            self._remember(key, df, coverage)
+            if params.get("end") is None:
+                self._synced_at[key] = fetched_at
+            # Other series, and reads of this one, go on while the file is rewritten
+            try:
+                self._save(symbol, timeframe, df, coverage)
+            except OSError as e:
+                logger.warning(
+                    f"Could not persist bar cache for {symbol} {timeframe}: {e}"
+                )
+
+    def read(self, symbol, timeframe, start=None, end=None, limit=None) -> pd.DataFrame:
+        df, _ = self._load(symbol, timeframe)
+        if df.empty:
+            return df.copy()
+        index = df.index.asi8
+        lo = (
+            np.searchsorted(index, _to_ns(start), side="left")
+            if start is not None
+            else 0
+        )
+        hi = (
+            np.searchsorted(index, _to_ns(end), side="right")
+            if end is not None
+            else len(index)
+        )
+        if limit is not None:
+            lo = max(lo, hi - int(limit))
+        return df.iloc[lo:hi].copy()
+
+    def get_bars(
+        self, symbol, timeframe, fetch, start=None, end=None, limit=None
+    ) -> pd.DataFrame:
+        """
+        Returns bars for the request, fetching only what the cache is missing.
+
+        :param fetch: Callable taking ``REST.get_bars`` keyword arguments
+                      (minus symbol/timeframe) and returning a bars DataFrame.
+        """
+        for params in self.missing_ranges(symbol, timeframe, start, end, limit):
+            params = {k: v for k, v in params.items() if v is not None}
+            fetched_at = time.time_ns()
+            self.merge(symbol, timeframe, fetch(**params), params, fetched_at)
+        return self.read(symbol, timeframe, start, end, limit)
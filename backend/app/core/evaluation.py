@@ -0,0 +1,131 @@
+import asyncio
+import logging
+
+EVERY_TRADE = "every_trade"
+THROTTLE = "throttle"
+BAR_CLOSE = "bar_close"
+EVALUATION_POLICIES = (EVERY_TRADE, THROTTLE, BAR_CLOSE)
+
+
+class EvaluationGate:
+    """
+    Decides when a strategy is evaluated for the trades of its symbol.
+
+    - ``every_trade``: every trade is evaluated, in the stream handler.
+    - ``throttle``: at most ``max_per_second`` evaluations, in the background.
+    - ``bar_close``: one evaluation each time a bar of the strategy's timeframe
+      closes, in the background.
+
+    With the last two policies, trades that arrive while an evaluation is
+    pending or running are coalesced: only the newest one is evaluated.
+
+    Every evaluation is isolated: it is cancelled after ``timeout`` seconds,
+    and errors are logged and counted instead of propagating to the stream.
+    Once ``cancel`` is called, nothing more is evaluated.
+    """
+
+    def __init__(
+        self,
+        evaluate,
+        policy: str = EVERY_TRADE,
+        max_per_second: float = 1.0,
+        timeout: float = None,
+        semaphore: asyncio.Semaphore = None,
+    ):
+        """
+        :param evaluate: Coroutine function called with the trade to evaluate.
+        :param timeout: Seconds an evaluation may run, or None for no limit.
+        :param semaphore: Shared cap on evaluations running at once.
+        """
+        if policy not in EVALUATION_POLICIES:
+            raise ValueError(
+                f"Unknown evaluation policy '{policy}', expected one of {EVALUATION_POLICIES}."
+            )
+        if max_per_second <= 0:
+            raise ValueError("max_per_second must be positive.")
+        self.evaluate = evaluate
+        self.policy = policy
+        self.min_interval = 1.0 / max_per_second
+        self.timeout = timeout
+        self.semaphore = semaphore
+        self.trades = 0
+        self.evaluations = 0
+        self.timeouts = 0
+        self.errors = 0
+        self._latest = None
+        self._due = False
+        self._last_run = None
+        self._task = None
+        self.cancelled = False
+
+    async def on_trade(self, trade):
+        if self.cancelled:
+            return
+        self.trades += 1
+        if self.policy == EVERY_TRADE:
+            await self._run(trade)
+            return
+        self._latest = trade
+        if self.policy == THROTTLE:
+            self._due = True
+            self._schedule()
+
+    def on_bar_close(self):
+        if self.policy == BAR_CLOSE and not self.cancelled:
+            self._due = True
+            self._schedule()
+
+    def _schedule(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        while self._due and self._latest is not None:
+            if self.policy == THROTTLE and self._last_run is not None:
+                wait = self._last_run + self.min_interval - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            trade, self._due = self._latest, False
+            self._last_run = loop.time()
+            await self._run(trade)
+
+    def cancel(self):
+        """Stops evaluating: drops the pending trade and cancels a background evaluation in progress."""
+        self.cancelled = True
+        self._latest, self._due = None, False
+        if self._task is not None:
+            self._task.cancel()
+
+    async def wait_idle(self):
+        """Waits until no background evaluation is pending or running."""
+        while self._task is not None and not self._task.done():
+            await asyncio.wait([self._task])
+
+    async def _run(self, trade):
+        if self.cancelled:
+            return
+        self.evaluations += 1
+        try:
+            if self.semaphore is None:
+                await asyncio.wait_for(self.evaluate(trade), self.timeout)
+            else:
+                async with self.semaphore:
+                    await asyncio.wait_for(self.evaluate(trade), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logging.warning(
+                f"Evaluation for {trade.symbol} timed out after {self.timeout}s."
+            )
+        except Exception as e:
+            self.errors += 1
+            logging.error(f"Error evaluating trade for {trade.symbol}: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "trades": self.trades,
+            "evaluations": self.evaluations,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class SharedBars:
+    """
+    A bars DataFrame copied once into a shared memory block.
+
+    Worker processes attach to the block by name instead of receiving the bars
+    pickled through the pool's pipe. The index is stored as int64 nanoseconds
+    followed by the numeric columns as a float64 matrix.
+    """
+
+    def __init__(self, bars: pd.DataFrame):
+        self.columns = [
+            c for c in bars.columns if pd.api.types.is_numeric_dtype(bars[c])
+        ]
+        self.rows = len(bars)
+        self.tz = (
+            str(bars.index.tz) if getattr(bars.index, "tz", None) is not None else None
+        )
+        size = max(1, self.rows * (len(self.columns) + 1) * 8)
+        self._shm = SharedMemory(create=True, size=size)
+        timestamps, values = self._views(self._shm.buf, self.rows, len(self.columns))
+        timestamps[:] = bars.index.asi8
+        values[:] = bars[self.columns].to_numpy(dtype="float64")
+        del timestamps, values
+
+    @staticmethod
+    def _views(buffer, rows: int, width: int):
+        timestamps = np.ndarray((rows,), dtype="int64", buffer=buffer)
+        values = np.ndarray(
+            (rows, width), dtype="float64", buffer=buffer, offset=rows * 8
+        )
+        return timestamps, values
+
+    @property
+    def handle(self) -> tuple:
+        """Picklable reference passed to worker processes."""
+        return (self._shm.name, self.rows, self.columns, self.tz)
+
+    @classmethod
+    def read(cls, handle: tuple) -> pd.DataFrame:
+        """Rebuilds the DataFrame from a ``handle``, in any process."""
+        name, rows, columns, tz = handle
+        shm = SharedMemory(name=name)
+        try:
+            timestamps, values = cls._views(shm.buf, rows, len(columns))
+            index = pd.DatetimeIndex(
+                pd.to_datetime(timestamps.copy(), utc=tz is not None)
+            )
+            if tz is not None:
+                index = index.tz_convert(tz)
+            bars = pd.DataFrame(
+                values.copy(), index=index.rename("timestamp"), columns=columns
+            )
+            del timestamps, values
+            return bars
+        finally:
+            shm.close()
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _call_with_shared_bars(fn, handle, args, kwargs):
+    return fn(SharedBars.read(handle), *args, **kwargs)
+
+
+class Executors:
+    """
+    Pools for work that must not run on the event loop thread.
+
+    CPU-bound work (indicators, feature engineering, model inference) goes to a
+    process pool so it can use every core; blocking I/O goes to a thread pool.
+    Both pools are created on first use. Functions sent to the process pool
+    must be importable module-level functions.
+    """
+
+    def __init__(self, cpu_workers: int = None, io_workers: int = None):
+        self.cpu_workers = cpu_workers
+        self.io_workers = io_workers
+        self._process_pool = None
+        self._thread_pool = None
+
+    def _worker_counts(self):
+        if self.cpu_workers is None or self.io_workers is None:
+            from config import settings
+
+            self.cpu_workers = (
+                self.cpu_workers or settings.CPU_WORKERS or os.cpu_count()
+            )
+            self.io_workers = self.io_workers or settings.IO_WORKERS
+        return self.cpu_workers, self.io_workers
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            cpu_workers, _ = self._worker_counts()
+            # Spawned rather than forked: the server process runs threads
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=cpu_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Started process pool with {cpu_workers} workers.")
+        return self._process_pool
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            _, io_workers = self._worker_counts()
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=io_workers, thread_name_prefix="io"
+            )
+        return self._thread_pool
+
+    async def run_cpu(self, fn, *args):
+        """Runs ``fn(*args)`` in the process pool."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.process_pool, fn, *args
+        )
+
+    async def run_io(self, fn, *args):
+        """Runs ``fn(*args)`` in the I/O thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.thread_pool, fn, *args
+        )
+
+    async def run_on_bars(self, fn, bars: pd.DataFrame, *args, **kwargs):
+        """
+        Runs ``fn(bars, *args, **kwargs)`` in the process pool, handing ``bars``
+        over through shared memory.
+        """
+        with SharedBars(bars) as shared:
+            return await self.run_on_shared(fn, shared, *args, **kwargs)
+
+    async def run_on_shared(self, fn, shared: SharedBars, *args, **kwargs):
+        """
+        Runs ``fn(bars, *args, **kwargs)`` in the process pool on bars already in
+        shared memory, so several jobs on the same bars copy them only once.
+        """
+        return await self.run_cpu(
+            _call_with_shared_bars, fn, shared.handle, args, kwargs
+        )
+
+    def shutdown(self):
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+
+
+executors = Executors()
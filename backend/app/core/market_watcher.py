@@ -1,16 +1,16 @@
 import asyncio
 import logging
-from app.services.alpaca import AlpacaService
+from app.services.alpaca import get_alpaca_service
 from app.core.connection_manager import manager
 
 logger = logging.getLogger(__name__)
 
 
 async def watch_market_status():
-    alpaca_service = AlpacaService()
+    alpaca_service = get_alpaca_service()
     while True:
         try:
-            clock = alpaca_service.get_clock()
+            clock = await alpaca_service.get_clock_async()
             await manager.broadcast_json(
                 {
                     "type": "market_status_update",
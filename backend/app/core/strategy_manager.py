@@ -1,15 +1,44 @@
+import asyncio
 import logging
 import pkgutil
 import inspect
+from config import settings
+from app.core.evaluation import BAR_CLOSE
 from app.strategies.base import BaseStrategy
 import app.strategies
 from typing import Dict, Type, Any
 from sqlalchemy.orm import Session
 
 
+def discover_strategies() -> Dict[str, Dict[str, Any]]:
+    """Finds every ``BaseStrategy`` subclass in the ``app.strategies`` package, by name."""
+    strategies = {}
+    for importer, modname, ispkg in pkgutil.iter_modules(app.strategies.__path__):
+        if not ispkg and modname != "base":
+            module = __import__(f"app.strategies.{modname}", fromlist="dummy")
+            for name, obj in inspect.getmembers(module):
+                if (
+                    inspect.isclass(obj)
+                    and issubclass(obj, BaseStrategy)
+                    and obj is not BaseStrategy
+                ):
+                    strategies[obj.name] = {
+                        "class": obj,
+                        "display_name": obj.display_name,
+                        "description": obj.description,
+                    }
+    return strategies
+
+
 class StrategyManager:
     def __init__(
-        self, alpaca_service, risk_manager, telegram_service, google_sheets_service, connection_manager, message_queue
+        self,
+        alpaca_service,
+        risk_manager,
+        telegram_service,
+        google_sheets_service,
+        connection_manager,
+        message_queue,
     ):
         self.alpaca_service = alpaca_service
         self.risk_manager = risk_manager
@@ -17,29 +46,24 @@ class StrategyManager:
         self.google_sheets_service = google_sheets_service
         self.connection_manager = connection_manager
         self.message_queue = message_queue
-        self.active_strategies = []
+        # Copy-on-write indexes: updates swap in new objects, so the stream handler
+        # can keep iterating a snapshot while strategies are started or stopped.
+        self._strategies = {}  # (name, symbol) -> strategy
+        self._strategies_by_symbol = {}  # symbol -> tuple of strategies
+        # Caps evaluations running at once across all strategies
+        self._evaluation_slots = asyncio.Semaphore(
+            settings.STRATEGY_MAX_CONCURRENT_EVALUATIONS
+        )
+        self.alpaca_service.bar_buffers.aggregator.add_listener(self._on_bar_close)
         self._strategy_classes = self._discover_strategies()
         logging.info(f"Discovered {len(self._strategy_classes)} strategies.")
 
     def _discover_strategies(self) -> Dict[str, Dict[str, Any]]:
-        strategies = {}
-        for importer, modname, ispkg in pkgutil.iter_modules(app.strategies.__path__):
-            if not ispkg and modname != "base":
-                module = __import__(f"app.strategies.{modname}", fromlist="dummy")
-                for name, obj in inspect.getmembers(module):
-                    if (
-                        inspect.isclass(obj)
-                        and issubclass(obj, BaseStrategy)
-                        and obj is not BaseStrategy
-                    ):
-                        strategies[obj.name] = {
-                            "class": obj,
-                            "display_name": obj.display_name,
-                            "description": obj.description,
-                        }
-        return strategies
-
-    def get_strategy_instance(self, name: str, symbol: str = None, **kwargs) -> BaseStrategy:
+        return discover_strategies()
+
+    def get_strategy_instance(
+        self, name: str, symbol: str = None, **kwargs
+    ) -> BaseStrategy:
         strategy_info = self._strategy_classes.get(name)
         if not strategy_info:
             return None
@@ -66,6 +90,74 @@ class StrategyManager:
             for name, info in self._strategy_classes.items()
         ]
 
+    @property
+    def active_strategies(self) -> tuple:
+        return tuple(self._strategies.values())
+
+    def get_strategy(self, name: str, symbol: str) -> BaseStrategy:
+        return self._strategies.get((name, symbol))
+
+    def strategies_for(self, symbol: str) -> tuple:
+        return self._strategies_by_symbol.get(symbol, ())
+
+    def active_symbols(self) -> set:
+        return {symbol for symbol in self._strategies_by_symbol if symbol}
+
+    def _replace(self, name: str, symbol: str, strategy: BaseStrategy = None):
+        """
+        Swaps the strategy registered under (name, symbol), removing it if ``strategy`` is None.
+
+        The previous strategy's evaluations are cancelled, so it cannot trade anymore.
+        """
+        key = (name, symbol)
+        strategies = dict(self._strategies)
+        previous = strategies.pop(key, None)
+        by_symbol = dict(self._strategies_by_symbol)
+        on_symbol = tuple(s for s in by_symbol.pop(symbol, ()) if s is not previous)
+        if strategy is not None:
+            strategies[key] = strategy
+            on_symbol += (strategy,)
+        if on_symbol:
+            by_symbol[symbol] = on_symbol
+        self._strategies_by_symbol = by_symbol
+        self._strategies = strategies
+        if previous is not None and previous is not strategy:
+            # A throttled or bar_close evaluation may still be waiting to run it
+            previous.evaluation.cancel()
+        return previous
+
+    def add_strategy(self, strategy: BaseStrategy):
+        """
+        Activates ``strategy`` and subscribes to its symbol's trades if needed.
+
+        A strategy already running under the same name and symbol is replaced.
+        """
+        strategy.evaluation.semaphore = self._evaluation_slots
+        previous = self._replace(strategy.name, strategy.symbol, strategy)
+        if previous is not None:
+            logging.info(
+                f"Replaced running {strategy.name} strategy for {strategy.symbol}."
+            )
+        if strategy.evaluation.policy == BAR_CLOSE and strategy.symbol:
+            # Bars must be aggregated from the start for the first close to be seen
+            self.alpaca_service.bar_buffers.aggregator.track(
+                strategy.symbol, strategy.timeframe
+            )
+        self.alpaca_service.set_trade_symbols(self.active_symbols())
+
+    def remove_strategy(self, name: str, symbol: str) -> BaseStrategy:
+        """
+        Deactivates the ``name`` strategy running on ``symbol``.
+
+        The symbol's trades are unsubscribed once no strategy uses it anymore.
+
+        :return: The removed strategy instance, or None if it was not running.
+        """
+        removed = self._replace(name, symbol)
+        if removed is not None:
+            self.alpaca_service.set_trade_symbols(self.active_symbols())
+        return removed
+
     async def run_strategy(
         self,
         name: str,
@@ -76,12 +168,29 @@ class StrategyManager:
     ):
         strategy_instance = self.get_strategy_instance(name, **strategy_params)
         if strategy_instance:
-            self.active_strategies.append(strategy_instance)
+            self.add_strategy(strategy_instance)
             await strategy_instance.run(symbol, timeframe, db)
         else:
             raise ValueError(f"Strategy '{name}' not found.")
 
     async def run_strategy_on_trade(self, trade):
-        for strategy in self.active_strategies:
-            if strategy.symbol == trade.symbol:
-                await strategy.run_on_trade(trade)
\ No newline at end of file
+        """Evaluates the trade for every strategy on its symbol concurrently."""
+        strategies = self.strategies_for(trade.symbol)
+        if len(strategies) == 1:
+            await strategies[0].evaluation.on_trade(trade)
+        elif strategies:
+            await asyncio.gather(
+                *(strategy.evaluation.on_trade(trade) for strategy in strategies),
+                return_exceptions=True,
+            )
+
+    def _on_bar_close(self, symbol, timeframe, bar):
+        for strategy in self.strategies_for(symbol):
+            if str(strategy.timeframe) == timeframe:
+                strategy.evaluation.on_bar_close()
+
+    def get_evaluation_stats(self):
+        return [
+            {"name": s.name, "symbol": s.symbol, **s.evaluation.stats()}
+            for s in self.active_strategies
+        ]
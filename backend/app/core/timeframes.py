@@ -0,0 +1,58 @@
+import math
+import pandas as pd
+
+MARKET_TZ = "America/New_York"
+
+# Fixed-width intraday timeframes, in nanoseconds
+INTRADAY_TIMEFRAMES = {
+    "1Min": 60 * 10**9,
+    "5Min": 5 * 60 * 10**9,
+    "15Min": 15 * 60 * 10**9,
+    "1Hour": 60 * 60 * 10**9,
+}
+
+SUPPORTED_TIMEFRAMES = tuple(INTRADAY_TIMEFRAMES) + ("1Day",)
+
+_MINUTES_PER_SESSION = 390
+
+
+def bar_window(ts_ns: int, timeframe: str) -> tuple:
+    """
+    Returns the ``(start, end)`` nanosecond bounds of the bar containing ``ts_ns``.
+
+    Intraday bars are aligned to UTC multiples of their width, daily bars to
+    midnight in the exchange's time zone, matching Alpaca's bar timestamps.
+    """
+    width = INTRADAY_TIMEFRAMES.get(str(timeframe))
+    if width is not None:
+        start = ts_ns - ts_ns % width
+        return start, start + width
+    if str(timeframe) == "1Day":
+        day = pd.Timestamp(ts_ns, tz="UTC").tz_convert(MARKET_TZ).normalize()
+        # A calendar day, which is 23 or 25 hours long on DST changes
+        next_day = day + pd.DateOffset(days=1)
+        return day.value, next_day.value
+    raise ValueError(f"Unsupported timeframe '{timeframe}'.")
+
+
+def lookback_start(timeframe: str, bars: int, now: pd.Timestamp = None) -> pd.Timestamp:
+    """Returns a start time far enough back to cover ``bars`` bars of market data."""
+    now = now or pd.Timestamp.now(tz="UTC")
+    width = INTRADAY_TIMEFRAMES.get(str(timeframe))
+    if width is None:
+        sessions = bars
+    else:
+        bars_per_session = max(1, _MINUTES_PER_SESSION * 60 * 10**9 // width)
+        sessions = math.ceil(bars / bars_per_session)
+    # Allow for weekends and market holidays
+    calendar_days = math.ceil(sessions * 7 / 5) + 5
+    # Whole days, so repeated requests within a day ask for the same range
+    return (now - pd.Timedelta(days=calendar_days)).floor("D")
+
+
+def trade_timestamp_ns(trade) -> int:
+    """Returns a stream trade's timestamp as integer nanoseconds since the epoch."""
+    raw = getattr(trade, "_raw", None)
+    if isinstance(raw, dict) and isinstance(raw.get("timestamp"), int):
+        return raw["timestamp"]
+    return pd.Timestamp(trade.timestamp).value
@@ -0,0 +1,175 @@
+import logging
+import os
+import numpy as np
+import pandas as pd
+from app.core.timeframes import MARKET_TZ, bar_window, trade_timestamp_ns
+
+logger = logging.getLogger(__name__)
+
+# One fixed-size record per trade; up to 8 one-character condition codes
+TAPE_DTYPE = np.dtype(
+    [
+        ("timestamp", "<i8"),
+        ("price", "<f8"),
+        ("size", "<u4"),
+        ("symbol_id", "<u4"),
+        ("conditions", "S8"),
+    ]
+)
+
+SYMBOLS_FILE = "symbols.txt"
+TAPE_SUFFIX = ".tape"
+
+
+def _load_symbols(root: str) -> list:
+    path = os.path.join(root, SYMBOLS_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="ascii") as f:
+        return f.read().splitlines()
+
+
+class TradeTapeWriter:
+    """
+    Records streamed trades to append-only binary tapes, one file per market day.
+
+    Each trade is a ``TAPE_DTYPE`` record, so a day's file is a plain array that
+    ``TradeTape`` maps into memory. Symbols are stored as IDs into
+    ``symbols.txt``, which lists one symbol per line and is only ever appended
+    to, so IDs stay valid across days and restarts. Records are buffered and
+    written out every ``buffer_records`` trades or ``flush_seconds`` of stream
+    time, whichever comes first; a new symbol always reaches the dictionary
+    before any of its trades reach a tape.
+    """
+
+    def __init__(
+        self, root: str, buffer_records: int = 4096, flush_seconds: float = 1.0
+    ):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._symbols_file = open(
+            os.path.join(root, SYMBOLS_FILE), "a", encoding="ascii"
+        )
+        self._symbol_ids = {symbol: i for i, symbol in enumerate(_load_symbols(root))}
+        self._buffer = np.zeros(buffer_records, dtype=TAPE_DTYPE)
+        self._pending = 0
+        self._flush_ns = int(flush_seconds * 10**9)
+        self._flushed_at = None
+        self._file = None
+        self._day_end = None
+        self.recorded = 0
+
+    def _symbol_id(self, symbol: str) -> int:
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[symbol] = len(self._symbol_ids)
+            self._symbols_file.write(symbol + "\n")
+            self._symbols_file.flush()
+        return symbol_id
+
+    def _open_day(self, ts_ns: int):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+        start, self._day_end = bar_window(ts_ns, "1Day")
+        day = pd.Timestamp(start, tz="UTC").tz_convert(MARKET_TZ).strftime("%Y-%m-%d")
+        path = os.path.join(self.root, day + TAPE_SUFFIX)
+        self._file = open(path, "ab")
+        # Drops a record torn by a crash mid-write, so the records stay aligned
+        torn = self._file.tell() % TAPE_DTYPE.itemsize
+        if torn:
+            self._file.truncate(self._file.tell() - torn)
+            self._file.seek(0, os.SEEK_END)
+            logger.warning(f"Dropped a partial record at the end of {path}.")
+
+    def record(self, trade):
+        """Records a trade from the stream."""
+        self.write(
+            trade.symbol,
+            trade_timestamp_ns(trade),
+            trade.price,
+            trade.size,
+            getattr(trade, "conditions", None) or (),
+        )
+
+    def write(self, symbol: str, ts_ns: int, price: float, size: float, conditions=()):
+        if self._day_end is None or ts_ns >= self._day_end:
+            self._open_day(ts_ns)
+        self._buffer[self._pending] = (
+            ts_ns,
+            price,
+            size,
+            self._symbol_id(symbol),
+            "".join(conditions)[:8].encode("ascii", "replace"),
+        )
+        self._pending += 1
+        self.recorded += 1
+        if self._flushed_at is None:
+            self._flushed_at = ts_ns
+        if (
+            self._pending == len(self._buffer)
+            or ts_ns - self._flushed_at >= self._flush_ns
+        ):
+            self.flush()
+            self._flushed_at = ts_ns
+
+    def flush(self):
+        if self._pending and self._file is not None:
+            self._file.write(self._buffer[: self._pending].tobytes())
+            self._file.flush()
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._day_end = None
+        self._symbols_file.close()
+
+
+class TradeTape:
+    """Reads the tapes a ``TradeTapeWriter`` recorded in ``root``."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @property
+    def symbols(self) -> list:
+        """Symbols by ID."""
+        return _load_symbols(self.root)
+
+    def days(self) -> list:
+        """Recorded market days, as ``YYYY-MM-DD`` strings, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name[: -len(TAPE_SUFFIX)]
+            for name in os.listdir(self.root)
+            if name.endswith(TAPE_SUFFIX)
+        )
+
+    def records(self, day: str) -> np.ndarray:
+        """The day's trades as a read-only memory-mapped ``TAPE_DTYPE`` array."""
+        path = os.path.join(self.root, day + TAPE_SUFFIX)
+        # Ignores a record still being written
+        count = os.path.getsize(path) // TAPE_DTYPE.itemsize
+        if not count:
+            return np.zeros(0, dtype=TAPE_DTYPE)
+        return np.memmap(path, dtype=TAPE_DTYPE, mode="r", shape=(count,))
+
+    def frame(self, day: str) -> pd.DataFrame:
+        """The day's trades indexed by timestamp, with ``symbol``, ``price``, ``size`` and ``conditions``."""
+        records = self.records(day)
+        symbols = np.array(self.symbols, dtype=object)
+        return pd.DataFrame(
+            {
+                "symbol": symbols[records["symbol_id"]],
+                "price": records["price"],
+                "size": records["size"],
+                "conditions": [list(c.decode("ascii")) for c in records["conditions"]],
+            },
+            index=pd.DatetimeIndex(
+                pd.to_datetime(records["timestamp"], utc=True), name="timestamp"
+            ),
+        )
@@ -0,0 +1,133 @@
+import inspect
+import math
+from collections import deque
+
+NAN = float("nan")
+
+
+def isnan(value) -> bool:
+    return value is None or math.isnan(value)
+
+
+def non_zero(value: float) -> float:
+    """Mirrors pandas-ta's ``non_zero_range``: a zero range becomes machine epsilon."""
+    return value if value != 0 else 2.220446049250313e-16
+
+
+class Indicator:
+    """
+    Technical indicator updated one bar at a time in constant time.
+
+    ``update`` folds a finalized bar into the state and returns the new value.
+    ``peek`` returns the value the indicator would have if the bar were
+    appended, without changing any state, which is how the still-forming bar
+    is evaluated. Values are NaN until enough bars have been seen.
+
+    ``inputs`` names the bar fields passed to ``update``/``peek``, in order.
+    ``spec`` identifies the indicator and its parameters, defaults included,
+    so equal indicators can share state.
+    """
+
+    inputs = ("close",)
+    value = NAN
+
+    def __new__(cls, *args, **kwargs):
+        indicator = super().__new__(cls)
+        try:
+            bound = inspect.signature(cls.__init__).bind(None, *args, **kwargs)
+        except TypeError:
+            # Raised again, with the usual message, by __init__
+            return indicator
+        bound.apply_defaults()
+        indicator.spec = (cls.__name__,) + tuple(bound.arguments.items())[1:]
+        return indicator
+
+    def update(self, *values):
+        raise NotImplementedError
+
+    def peek(self, *values):
+        raise NotImplementedError
+
+
+class RollingSum:
+    """Sum of the last ``length`` values, with Neumaier compensation like pandas' rolling sums."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.window = deque()
+        self._total = 0.0
+        self._compensation = 0.0
+
+    def __len__(self):
+        return len(self.window)
+
+    @property
+    def full(self) -> bool:
+        return len(self.window) == self.length
+
+    @property
+    def total(self) -> float:
+        return self._total + self._compensation
+
+    def _add(self, value: float):
+        total = self._total + value
+        if abs(self._total) >= abs(value):
+            self._compensation += (self._total - total) + value
+        else:
+            self._compensation += (value - total) + self._total
+        self._total = total
+
+    def push(self, value: float):
+        self.window.append(value)
+        self._add(value)
+        if len(self.window) > self.length:
+            self._add(-self.window.popleft())
+
+    def peek(self, value: float) -> float:
+        total = self.total + value
+        if self.full:
+            total -= self.window[0]
+        return total
+
+
+class RollingExtreme:
+    """Maximum (or minimum) of the last ``length`` values, kept with a monotonic deque."""
+
+    def __init__(self, length: int, largest: bool = True):
+        self.length = length
+        self.largest = largest
+        self._index = -1
+        self._candidates = deque()  # (index, value), values monotonic from the front
+
+    def _dominates(self, a: float, b: float) -> bool:
+        return a >= b if self.largest else a <= b
+
+    @property
+    def ready(self) -> bool:
+        return self._index + 1 >= self.length
+
+    @property
+    def current(self) -> float:
+        return self._candidates[0][1] if self.ready else NAN
+
+    def push(self, value: float):
+        self._index += 1
+        candidates = self._candidates
+        while candidates and self._dominates(value, candidates[-1][1]):
+            candidates.pop()
+        candidates.append((self._index, value))
+        if candidates[0][0] <= self._index - self.length:
+            candidates.popleft()
+
+    def peek(self, value: float) -> float:
+        index = self._index + 1
+        if index + 1 < self.length:
+            return NAN
+        best = value
+        for position in range(min(2, len(self._candidates))):
+            candidate_index, candidate = self._candidates[position]
+            if candidate_index > index - self.length:
+                if self._dominates(candidate, best):
+                    best = candidate
+                break
+        return best
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from app.indicators.feed import IndicatorFeed
+
+
+class IndicatorCache:
+    """
+    Indicator values shared by every strategy running on a symbol.
+
+    Values are keyed by (symbol, timeframe, indicator spec, last bar timestamp,
+    forming bar), so two strategies asking for the same indicator on the same
+    bar get one computation between them. The incremental state behind each
+    (symbol, timeframe, indicator spec) is shared as well, so finalized bars
+    are folded once per symbol rather than once per strategy. Both are bounded
+    and evicted least recently used first; an evicted state is rebuilt from the
+    bar buffer the next time it is needed.
+    """
+
+    def __init__(self, max_values: int = 4096, max_states: int = 1024):
+        self.max_values = max_values
+        self.max_states = max_states
+        self._values = OrderedDict()
+        self._states = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _state(self, key, indicator) -> IndicatorFeed:
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = IndicatorFeed(value=indicator)
+            if len(self._states) > self.max_states:
+                self._states.popitem(last=False)
+        else:
+            self._states.move_to_end(key)
+        return state
+
+    def values(self, symbol: str, indicator, buffer, partial=None) -> tuple:
+        """
+        Returns ``(previous, current)`` for ``indicator`` on ``symbol``'s ``buffer``,
+        as ``IndicatorFeed.sync`` would compute them.
+
+        :param indicator: Indicator whose ``spec`` identifies what to compute.
+        :param partial: The forming bar from the ``BarAggregator``, if any.
+        """
+        state_key = (symbol, str(buffer.timeframe), indicator.spec)
+        key = state_key + (buffer.generation, buffer.last_timestamp, partial)
+        cached = self._values.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._values.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        state = self._state(state_key, indicator).sync(buffer, partial)
+        cached = self._values[key] = (state.previous["value"], state.current["value"])
+        if len(self._values) > self.max_values:
+            self._values.popitem(last=False)
+            self.evictions += 1
+        return cached
+
+    def discard(self, symbol: str):
+        """Drops everything cached for ``symbol``."""
+        for cache in (self._values, self._states):
+            for key in [key for key in cache if key[0] == symbol]:
+                del cache[key]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "values": len(self._values),
+            "states": len(self._states),
+        }
+
+
+indicator_cache = IndicatorCache()
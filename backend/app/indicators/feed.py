@@ -0,0 +1,111 @@
+import copy
+from app.core.bar_buffer import BUFFER_COLUMNS, BarBuffer
+from app.indicators.base import NAN
+
+
+class IndicatorFeed:
+    """
+    A named set of indicators kept in step with a ``BarBuffer``.
+
+    Each finalized bar is folded into the indicators exactly once; the forming
+    bar is only peeked at. After ``sync``:
+
+    - ``current`` holds each indicator's value including the forming bar, like
+      ``iloc[-1]`` of the frame from ``BarBuffer.to_frame(partial=...)``,
+    - ``previous`` holds the values as of the last finalized bar (``iloc[-2]``),
+    - ``close`` is the latest price and ``bars`` the number of bars seen.
+
+    When the buffer is replaced or re-seeded, or more bars were committed than
+    it can hold since the last sync, the indicators start over from the bars
+    the buffer still has.
+    """
+
+    def __init__(self, **indicators):
+        self._prototypes = indicators
+        self._columns = {
+            name: [BUFFER_COLUMNS.index(field) for field in indicator.inputs]
+            for name, indicator in indicators.items()
+        }
+        self._reset(None)
+
+    def _reset(self, buffer: BarBuffer):
+        self.indicators = copy.deepcopy(self._prototypes)
+        self._buffer = buffer
+        self._generation = buffer.generation if buffer is not None else None
+        self._folded = buffer.count - len(buffer) if buffer is not None else 0
+        self.previous = {name: NAN for name in self.indicators}
+        self.current = dict(self.previous)
+        self.close = NAN
+        self.bars = 0
+
+    def _inputs(self, name, row):
+        return [float(row[column]) for column in self._columns[name]]
+
+    def _split(self, buffer: BarBuffer, partial):
+        """Returns how many buffered bars are final, and the forming bar's values if any."""
+        count = buffer.count
+        last = buffer.last_timestamp
+        if last is None:
+            return 0, None
+        if partial is not None and partial.timestamp > last:
+            # The aggregator moved on: every buffered bar is final
+            return count, [
+                partial.open,
+                partial.high,
+                partial.low,
+                partial.close,
+                partial.volume,
+            ]
+        # The newest buffered bar may still be forming
+        forming = buffer.row(count - 1)[1]
+        if partial is not None and partial.timestamp == last:
+            forming = BarBuffer._merged(forming, partial)
+        return count - 1, forming
+
+    def sync(
+        self, buffer: BarBuffer, partial=None, cache=None, symbol: str = None
+    ) -> "IndicatorFeed":
+        """
+        Catches the indicators up with ``buffer``.
+
+        :param partial: The forming bar from the ``BarAggregator``, if any.
+        :param cache: ``IndicatorCache`` to take the values from instead of this
+                      feed's own indicators, sharing them with other feeds on ``symbol``.
+        """
+        final, forming = self._split(buffer, partial)
+        if cache is not None:
+            for name, indicator in self.indicators.items():
+                self.previous[name], self.current[name] = cache.values(
+                    symbol, indicator, buffer, partial
+                )
+        else:
+            self._fold(buffer, final)
+            self.previous = {
+                name: indicator.value for name, indicator in self.indicators.items()
+            }
+            if forming is None:
+                self.current = dict(self.previous)
+            else:
+                self.current = {
+                    name: indicator.peek(*self._inputs(name, forming))
+                    for name, indicator in self.indicators.items()
+                }
+        if forming is None:
+            self.bars = final
+        else:
+            self.close = float(forming[BUFFER_COLUMNS.index("close")])
+            self.bars = final + 1
+        return self
+
+    def _fold(self, buffer: BarBuffer, final: int):
+        if (
+            buffer is not self._buffer
+            or buffer.generation != self._generation
+            or self._folded < buffer.count - len(buffer)
+        ):
+            self._reset(buffer)
+        for n in range(self._folded, final):
+            _, row = buffer.row(n)
+            for name, indicator in self.indicators.items():
+                indicator.update(*self._inputs(name, row))
+        self._folded = max(self._folded, final)
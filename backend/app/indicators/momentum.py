@@ -0,0 +1,138 @@
+from collections import namedtuple
+from app.indicators.base import NAN, Indicator, RollingExtreme, isnan, non_zero
+from app.indicators.moving_averages import EMA, RMA, SMA
+
+MacdValue = namedtuple("MacdValue", ["macd", "histogram", "signal"])
+StochasticValue = namedtuple("StochasticValue", ["k", "d"])
+
+
+class RSI(Indicator):
+    """Relative Strength Index, as ``ta.rsi`` (Wilder's averages of gains and losses)."""
+
+    def __init__(self, length: int = 14, scalar: float = 100):
+        self.length = length
+        self.scalar = scalar
+        self._gains = RMA(length)
+        self._losses = RMA(length)
+        self._previous_close = None
+        self.value = NAN
+
+    def _rsi(self, gain: float, loss: float) -> float:
+        total = gain + abs(loss)
+        if isnan(total) or total == 0:
+            return NAN
+        return self.scalar * gain / total
+
+    def update(self, close: float) -> float:
+        if self._previous_close is not None:
+            change = close - self._previous_close
+            self.value = self._rsi(
+                self._gains.update(max(change, 0.0)),
+                self._losses.update(min(change, 0.0)),
+            )
+        self._previous_close = close
+        return self.value
+
+    def peek(self, close: float) -> float:
+        if self._previous_close is None:
+            return NAN
+        change = close - self._previous_close
+        return self._rsi(
+            self._gains.peek(max(change, 0.0)), self._losses.peek(min(change, 0.0))
+        )
+
+
+class MACD(Indicator):
+    """
+    Moving Average Convergence Divergence, as ``ta.macd``.
+
+    The signal line is an EMA of the MACD line starting at its first valid value.
+    """
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        if slow < fast:
+            fast, slow = slow, fast
+        self.fast, self.slow, self.signal = fast, slow, signal
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+        self._signal = EMA(signal)
+        self.value = MacdValue(NAN, NAN, NAN)
+
+    @staticmethod
+    def _combine(fast: float, slow: float, signal) -> MacdValue:
+        macd = fast - slow
+        if isnan(macd):
+            return MacdValue(NAN, NAN, NAN)
+        signal_value = signal(macd)
+        return MacdValue(macd, macd - signal_value, signal_value)
+
+    def update(self, close: float) -> MacdValue:
+        self.value = self._combine(
+            self._fast.update(close), self._slow.update(close), self._signal.update
+        )
+        return self.value
+
+    def peek(self, close: float) -> MacdValue:
+        return self._combine(
+            self._fast.peek(close), self._slow.peek(close), self._signal.peek
+        )
+
+
+class Stochastic(Indicator):
+    """Stochastic oscillator, as ``ta.stoch`` (%K smoothed with an SMA, %D an SMA of %K)."""
+
+    inputs = ("high", "low", "close")
+
+    def __init__(self, k: int = 14, d: int = 3, smooth_k: int = 3):
+        self.k, self.d, self.smooth_k = k, d, smooth_k
+        self._highest = RollingExtreme(k, largest=True)
+        self._lowest = RollingExtreme(k, largest=False)
+        self._smooth = SMA(smooth_k)
+        self._signal = SMA(d)
+        self.value = StochasticValue(NAN, NAN)
+
+    @staticmethod
+    def _raw(highest: float, lowest: float, close: float) -> float:
+        if isnan(highest) or isnan(lowest):
+            return NAN
+        return 100 * (close - lowest) / non_zero(highest - lowest)
+
+    def update(self, high: float, low: float, close: float) -> StochasticValue:
+        self._highest.push(high)
+        self._lowest.push(low)
+        raw = self._raw(self._highest.current, self._lowest.current, close)
+        if not isnan(raw):
+            k = self._smooth.update(raw)
+            d = self._signal.update(k) if not isnan(k) else NAN
+            self.value = StochasticValue(k, d)
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> StochasticValue:
+        raw = self._raw(self._highest.peek(high), self._lowest.peek(low), close)
+        if isnan(raw):
+            return self.value
+        k = self._smooth.peek(raw)
+        return StochasticValue(k, self._signal.peek(k) if not isnan(k) else NAN)
+
+
+class AwesomeOscillator(Indicator):
+    """Awesome Oscillator, as ``ta.ao``: SMA(hl2, fast) - SMA(hl2, slow)."""
+
+    inputs = ("high", "low")
+
+    def __init__(self, fast: int = 5, slow: int = 34):
+        if slow < fast:
+            fast, slow = slow, fast
+        self.fast, self.slow = fast, slow
+        self._fast = SMA(fast)
+        self._slow = SMA(slow)
+        self.value = NAN
+
+    def update(self, high: float, low: float) -> float:
+        median = 0.5 * (high + low)
+        self.value = self._fast.update(median) - self._slow.update(median)
+        return self.value
+
+    def peek(self, high: float, low: float) -> float:
+        median = 0.5 * (high + low)
+        return self._fast.peek(median) - self._slow.peek(median)
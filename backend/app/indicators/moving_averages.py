@@ -0,0 +1,85 @@
+from app.indicators.base import NAN, Indicator, RollingSum, isnan
+
+
+class SMA(Indicator):
+    """Simple moving average, as ``ta.sma`` (``rolling(length).mean()``)."""
+
+    def __init__(self, length: int = 10):
+        self.length = length
+        self._sum = RollingSum(length)
+        self.value = NAN
+
+    def update(self, close: float) -> float:
+        self._sum.push(close)
+        self.value = self._sum.total / self.length if self._sum.full else NAN
+        return self.value
+
+    def peek(self, close: float) -> float:
+        if len(self._sum) + 1 < self.length:
+            return NAN
+        return self._sum.peek(close) / self.length
+
+
+class EMA(Indicator):
+    """
+    Exponential moving average, as ``ta.ema``: seeded with the SMA of the
+    first ``length`` values, then ``ewm(span=length, adjust=False)``.
+    """
+
+    def __init__(self, length: int = 10):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self._count = 0
+        self._seed = 0.0
+        self.value = NAN
+
+    def _next(self, close: float) -> float:
+        if self._count + 1 < self.length:
+            return NAN
+        if self._count + 1 == self.length:
+            return (self._seed + close) / self.length
+        return self.alpha * close + (1 - self.alpha) * self.value
+
+    def update(self, close: float) -> float:
+        value = self._next(close)
+        if self._count < self.length:
+            self._seed += close
+        self._count += 1
+        self.value = value
+        return value
+
+    def peek(self, close: float) -> float:
+        return self._next(close)
+
+
+class RMA(Indicator):
+    """
+    Wilder's moving average, as ``ta.rma``:
+    ``ewm(alpha=1/length, min_periods=length)`` with pandas' default ``adjust=True``.
+    """
+
+    def __init__(self, length: int = 10):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self._count = 0
+        self._numerator = 0.0
+        self._denominator = 0.0
+        self.value = NAN
+
+    def _next(self, close: float):
+        numerator = close + self.decay * self._numerator
+        denominator = 1.0 + self.decay * self._denominator
+        value = numerator / denominator if self._count + 1 >= self.length else NAN
+        return numerator, denominator, value
+
+    def update(self, close: float) -> float:
+        if isnan(close):
+            return self.value
+        self._numerator, self._denominator, self.value = self._next(close)
+        self._count += 1
+        return self.value
+
+    def peek(self, close: float) -> float:
+        if isnan(close):
+            return self.value
+        return self._next(close)[2]
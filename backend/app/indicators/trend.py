@@ -0,0 +1,66 @@
+from collections import deque, namedtuple
+from app.indicators.base import NAN, Indicator, RollingExtreme
+
+IchimokuValue = namedtuple("IchimokuValue", ["span_a", "span_b", "tenkan", "kijun"])
+
+
+class Midprice:
+    """Average of the highest high and lowest low over ``length`` bars, as ``ta.midprice``."""
+
+    def __init__(self, length: int):
+        self._highest = RollingExtreme(length, largest=True)
+        self._lowest = RollingExtreme(length, largest=False)
+
+    def push(self, high: float, low: float) -> float:
+        self._highest.push(high)
+        self._lowest.push(low)
+        return 0.5 * (self._highest.current + self._lowest.current)
+
+    def peek(self, high: float, low: float) -> float:
+        return 0.5 * (self._highest.peek(high) + self._lowest.peek(low))
+
+
+class Ichimoku(Indicator):
+    """
+    Ichimoku Cloud, as ``ta.ichimoku``.
+
+    Like the ``ISA``/``ISB`` columns pandas-ta returns, the spans are shifted
+    forward by ``kijun - 1`` bars, so the value for a bar is the span computed
+    ``kijun - 1`` bars earlier. The lagging span needs future bars and is not
+    available incrementally.
+    """
+
+    inputs = ("high", "low")
+
+    def __init__(self, tenkan: int = 9, kijun: int = 26, senkou: int = 52):
+        self.tenkan, self.kijun, self.senkou = tenkan, kijun, senkou
+        self.shift = kijun - 1
+        self._tenkan = Midprice(tenkan)
+        self._kijun = Midprice(kijun)
+        self._senkou = Midprice(senkou)
+        self._spans = deque(maxlen=self.shift + 1)
+        self.value = IchimokuValue(NAN, NAN, NAN, NAN)
+
+    def _shifted(self, spans, new_span):
+        # Span computed `shift` bars before the new one, once that many exist
+        if len(spans) < self.shift:
+            return (NAN, NAN)
+        return spans[len(spans) - self.shift] if self.shift else new_span
+
+    def update(self, high: float, low: float) -> IchimokuValue:
+        tenkan = self._tenkan.push(high, low)
+        kijun = self._kijun.push(high, low)
+        span = (0.5 * (tenkan + kijun), self._senkou.push(high, low))
+        self._spans.append(span)
+        span_a, span_b = (
+            self._spans[0] if len(self._spans) == self.shift + 1 else (NAN, NAN)
+        )
+        self.value = IchimokuValue(span_a, span_b, tenkan, kijun)
+        return self.value
+
+    def peek(self, high: float, low: float) -> IchimokuValue:
+        tenkan = self._tenkan.peek(high, low)
+        kijun = self._kijun.peek(high, low)
+        span = (0.5 * (tenkan + kijun), self._senkou.peek(high, low))
+        span_a, span_b = self._shifted(self._spans, span)
+        return IchimokuValue(span_a, span_b, tenkan, kijun)
@@ -0,0 +1,126 @@
+import math
+from collections import deque, namedtuple
+from app.indicators.base import NAN, Indicator, isnan, non_zero
+from app.indicators.moving_averages import RMA, SMA
+
+BollingerValue = namedtuple(
+    "BollingerValue", ["lower", "mid", "upper", "bandwidth", "percent"]
+)
+
+
+class RollingStd(Indicator):
+    """
+    Rolling standard deviation, as ``rolling(length).std(ddof=ddof)``.
+
+    Kept with a sliding-window Welford update. Like pandas, a window of
+    identical values has a standard deviation of exactly zero.
+    """
+
+    def __init__(self, length: int = 20, ddof: int = 1):
+        self.length = length
+        self.ddof = ddof
+        self._window = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._repeats = 0  # trailing run of identical values
+        self.value = NAN
+
+    def _next(self, close: float):
+        n, mean, m2 = len(self._window) + 1, self._mean, self._m2
+        delta = close - mean
+        mean += delta / n
+        m2 += delta * (close - mean)
+        if len(self._window) == self.length:
+            oldest = self._window[0]
+            n -= 1
+            delta = oldest - mean
+            mean -= delta / n
+            m2 -= delta * (oldest - mean)
+        repeats = self._repeats + 1 if self._window and close == self._window[-1] else 1
+        if n < self.length:
+            return mean, m2, repeats, NAN
+        if repeats >= self.length:
+            return mean, m2, repeats, 0.0
+        return mean, m2, repeats, math.sqrt(max(m2, 0.0) / (n - self.ddof))
+
+    def update(self, close: float) -> float:
+        self._mean, self._m2, self._repeats, self.value = self._next(close)
+        self._window.append(close)
+        if len(self._window) > self.length:
+            self._window.popleft()
+        return self.value
+
+    def peek(self, close: float) -> float:
+        return self._next(close)[3]
+
+
+class BollingerBands(Indicator):
+    """Bollinger Bands, as ``ta.bbands`` (SMA middle band, population standard deviation)."""
+
+    def __init__(self, length: int = 5, std: float = 2.0, ddof: int = 0):
+        self.length = length
+        self.std = std
+        self._mid = SMA(length)
+        self._deviation = RollingStd(length, ddof=ddof)
+        self.value = BollingerValue(NAN, NAN, NAN, NAN, NAN)
+
+    def _bands(self, close: float, mid: float, deviation: float) -> BollingerValue:
+        if isnan(mid) or isnan(deviation):
+            return BollingerValue(NAN, NAN, NAN, NAN, NAN)
+        lower = mid - self.std * deviation
+        upper = mid + self.std * deviation
+        width = non_zero(upper - lower)
+        return BollingerValue(
+            lower, mid, upper, 100 * width / mid, non_zero(close - lower) / width
+        )
+
+    def update(self, close: float) -> BollingerValue:
+        self.value = self._bands(
+            close, self._mid.update(close), self._deviation.update(close)
+        )
+        return self.value
+
+    def peek(self, close: float) -> BollingerValue:
+        return self._bands(close, self._mid.peek(close), self._deviation.peek(close))
+
+
+class ATR(Indicator):
+    """
+    Average True Range.
+
+    With the defaults this is ``ta.atr``: Wilder's average of the true range,
+    where the first bar has no true range. ``mamode="sma"`` with
+    ``include_first_range=True`` reproduces ``RiskManager.calculate_atr``,
+    which averages with a plain rolling mean and uses high - low for the first bar.
+    """
+
+    inputs = ("high", "low", "close")
+
+    def __init__(
+        self, length: int = 14, mamode: str = "rma", include_first_range: bool = False
+    ):
+        if mamode not in ("rma", "sma"):
+            raise ValueError(f"Unsupported ATR mamode '{mamode}'.")
+        self.length = length
+        self.include_first_range = include_first_range
+        self._average = RMA(length) if mamode == "rma" else SMA(length)
+        self._previous_close = None
+        self.value = NAN
+
+    def _true_range(self, high: float, low: float) -> float:
+        high_low = non_zero(high - low)
+        if self._previous_close is None:
+            return high_low if self.include_first_range else NAN
+        previous = self._previous_close
+        return max(abs(high_low), abs(high - previous), abs(previous - low))
+
+    def update(self, high: float, low: float, close: float) -> float:
+        true_range = self._true_range(high, low)
+        if not isnan(true_range):
+            self.value = self._average.update(true_range)
+        self._previous_close = close
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> float:
+        true_range = self._true_range(high, low)
+        return self.value if isnan(true_range) else self._average.peek(true_range)
@@ -0,0 +1,187 @@
+import functools
+import logging
+import threading
+from collections import OrderedDict
+import pandas as pd
+from app.indicators.base import isnan
+from app.indicators.feed import IndicatorFeed
+from app.indicators.momentum import MACD, RSI, Stochastic
+from app.indicators.moving_averages import EMA, SMA
+from app.indicators.volatility import ATR, BollingerBands
+
+# Bars the live features are seeded with
+FEATURE_WARMUP = 100
+
+
+class FeatureIndicator:
+    """
+    One indicator of a feature set, and the feature columns taken from its output.
+
+    :param compute: ``compute(ta, bars)`` computes the indicator over all of
+                    ``bars``; ``ta`` is the pandas-ta module.
+    :param indicator: Its incremental equivalent, for the newest row in live trading.
+    :param columns: Feature column -> position in the indicator's output
+                    (``compute``'s columns, or the fields of the indicator's value).
+    """
+
+    def __init__(self, name: str, compute, indicator, columns: dict = None):
+        self.name = name
+        self.compute = compute
+        self.indicator = indicator
+        self.columns = columns or {name: 0}
+
+
+# The model's features, in order. Each indicator is computed once and its
+# columns picked by position; the names are the ones the model was trained
+# with, so e.g. "bb_upper" is the first column of ta.bbands (the lower band).
+FEATURES = [
+    # Momentum
+    FeatureIndicator("rsi", lambda ta, bars: ta.rsi(bars.close), RSI()),
+    FeatureIndicator(
+        "macd",
+        lambda ta, bars: ta.macd(bars.close),
+        MACD(),
+        {"macd": 0, "macds": 1, "macdh": 2},
+    ),
+    FeatureIndicator(
+        "stoch",
+        lambda ta, bars: ta.stoch(bars.high, bars.low, bars.close),
+        Stochastic(),
+        {"stoch_k": 0, "stoch_d": 1},
+    ),
+    # Volatility
+    FeatureIndicator(
+        "bbands",
+        lambda ta, bars: ta.bbands(bars.close),
+        BollingerBands(),
+        {"bb_upper": 0, "bb_mid": 1, "bb_lower": 2},
+    ),
+    FeatureIndicator(
+        "atr", lambda ta, bars: ta.atr(bars.high, bars.low, bars.close), ATR()
+    ),
+    # Trend
+    FeatureIndicator("sma20", lambda ta, bars: ta.sma(bars.close, length=20), SMA(20)),
+    FeatureIndicator("sma50", lambda ta, bars: ta.sma(bars.close, length=50), SMA(50)),
+    FeatureIndicator("ema20", lambda ta, bars: ta.ema(bars.close, length=20), EMA(20)),
+    FeatureIndicator("ema50", lambda ta, bars: ta.ema(bars.close, length=50), EMA(50)),
+]
+
+# Simple features used instead when pandas-ta is not installed
+FALLBACK_FEATURES = [
+    FeatureIndicator(
+        f"sma_{length}",
+        lambda ta, bars, length=length: bars["close"].rolling(window=length).mean(),
+        SMA(length),
+    )
+    for length in (5, 10, 20, 50)
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _pandas_ta():
+    try:
+        import pandas_ta as ta
+
+        return ta
+    except ImportError:
+        return None
+
+
+def active_features() -> list:
+    """The feature set models are trained on here: ``FEATURES``, or ``FALLBACK_FEATURES`` without pandas-ta."""
+    return FEATURES if _pandas_ta() is not None else FALLBACK_FEATURES
+
+
+def prepare_features(bars: pd.DataFrame) -> pd.DataFrame:
+    """Creates a rich set of features for the model using pandas-ta."""
+    ta = _pandas_ta()
+    if ta is None:
+        logging.error("pandas-ta is not installed. Cannot create advanced features.")
+    try:
+        columns = {}
+        for feature in active_features():
+            output = feature.compute(ta, bars)
+            if isinstance(output, pd.Series):
+                output = output.to_frame()
+            for column, position in feature.columns.items():
+                columns[column] = output.iloc[:, position]
+        features = pd.DataFrame(columns, index=bars.index)
+        features.dropna(inplace=True)
+        return features
+    except Exception as e:
+        logging.error(f"Error creating features with pandas-ta: {e}")
+        return pd.DataFrame()  # Return empty dataframe on error
+
+
+def feature_feed(**extra) -> IndicatorFeed:
+    """
+    An ``IndicatorFeed`` of the active feature set's incremental indicators, for ``latest_features``.
+
+    :param extra: More indicators to keep in the same feed, by name.
+    """
+    return IndicatorFeed(
+        **{feature.name: feature.indicator for feature in active_features()}, **extra
+    )
+
+
+def latest_features(feed: IndicatorFeed) -> pd.DataFrame:
+    """
+    The newest bar's features from a synced ``feature_feed``, as a one-row frame.
+
+    Matches the last row of ``prepare_features`` on the buffered bars, but
+    only the newest bar is computed. Returns None while any feature is NaN.
+    """
+    row = {}
+    for feature in active_features():
+        value = feed.current[feature.name]
+        for column, position in feature.columns.items():
+            row[column] = value[position] if isinstance(value, tuple) else value
+    if any(isnan(value) for value in row.values()):
+        return None
+    return pd.DataFrame([row])
+
+
+class FeatureCache:
+    """
+    Training feature matrices, keyed by symbol, timeframe and the range of bars they cover.
+
+    A range is identified by its first and last bar timestamps and its bar
+    count, so an open-ended request keeps hitting the cache until new bars
+    arrive. Bounded and evicted least recently used first. Cached frames are
+    shared; callers must not modify them.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._features = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbol: str, timeframe: str, bars: pd.DataFrame) -> pd.DataFrame:
+        """Returns ``prepare_features(bars)``, computed once per range."""
+        if bars.empty:
+            return prepare_features(bars)
+        key = (symbol, str(timeframe), bars.index[0], bars.index[-1], len(bars))
+        with self._lock:
+            features = self._features.get(key)
+            if features is not None:
+                self.hits += 1
+                self._features.move_to_end(key)
+                return features
+            self.misses += 1
+
+        features = prepare_features(bars)
+        if not features.empty:
+            with self._lock:
+                self._features[key] = features
+                if len(self._features) > self.max_entries:
+                    self._features.popitem(last=False)
+        return features
+
+    def clear(self):
+        with self._lock:
+            self._features.clear()
+
+
+feature_cache = FeatureCache()
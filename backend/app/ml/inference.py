@@ -0,0 +1,27 @@
+import logging
+import os
+import joblib
+import pandas as pd
+
+# Models loaded by this process, keyed by path and invalidated when the file changes
+_models = {}
+
+
+def load_model(model_path: str):
+    """Loads the model at ``model_path`` once per process, reloading it after retraining."""
+    mtime = os.path.getmtime(model_path)
+    cached = _models.get(model_path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, joblib.load(model_path))
+        _models[model_path] = cached
+        logging.info(f"Loaded model {model_path} in process {os.getpid()}.")
+    return cached[1]
+
+
+def predict_features(features: pd.DataFrame, model_path: str) -> int:
+    """
+    Predicts on the newest row of ``features`` (see ``latest_features``).
+
+    Meant to run in a worker process, so the model stays off the event loop.
+    """
+    return int(load_model(model_path).predict(features.tail(1))[0])
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+
+def _window_extreme(values: np.ndarray, window: int, op) -> np.ndarray:
+    """
+    ``op`` (``np.fmax`` or ``np.fmin``) over ``values[i : i + window]`` for every ``i``.
+
+    Windows are doubled until the next doubling would overshoot, then two
+    overlapping windows cover the rest, so this takes log2(window) passes.
+    NaNs are skipped unless a whole window is NaN.
+    """
+    result = values
+    span = 1
+    while span * 2 <= window:
+        result = op(result[:-span], result[span:])
+        span *= 2
+    if span < window:
+        result = op(result[: len(result) - (window - span)], result[window - span :])
+    return result
+
+
+def barrier_labels(
+    close: pd.Series,
+    width: pd.Series,
+    take_profit: float = 2.0,
+    stop_loss: float = 1.0,
+    time_limit: int = 5,
+    first_touch: bool = False,
+) -> pd.Series:
+    """
+    Labels each bar by whether a long entry at its close would have paid off.
+
+    The take-profit and stop-loss barriers sit ``take_profit`` and ``stop_loss``
+    times the bar's ``width`` (e.g. its ATR) above and below the close; the
+    time limit is the next ``time_limit`` closes. A bar is labeled 1 when some
+    close within the time limit reaches the take-profit and none reaches the
+    stop-loss, or, with ``first_touch``, when the take-profit is reached before
+    the stop-loss. Bars without a width (NaN or 0) and the last ``time_limit``
+    bars, whose outcome is not known yet, are labeled 0.
+
+    :param close: Closing prices.
+    :param width: Barrier unit per bar, aligned with ``close``.
+    :return: 0/1 labels indexed like ``close``.
+    """
+    if time_limit < 1:
+        raise ValueError("time_limit must be at least 1 bar.")
+    prices = close.to_numpy(dtype="float64")
+    widths = width.to_numpy(dtype="float64")
+    labels = np.zeros(len(prices), dtype="int64")
+    entries = len(prices) - time_limit
+    if entries <= 0:
+        return pd.Series(labels, index=close.index)
+
+    entry = prices[:entries]
+    unit = widths[:entries]
+    upper = entry + unit * take_profit
+    lower = entry - unit * stop_loss
+    valid = ~np.isnan(unit) & (unit != 0)
+
+    if first_touch:
+        # Row i holds closes i+1 .. i+time_limit
+        future = np.lib.stride_tricks.sliding_window_view(prices[1:], time_limit)[
+            :entries
+        ]
+        hit_upper = future >= upper[:, None]
+        hit_lower = future <= lower[:, None]
+        first_upper = np.where(
+            hit_upper.any(axis=1), hit_upper.argmax(axis=1), time_limit
+        )
+        first_lower = np.where(
+            hit_lower.any(axis=1), hit_lower.argmax(axis=1), time_limit
+        )
+        wins = first_upper < first_lower
+    else:
+        highest = _window_extreme(prices[1:], time_limit, np.fmax)
+        lowest = _window_extreme(prices[1:], time_limit, np.fmin)
+        wins = (highest >= upper) & ~(lowest <= lower)
+
+    labels[:entries] = valid & wins
+    return pd.Series(labels, index=close.index)
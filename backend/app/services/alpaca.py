@@ -1,11 +1,21 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import alpaca_trade_api as tradeapi
 from alpaca_trade_api.stream import Stream
 from config import settings
+from app.core.bar_buffer import BarBuffers
+from app.core.bar_store import BarStore, CachedBars
 from app.core.connection_manager import manager
+from app.core.trade_tape import TradeTapeWriter
+from app.indicators.cache import indicator_cache
+from app.services.alpaca_async import AsyncAlpacaClient
+from app.services.rate_limiter import Priority, RateLimiter
+from app.services.single_flight import SingleFlight
 from fastapi import HTTPException
 import json
 import logging
+import time
+import pandas as pd
 
 
 class AlpacaService:
@@ -26,9 +36,58 @@ class AlpacaService:
             api_version="v2",
         )
 
+        # One request budget for every Alpaca call, handed out by priority
+        self.rate_limiter = RateLimiter(settings.ALPACA_RATE_LIMIT_PER_MINUTE)
+
+        # Non-blocking client for the event loop, sharing one keep-alive connection pool
+        self.async_api = AsyncAlpacaClient(
+            key_id=settings.ALPACA_API_KEY,
+            secret_key=settings.ALPACA_SECRET_KEY,
+            base_url=settings.ALPACA_BASE_URL,
+            max_connections=settings.ALPACA_MAX_CONNECTIONS,
+            max_concurrency=settings.ALPACA_MAX_CONCURRENT_REQUESTS,
+            timeout=settings.ALPACA_REQUEST_TIMEOUT,
+            rate_limiter=self.rate_limiter,
+        )
+
+        # Local bar cache; get_bars only goes to the API for ranges it is missing
+        self.bar_store = BarStore(
+            settings.BAR_STORE_DIR,
+            refresh_interval=settings.BAR_STORE_REFRESH_SECONDS,
+            max_series=settings.BAR_STORE_MAX_SERIES,
+        )
+
+        # Rolling per-symbol bars kept current by the trade stream
+        self.bar_buffers = BarBuffers()
+
+        # Shares one cache sync between concurrent identical get_bars_async calls
+        self._bars_flight = SingleFlight()
+
+        # Every streamed trade recorded to disk, when a tape directory is configured
+        self.trade_tape = (
+            TradeTapeWriter(settings.TRADE_TAPE_DIR)
+            if settings.TRADE_TAPE_DIR
+            else None
+        )
+
+        # Trade stream subscriptions, kept in line with the symbols strategies run on
+        self.stream = None
+        self._trade_handler = None
+        self._subscribed_symbols = set()
+        self._wanted_symbols = set()
+        self._subscription_task = None
+        self.subscription_batch_delay = 0.25
+
+        # Closes bars at their timeframe boundary instead of at the next trade,
+        # holding each open a little longer for prints still on their way
+        self._bar_close_task = None
+        self.bar_close_interval = 0.5
+        self.bar_close_delay = 1.0
+
     async def get_account_info(self):
         try:
-            account = self.api.get_account()
+            await self.rate_limiter.acquire(Priority.UI)
+            account = await asyncio.to_thread(self.api.get_account)
             await manager.broadcast_json(
                 {"type": "account_update", "data": account._raw}
             )
@@ -52,7 +111,19 @@ class AlpacaService:
                 detail=f"An unexpected error occurred while fetching account info: {e}",
             )
 
-    def get_bars(self, symbol, timeframe, start=None, end=None, limit=None):
+    def _fetch_bars(self, symbol, timeframe, priority, **params):
+        self.rate_limiter.acquire_sync(priority)
+        return self.data_api.get_bars(symbol, timeframe, **params).df
+
+    def get_bars(
+        self,
+        symbol,
+        timeframe,
+        start=None,
+        end=None,
+        limit=None,
+        priority=Priority.BACKGROUND,
+    ):
         try:
             request_params = {
                 "symbol": symbol,
@@ -65,14 +136,117 @@ class AlpacaService:
             # And it's better to remove None params
             request_params = {k: v for k, v in request_params.items() if v is not None}
 
-            bars = self.data_api.get_bars(**request_params)
-            return bars
+            bars = self.bar_store.get_bars(
+                fetch=lambda **params: self._fetch_bars(
+                    symbol, timeframe, priority, **params
+                ),
+                **request_params,
+            )
+            return CachedBars(bars)
         except Exception as e:
             logging.error(f"Error fetching bars: {e}")
             raise HTTPException(status_code=500, detail=f"Error fetching bars: {e}")
 
-    def submit_order(
+    async def get_bars_async(
+        self,
+        symbol,
+        timeframe,
+        start=None,
+        end=None,
+        limit=None,
+        priority=Priority.STRATEGY_DATA,
+    ):
+        try:
+            await self._bars_flight.do(
+                (symbol, str(timeframe), start, end, limit),
+                lambda: self._sync_bars(symbol, timeframe, start, end, limit, priority),
+            )
+            # Store lookups can wait on a disk load, so they stay off the event loop
+            bars = await asyncio.to_thread(
+                self.bar_store.read,
+                symbol,
+                timeframe,
+                start=start,
+                end=end,
+                limit=limit,
+            )
+            return CachedBars(bars)
+        except Exception as e:
+            logging.error(f"Error fetching bars: {e}")
+            raise HTTPException(status_code=500, detail=f"Error fetching bars: {e}")
+
+    async def _sync_bars(
         self,
+        symbol,
+        timeframe,
+        start=None,
+        end=None,
+        limit=None,
+        priority=Priority.STRATEGY_DATA,
+    ):
+        """Fetches whatever the bar cache is missing for the request and merges it in."""
+        missing = await asyncio.to_thread(
+            self.bar_store.missing_ranges,
+            symbol,
+            timeframe,
+            start=start,
+            end=end,
+            limit=limit,
+        )
+        for params in missing:
+            params = {k: v for k, v in params.items() if v is not None}
+            fetched_at = time.time_ns()
+            bars = await self.async_api.get_bars(
+                symbol, timeframe, priority=priority, **params
+            )
+            await asyncio.to_thread(
+                self.bar_store.merge, symbol, timeframe, bars.df, params, fetched_at
+            )
+
+    def get_multi_bars(
+        self, symbols, timeframe, start=None, end=None, chunk_size=200, max_workers=8
+    ):
+        """
+        Fetches bars for many symbols through the multi-symbol bars endpoint.
+
+        Symbols are split into chunks of ``chunk_size`` that are requested
+        concurrently; the client follows the pagination tokens of each chunk.
+        Results are merged into the local bar cache only for series it already
+        holds, so a universe-wide scan does not write a cache file per symbol.
+        Requests are scheduled at background priority.
+
+        :return: A dict mapping each symbol to its bars DataFrame.
+        """
+        chunks = [
+            symbols[i : i + chunk_size] for i in range(0, len(symbols), chunk_size)
+        ]
+        params = {
+            k: v for k, v in {"start": start, "end": end}.items() if v is not None
+        }
+
+        def fetch_chunk(chunk):
+            try:
+                return self._fetch_bars(chunk, timeframe, Priority.BACKGROUND, **params)
+            except Exception as e:
+                logging.error(f"Error fetching bars for {len(chunk)} symbols: {e}")
+                return pd.DataFrame()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(fetch_chunk, chunks))
+
+        bars_by_symbol = {}
+        for frame in frames:
+            if frame.empty:
+                continue
+            for symbol, bars in frame.groupby("symbol", sort=False):
+                bars = bars.drop(columns=["symbol"])
+                bars_by_symbol[symbol] = bars
+                if start is not None and self.bar_store.cached(symbol, timeframe):
+                    self.bar_store.merge(symbol, timeframe, bars, params)
+        return bars_by_symbol
+
+    @staticmethod
+    def _order_data(
         symbol,
         side,
         type,
@@ -83,29 +257,54 @@ class AlpacaService:
         take_profit=None,
         stop_loss=None,
     ):
-        try:
-            if not qty and not notional:
-                raise ValueError("Either 'qty' or 'notional' must be provided.")
-            if qty and notional:
-                raise ValueError("Provide 'qty' or 'notional', not both.")
+        if not qty and not notional:
+            raise ValueError("Either 'qty' or 'notional' must be provided.")
+        if qty and notional:
+            raise ValueError("Provide 'qty' or 'notional', not both.")
 
-            order_data = {
-                "symbol": symbol,
-                "side": side,
-                "type": type,
-                "time_in_force": time_in_force,
-            }
-            if qty:
-                order_data["qty"] = qty
-            if notional:
-                order_data["notional"] = notional
-            if order_class:
-                order_data["order_class"] = order_class
-            if take_profit:
-                order_data["take_profit"] = take_profit
-            if stop_loss:
-                order_data["stop_loss"] = stop_loss
+        order_data = {
+            "symbol": symbol,
+            "side": side,
+            "type": type,
+            "time_in_force": time_in_force,
+        }
+        if qty:
+            order_data["qty"] = qty
+        if notional:
+            order_data["notional"] = notional
+        if order_class:
+            order_data["order_class"] = order_class
+        if take_profit:
+            order_data["take_profit"] = take_profit
+        if stop_loss:
+            order_data["stop_loss"] = stop_loss
+        return order_data
 
+    def submit_order(
+        self,
+        symbol,
+        side,
+        type,
+        time_in_force,
+        qty=None,
+        notional=None,
+        order_class=None,
+        take_profit=None,
+        stop_loss=None,
+    ):
+        try:
+            order_data = self._order_data(
+                symbol,
+                side,
+                type,
+                time_in_force,
+                qty,
+                notional,
+                order_class,
+                take_profit,
+                stop_loss,
+            )
+            self.rate_limiter.acquire_sync(Priority.ORDER)
             order = self.api.submit_order(**order_data)
             logging.info(f"Order submitted: {order}")
             return order
@@ -113,24 +312,61 @@ class AlpacaService:
             logging.error(f"Error submitting order: {e}")
             raise HTTPException(status_code=500, detail=f"Error submitting order: {e}")
 
+    async def submit_order_async(
+        self,
+        symbol,
+        side,
+        type,
+        time_in_force,
+        qty=None,
+        notional=None,
+        order_class=None,
+        take_profit=None,
+        stop_loss=None,
+    ):
+        try:
+            order_data = self._order_data(
+                symbol,
+                side,
+                type,
+                time_in_force,
+                qty,
+                notional,
+                order_class,
+                take_profit,
+                stop_loss,
+            )
+            order = await self.async_api.submit_order(**order_data)
+            logging.info(f"Order submitted: {order}")
+            return order
+        except Exception as e:
+            logging.error(f"Error submitting order: {e}")
+            raise HTTPException(status_code=500, detail=f"Error submitting order: {e}")
+
+    @staticmethod
+    def _positions_data(positions, orders):
+        positions_data = []
+        for p in positions:
+            position_dict = p._raw
+            related_orders = [o for o in orders if o.symbol == p.symbol]
+            if related_orders:
+                for o in related_orders:
+                    if hasattr(o, "take_profit") and o.take_profit:
+                        position_dict["take_profit_price"] = o.take_profit[
+                            "limit_price"
+                        ]
+                    if hasattr(o, "stop_loss") and o.stop_loss:
+                        position_dict["stop_loss_price"] = o.stop_loss["stop_price"]
+            positions_data.append(position_dict)
+        return positions_data
+
     def get_open_positions(self):
         try:
+            self.rate_limiter.acquire_sync(Priority.UI)
             positions = self.api.list_positions()
+            self.rate_limiter.acquire_sync(Priority.UI)
             orders = self.api.list_orders(status="open")
-            positions_data = []
-            for p in positions:
-                position_dict = p._raw
-                related_orders = [o for o in orders if o.symbol == p.symbol]
-                if related_orders:
-                    for o in related_orders:
-                        if hasattr(o, "take_profit") and o.take_profit:
-                            position_dict["take_profit_price"] = o.take_profit[
-                                "limit_price"
-                            ]
-                        if hasattr(o, "stop_loss") and o.stop_loss:
-                            position_dict["stop_loss_price"] = o.stop_loss["stop_price"]
-                positions_data.append(position_dict)
-            return positions_data
+            return self._positions_data(positions, orders)
         except tradeapi.rest.APIError as e:
             if e.status_code == 403:
                 logging.warning(
@@ -150,8 +386,38 @@ class AlpacaService:
                 detail=f"An unexpected error occurred while fetching open positions: {e}",
             )
 
+    async def get_open_positions_async(self):
+        try:
+            positions, orders = await asyncio.gather(
+                self.async_api.list_positions(),
+                self.async_api.list_orders(status="open"),
+            )
+            return self._positions_data(positions, orders)
+        except tradeapi.rest.APIError as e:
+            if e.status_code == 403:
+                logging.warning(
+                    "Alpaca API keys are invalid or missing. Please check your .env file."
+                )
+                return []
+            logging.error(f"Error fetching open positions: {e}")
+            raise HTTPException(
+                status_code=500, detail=f"Error fetching open positions: {e}"
+            )
+        except Exception as e:
+            logging.error(
+                f"An unexpected error occurred while fetching open positions: {e}"
+            )
+            raise HTTPException(
+                status_code=500,
+                detail=f"An unexpected error occurred while fetching open positions: {e}",
+            )
+
+    async def get_position_async(self, symbol):
+        return await self.async_api.get_position(symbol)
+
     def get_orders(self):
         try:
+            self.rate_limiter.acquire_sync(Priority.UI)
             orders = self.api.list_orders(
                 status="all", limit=100
             )  # Fetches last 100 orders
@@ -171,8 +437,30 @@ class AlpacaService:
                 detail=f"An unexpected error occurred while fetching orders: {e}",
             )
 
+    async def get_orders_async(self):
+        try:
+            orders = await self.async_api.list_orders(
+                status="all", limit=100
+            )  # Fetches last 100 orders
+            return [o._raw for o in orders]
+        except tradeapi.rest.APIError as e:
+            if e.status_code == 403:
+                logging.warning(
+                    "Alpaca API keys are invalid or missing. Please check your .env file."
+                )
+                return []
+            logging.error(f"Error fetching orders: {e}")
+            raise HTTPException(status_code=500, detail=f"Error fetching orders: {e}")
+        except Exception as e:
+            logging.error(f"An unexpected error occurred while fetching orders: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"An unexpected error occurred while fetching orders: {e}",
+            )
+
     def get_clock(self):
         try:
+            self.rate_limiter.acquire_sync(Priority.UI)
             return self.api.get_clock()
         except tradeapi.rest.APIError as e:
             if e.status_code == 403:
@@ -189,6 +477,73 @@ class AlpacaService:
                 detail=f"An unexpected error occurred while fetching clock: {e}",
             )
 
+    async def get_clock_async(self):
+        try:
+            return await self.async_api.get_clock()
+        except tradeapi.rest.APIError as e:
+            if e.status_code == 403:
+                logging.warning(
+                    "Alpaca API keys are invalid or missing. Please check your .env file."
+                )
+                return None
+            logging.error(f"Error fetching clock: {e}")
+            raise HTTPException(status_code=500, detail=f"Error fetching clock: {e}")
+        except Exception as e:
+            logging.error(f"An unexpected error occurred while fetching clock: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"An unexpected error occurred while fetching clock: {e}",
+            )
+
+    async def aclose(self):
+        if self._bar_close_task is not None:
+            self._bar_close_task.cancel()
+            self._bar_close_task = None
+        await self.async_api.aclose()
+        if self.trade_tape is not None:
+            self.trade_tape.close()
+
+    def set_trade_symbols(self, symbols):
+        """
+        Makes the trade stream follow ``symbols``.
+
+        Changes are applied in the background shortly after the call, so a
+        burst of strategy starts/stops turns into one subscribe and one
+        unsubscribe message.
+        """
+        self._wanted_symbols = set(symbols)
+        if self._trade_handler is None:
+            # start_stream subscribes to whatever is wanted by then
+            return
+        if self._subscription_task is None or self._subscription_task.done():
+            self._subscription_task = asyncio.create_task(self._apply_subscriptions())
+
+    async def _apply_subscriptions(self):
+        await asyncio.sleep(self.subscription_batch_delay)
+        try:
+            while self._wanted_symbols != self._subscribed_symbols:
+                wanted = set(self._wanted_symbols)
+                added = sorted(wanted - self._subscribed_symbols)
+                removed = sorted(self._subscribed_symbols - wanted)
+                # Stream blocks on its own event loop while running, so call it from a thread
+                if added:
+                    await asyncio.to_thread(
+                        self.stream.subscribe_trades, self._trade_handler, *added
+                    )
+                    self._subscribed_symbols.update(added)
+                if removed:
+                    await asyncio.to_thread(self.stream.unsubscribe_trades, *removed)
+                    self._subscribed_symbols.difference_update(removed)
+                    for symbol in removed:
+                        self.bar_buffers.discard(symbol)
+                        indicator_cache.discard(symbol)
+                logging.info(
+                    f"Trade subscriptions updated (+{len(added)}, -{len(removed)}): "
+                    f"{len(self._subscribed_symbols)} symbols."
+                )
+        except Exception as e:
+            logging.error(f"Error updating trade subscriptions: {e}")
+
     async def start_stream(self, strategy_manager):
         self.stream = Stream(
             key_id=settings.ALPACA_API_KEY,
@@ -199,11 +554,38 @@ class AlpacaService:
 
         async def trade_handler(trade):
             logging.info(f"Received trade: {trade}")
+            if self.trade_tape is not None:
+                self.trade_tape.record(trade)
+            self.bar_buffers.on_trade(trade)
             await strategy_manager.run_strategy_on_trade(trade)
 
-        self.stream.subscribe_trades(trade_handler, "*")
+        self._trade_handler = trade_handler
+        # Only symbols with active strategies; the set follows strategy starts/stops
+        symbols = sorted(strategy_manager.active_symbols())
+        if symbols:
+            self.stream.subscribe_trades(trade_handler, *symbols)
+        self._subscribed_symbols = set(symbols)
+        self._wanted_symbols = set(symbols)
         asyncio.create_task(self.stream._run_forever())
+        self._bar_close_task = asyncio.create_task(self._close_bars())
+
+    async def _close_bars(self):
+        """Finalizes bars whose window has ended, so quiet symbols' bars close on time."""
+        while True:
+            await asyncio.sleep(self.bar_close_interval)
+            try:
+                self.bar_buffers.aggregator.close_elapsed(
+                    time.time_ns() - int(self.bar_close_delay * 1e9)
+                )
+            except Exception as e:
+                logging.error(f"Error closing elapsed bars: {e}")
+
+
+_alpaca_service_instance = None
 
 
 def get_alpaca_service():
-    return alpaca_service
+    global _alpaca_service_instance
+    if _alpaca_service_instance is None:
+        _alpaca_service_instance = AlpacaService()
+    return _alpaca_service_instance
@@ -0,0 +1,235 @@
+import asyncio
+import logging
+import os
+import time
+import httpx
+from alpaca_trade_api.entity import Account, Clock, Order, Position
+from alpaca_trade_api.entity_v2 import BarsV2
+from alpaca_trade_api.rest import APIError
+from app.services.rate_limiter import Priority, RateLimiter
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DATA_URL = os.environ.get("APCA_API_DATA_URL", "https://data.alpaca.markets").rstrip(
+    "/"
+)
+DATA_PAGE_LIMIT = 10000
+RETRY_STATUS_CODES = (429, 504)
+
+
+class AsyncAlpacaClient:
+    """
+    Non-blocking Alpaca REST client for use from the event loop.
+
+    All requests share one keep-alive ``httpx.AsyncClient`` connection pool, and
+    at most ``max_concurrency`` of them are in flight at once. Responses are
+    wrapped in the same entity classes the synchronous ``tradeapi.REST`` client
+    returns, and HTTP errors are raised as ``APIError`` so existing error
+    handling keeps working.
+
+    Concurrent identical GET requests (same URL and parameters) are coalesced
+    into a single HTTP call whose response all callers share. Other methods,
+    order submission in particular, are never coalesced. When a
+    ``rate_limiter`` is given, every HTTP call first takes a token at its
+    request's priority, and the API's rate limit headers are fed back to it.
+    """
+
+    def __init__(
+        self,
+        key_id: str,
+        secret_key: str,
+        base_url: str,
+        max_connections: int = 20,
+        max_concurrency: int = 10,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        retry_wait: float = 1.0,
+        transport: httpx.AsyncBaseTransport = None,
+        rate_limiter: RateLimiter = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"APCA-API-KEY-ID": key_id, "APCA-API-SECRET-KEY": secret_key}
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_wait = retry_wait
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+        self._client = None
+        self._semaphore = None
+        self.single_flight = SingleFlight()
+
+    def _ensure_client(self):
+        # Created lazily so both objects bind to the running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params=None,
+        json=None,
+        priority=Priority.BACKGROUND,
+    ):
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+        if method == "GET":
+            key = (url, tuple(sorted((params or {}).items())))
+            return await self.single_flight.do(
+                key, lambda: self._send(method, url, params, json, priority)
+            )
+        return await self._send(method, url, params, json, priority)
+
+    def _update_rate_limit(self, response):
+        if self.rate_limiter is None:
+            return
+        if response.status_code == 429:
+            reset = response.headers.get("X-RateLimit-Reset")
+            retry_after = float(reset) - time.time() if reset else self.retry_wait
+            self.rate_limiter.penalize(max(retry_after, self.retry_wait))
+        elif "X-RateLimit-Remaining" in response.headers:
+            self.rate_limiter.observe(int(response.headers["X-RateLimit-Remaining"]))
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params=None,
+        json=None,
+        priority=Priority.BACKGROUND,
+    ):
+        client = self._ensure_client()
+        retries = self.max_retries
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(priority)
+            async with self._semaphore:
+                response = await client.request(method, url, params=params, json=json)
+            self._update_rate_limit(response)
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as http_error:
+                if response.status_code in RETRY_STATUS_CODES and retries > 0:
+                    logger.warning(
+                        f"{response.status_code} from {url}, retrying in {self.retry_wait}s "
+                        f"({retries} more time(s))..."
+                    )
+                    retries -= 1
+                    await asyncio.sleep(self.retry_wait)
+                    continue
+                try:
+                    error = response.json()
+                except ValueError:
+                    raise http_error from None
+                if "message" in error:
+                    raise APIError(error, http_error) from None
+                raise http_error from None
+            return response.json() if response.content else None
+
+    async def trading(
+        self,
+        method: str,
+        path: str,
+        params=None,
+        json=None,
+        priority=Priority.BACKGROUND,
+    ):
+        return await self.request(
+            method,
+            f"{self.base_url}/v2{path}",
+            params=params,
+            json=json,
+            priority=priority,
+        )
+
+    async def get_account(self, priority=Priority.UI) -> Account:
+        return Account(await self.trading("GET", "/account", priority=priority))
+
+    async def get_clock(self, priority=Priority.UI) -> Clock:
+        return Clock(await self.trading("GET", "/clock", priority=priority))
+
+    async def list_positions(self, priority=Priority.UI) -> list:
+        return [
+            Position(p)
+            for p in await self.trading("GET", "/positions", priority=priority)
+        ]
+
+    async def get_position(
+        self, symbol: str, priority=Priority.STRATEGY_DATA
+    ) -> Position:
+        return Position(
+            await self.trading("GET", f"/positions/{symbol}", priority=priority)
+        )
+
+    async def list_orders(self, status=None, limit=None, priority=Priority.UI) -> list:
+        orders = await self.trading(
+            "GET",
+            "/orders",
+            params={"status": status, "limit": limit},
+            priority=priority,
+        )
+        return [Order(o) for o in orders]
+
+    async def submit_order(self, **order_data) -> Order:
+        return Order(
+            await self.trading(
+                "POST", "/orders", json=order_data, priority=Priority.ORDER
+            )
+        )
+
+    async def get_bars(
+        self,
+        symbol,
+        timeframe,
+        start=None,
+        end=None,
+        limit=None,
+        adjustment="raw",
+        priority=Priority.STRATEGY_DATA,
+    ):
+        """Fetches bars for one symbol, following ``next_page_token`` until done."""
+        url = f"{DATA_URL}/v2/stocks/{symbol}/bars"
+        bars = []
+        page_token = None
+        while True:
+            page_limit = DATA_PAGE_LIMIT
+            if limit:
+                page_limit = min(int(limit) - len(bars), DATA_PAGE_LIMIT)
+                if page_limit < 1:
+                    break
+            response = await self.request(
+                "GET",
+                url,
+                params={
+                    "timeframe": str(timeframe),
+                    "start": start,
+                    "end": end,
+                    "limit": page_limit,
+                    "adjustment": adjustment,
+                    "page_token": page_token,
+                },
+                priority=priority,
+            )
+            bars.extend(response.get("bars") or [])
+            page_token = response.get("next_page_token")
+            if not page_token:
+                break
+        return BarsV2(bars)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
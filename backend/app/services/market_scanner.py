@@ -1,7 +1,9 @@
 import logging
 import pandas as pd
 from alpaca_trade_api.rest import REST
+from app.core.timeframes import lookback_start
 from app.services.alpaca import AlpacaService
+from app.services.rate_limiter import Priority
 
 
 class MarketScanner:
@@ -13,6 +15,7 @@ class MarketScanner:
     def get_tradable_assets(self):
         """Fetches a list of tradable, shortable, US equity assets."""
         try:
+            self.alpaca_service.rate_limiter.acquire_sync(Priority.BACKGROUND)
             assets = self.api.list_assets(status="active", asset_class="us_equity")
             tradable_assets = [a for a in assets if a.tradable and a.shortable]
             logging.info(f"Found {len(tradable_assets)} tradable US equity assets.")
@@ -31,57 +34,71 @@ class MarketScanner:
         :param atr_threshold: Minimum ATR as a percentage of the price.
         :return: A list of symbols that meet the criteria.
         """
-        promising_symbols = []
         total_symbols = len(symbols)
         logging.info(f"Scanning {total_symbols} symbols...")
 
-        for i, symbol in enumerate(symbols):
-            try:
-                # Fetch daily bars for the last 30 days
-                bars = self.alpaca_service.get_bars(symbol, "1Day", limit=30).df
-                if len(bars) < 30:
-                    continue
-
-                last_price = bars["close"].iloc[-1]
-                avg_volume = (bars["volume"] * bars["close"]).mean()
-
-                # --- Apply Filters ---
-                if last_price < min_price:
-                    continue
-                if avg_volume < min_avg_volume:
-                    continue
+        # Fetch daily bars for the last 30 sessions of every symbol in batched requests
+        bars_by_symbol = self.alpaca_service.get_multi_bars(
+            symbols, "1Day", start=lookback_start("1Day", 30).isoformat()
+        )
+        if not bars_by_symbol:
+            logging.info("Scan complete. Found 0 promising symbols.")
+            return []
 
-                # ATR for volatility
-                high_low = bars["high"] - bars["low"]
-                high_close = abs(bars["high"] - bars["close"].shift())
-                low_close = abs(bars["low"] - bars["close"].shift())
-                tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-                atr = tr.rolling(window=14).mean().iloc[-1]
-                atr_pct = atr / last_price
+        bars = pd.concat(
+            [b.tail(30).assign(symbol=s) for s, b in bars_by_symbol.items()]
+        )
+        grouped = bars.groupby("symbol", sort=False)
 
-                if atr_pct < atr_threshold:
-                    continue
+        # ATR for volatility
+        prev_close = grouped["close"].shift()
+        bars["tr"] = pd.concat(
+            [
+                bars["high"] - bars["low"],
+                (bars["high"] - prev_close).abs(),
+                (bars["low"] - prev_close).abs(),
+            ],
+            axis=1,
+        ).max(axis=1)
+        bars["dollar_volume"] = bars["volume"] * bars["close"]
 
+        grouped = bars.groupby("symbol", sort=False)
+        stats = pd.DataFrame(
+            {
+                "count": grouped.size(),
+                "price": grouped["close"].last(),
+                "avg_volume": grouped["dollar_volume"].mean(),
+                "atr": grouped.tail(14).groupby("symbol", sort=False)["tr"].mean(),
                 # Trend filter (e.g., price > 20-day SMA)
-                sma_20 = bars["close"].rolling(window=20).mean().iloc[-1]
-                if last_price < sma_20:
-                    continue
+                "sma_20": grouped.tail(20)
+                .groupby("symbol", sort=False)["close"]
+                .mean(),
+            }
+        )
+        stats["atr_pct"] = stats["atr"] / stats["price"]
 
-                logging.info(
-                    f"[{(i+1)}/{total_symbols}] {symbol} is a promising candidate. Price: ${last_price:.2f}, Volatility: {atr_pct:.2%}"
-                )
-                promising_symbols.append(
-                    {
-                        "symbol": symbol,
-                        "price": last_price,
-                        "avg_volume": avg_volume,
-                        "atr_pct": atr_pct,
-                    }
-                )
+        # --- Apply Filters ---
+        promising = stats[
+            (stats["count"] >= 30)
+            & (stats["price"] >= min_price)
+            & (stats["avg_volume"] >= min_avg_volume)
+            & (stats["atr_pct"] >= atr_threshold)
+            & (stats["price"] >= stats["sma_20"])
+        ]
 
-            except Exception as e:
-                logging.debug(f"Could not process symbol {symbol}: {e}")
-                continue
+        promising_symbols = []
+        for symbol, row in promising.iterrows():
+            logging.info(
+                f"{symbol} is a promising candidate. Price: ${row.price:.2f}, Volatility: {row.atr_pct:.2%}"
+            )
+            promising_symbols.append(
+                {
+                    "symbol": symbol,
+                    "price": row.price,
+                    "avg_volume": row.avg_volume,
+                    "atr_pct": row.atr_pct,
+                }
+            )
 
         logging.info(
             f"Scan complete. Found {len(promising_symbols)} promising symbols."
@@ -90,6 +107,5 @@ class MarketScanner:
 
     def run_scan(self):
         tradable_symbols = self.get_tradable_assets()
-        sample_symbols = tradable_symbols[:200]
-        results = self.scan(sample_symbols)
+        results = self.scan(tradable_symbols)
         return results
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import threading
+import time
+from enum import IntEnum
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request classes, most urgent first."""
+
+    ORDER = 0
+    STRATEGY_DATA = 1
+    UI = 2
+    BACKGROUND = 3
+
+
+# Share of the bucket each class must leave untouched, so lower priorities
+# back off while there is still headroom for orders and strategy data.
+DEFAULT_RESERVES = {
+    Priority.ORDER: 0.0,
+    Priority.STRATEGY_DATA: 0.1,
+    Priority.UI: 0.25,
+    Priority.BACKGROUND: 0.5,
+}
+
+
+class RateLimiter:
+    """
+    Token-bucket scheduler shared by every Alpaca API call.
+
+    Tokens refill continuously at ``rate_per_minute``. A request may only take
+    a token when no request of a higher priority is waiting and enough tokens
+    remain above its class reserve, so orders are served first and background
+    work (scans, training fetches) slows down well before the API starts
+    answering 429. ``observe`` and ``penalize`` feed the API's own rate limit
+    headers and 429 responses back into the bucket.
+
+    Safe to use from the event loop (``acquire``) and from worker threads
+    (``acquire_sync``) at the same time.
+    """
+
+    def __init__(
+        self, rate_per_minute: float = 200, burst: int = None, reserves: dict = None
+    ):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or rate_per_minute)
+        self.reserves = {
+            priority: self.capacity * share
+            for priority, share in (reserves or DEFAULT_RESERVES).items()
+        }
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self._waiting = {priority: 0 for priority in Priority}
+        self._granted = {priority: 0 for priority in Priority}
+        self._wait_time = {priority: 0.0 for priority in Priority}
+        self.throttled = 0
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def _try_take(self, priority: Priority) -> float:
+        """Takes a token if ``priority`` may have one; otherwise returns the seconds to wait."""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if any(self._waiting[p] for p in Priority if p < priority):
+            # Let higher priorities go first; check again after one refill step
+            return 1.0 / self.rate
+        floor = self.reserves.get(priority, 0.0)
+        if self._tokens - 1.0 >= floor:
+            self._tokens -= 1.0
+            self._granted[priority] += 1
+            return 0.0
+        return (floor + 1.0 - self._tokens) / self.rate
+
+    def _stop_waiting(self, priority: Priority, started: float, waited: bool):
+        with self._lock:
+            if waited:
+                self._waiting[priority] -= 1
+            self._wait_time[priority] += time.monotonic() - started
+
+    async def acquire(self, priority: Priority = Priority.BACKGROUND):
+        """Waits until a request of ``priority`` may be sent."""
+        started = time.monotonic()
+        waited = False
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_take(priority)
+                    if delay > 0 and not waited:
+                        self._waiting[priority] += 1
+                        waited = True
+                if delay <= 0:
+                    return
+                await asyncio.sleep(delay)
+        finally:
+            self._stop_waiting(priority, started, waited)
+
+    def acquire_sync(self, priority: Priority = Priority.BACKGROUND):
+        """Blocking counterpart of ``acquire`` for calls made from worker threads."""
+        started = time.monotonic()
+        waited = False
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_take(priority)
+                    if delay > 0 and not waited:
+                        self._waiting[priority] += 1
+                        waited = True
+                if delay <= 0:
+                    return
+                time.sleep(delay)
+        finally:
+            self._stop_waiting(priority, started, waited)
+
+    def observe(self, remaining: int):
+        """Aligns the bucket with the ``X-RateLimit-Remaining`` value reported by the API."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, float(remaining))
+
+    def penalize(self, retry_after: float):
+        """Empties the bucket and holds every request for ``retry_after`` seconds after a 429."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self.throttled += 1
+        logger.warning(f"Alpaca rate limit hit, pausing requests for {retry_after}s.")
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "tokens": round(self._tokens, 2),
+                "capacity": self.capacity,
+                "rate_per_minute": self.rate * 60,
+                "throttled": self.throttled,
+                "priorities": {
+                    priority.name.lower(): {
+                        "queue_depth": self._waiting[priority],
+                        "granted": self._granted[priority],
+                        "wait_seconds": round(self._wait_time[priority], 3),
+                    }
+                    for priority in Priority
+                },
+            }
@@ -0,0 +1,488 @@
+import asyncio
+import itertools
+import logging
+import pandas as pd
+from alpaca_trade_api.entity import Clock, Order, Position
+from alpaca_trade_api.rest import APIError
+from fastapi import HTTPException
+from app.core.bar_buffer import BUFFER_COLUMNS, BarBuffers
+from app.core.bar_store import CachedBars
+from app.core.timeframes import bar_window, trade_timestamp_ns
+from app.services.alpaca import AlpacaService
+
+
+def _timestamp(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts
+
+
+def _number(value: float) -> str:
+    """Formats a quantity or amount the way Alpaca's JSON does: as a string."""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+class ReplayTrade:
+    """A trade shaped like the stream's ``Trade`` entity, its timestamp kept as integer nanoseconds."""
+
+    __slots__ = ("symbol", "price", "size", "conditions", "_raw")
+
+    def __init__(
+        self, symbol: str, timestamp: int, price: float, size: float, conditions=()
+    ):
+        self.symbol = symbol
+        self.price = price
+        self.size = size
+        self.conditions = conditions
+        self._raw = {"timestamp": int(timestamp)}
+
+    @property
+    def timestamp(self) -> pd.Timestamp:
+        return pd.Timestamp(self._raw["timestamp"], tz="UTC")
+
+    def __repr__(self):
+        return f"ReplayTrade({self.symbol}, {self.timestamp.isoformat()}, {self.price}, {self.size})"
+
+
+class FillModel:
+    """
+    Decides when and at what price simulated orders fill.
+
+    Market orders fill at the last trade price, moved ``slippage_bps`` against
+    the order. Limit orders fill at the market when marketable on submission,
+    otherwise at their limit once a trade reaches it. Stop orders trigger when
+    a trade reaches their stop and then fill like a market order at that
+    trade's price.
+    """
+
+    def __init__(self, slippage_bps: float = 0.0):
+        self.slippage = slippage_bps / 10000
+
+    def market_price(self, side: str, price: float) -> float:
+        return (
+            price * (1 + self.slippage)
+            if side == "buy"
+            else price * (1 - self.slippage)
+        )
+
+    @staticmethod
+    def reached(order: dict, price: float) -> bool:
+        if order["type"] == "limit":
+            limit = float(order["limit_price"])
+            return price <= limit if order["side"] == "buy" else price >= limit
+        if order["type"] == "stop":
+            stop = float(order["stop_price"])
+            return price >= stop if order["side"] == "buy" else price <= stop
+        return True
+
+    def fill_price(self, order: dict, price: float, resting: bool = True) -> float:
+        """Price ``order`` fills at on a trade at ``price`` that ``reached`` it."""
+        if order["type"] == "limit":
+            limit = float(order["limit_price"])
+            if resting:
+                return limit
+            return min(price, limit) if order["side"] == "buy" else max(price, limit)
+        return self.market_price(order["side"], price)
+
+
+class SimulatedAlpacaService:
+    """
+    Local stand-in for ``AlpacaService``, driven by replayed or synthetic trades.
+
+    Bars are served from in-memory history; orders, positions and the account
+    are simulated. Orders fill against the trades of their symbol as the
+    ``fill_model`` decides, and the take-profit and stop-loss legs of a bracket
+    order become active once it fills, cancelling each other. The clock is the
+    timestamp of the last trade seen, so bar requests only return bars that had
+    closed by then. Responses have the same shapes as the live service's.
+
+    With a ``stream``, such as a ``SyntheticTradeStream``, ``start_stream``
+    drives the strategies from it the way the live service does from Alpaca's.
+    """
+
+    def __init__(
+        self,
+        bars: dict = None,
+        initial_capital: float = 100000,
+        fill_model: FillModel = None,
+        stream=None,
+    ):
+        """
+        :param bars: History served by ``get_bars``, as ``{symbol: {timeframe: DataFrame}}``.
+        :param stream: Source of trade batches for ``start_stream``, following ``subscribe``.
+        """
+        self.bars = bars or {}
+        self.initial_capital = initial_capital
+        self.fill_model = fill_model or FillModel()
+        self.stream = stream
+        self.cash = float(initial_capital)
+        self.bar_buffers = BarBuffers()
+        self.positions = {}  # symbol -> [qty, average entry price]
+        self.last_prices = {}
+        self.orders = []
+        self.fills = 0
+        self.now_ns = None
+        self.trade_symbols = set()
+        self._resting = {}  # symbol -> orders waiting for their limit or stop
+        self._open_legs = {}  # symbol -> list of one-cancels-other leg groups
+        self._order_ids = itertools.count(1)
+        self._trade_handler = None
+        self._stream_task = None
+
+    def on_trade(self, trade):
+        """Advances the clock to ``trade`` and fills the resting orders it reaches."""
+        price = float(trade.price)
+        self.now_ns = trade_timestamp_ns(trade)
+        self.last_prices[trade.symbol] = price
+        if self._open_legs.get(trade.symbol):
+            self._fill_legs(trade.symbol, price)
+        if self._resting.get(trade.symbol):
+            self._fill_resting(trade.symbol, price)
+
+    def set_trade_symbols(self, symbols):
+        self.trade_symbols = set(symbols)
+        if self.stream is not None:
+            self.stream.subscribe(self.trade_symbols)
+
+    async def start_stream(self, strategy_manager):
+        async def trade_handler(trade):
+            logging.info(f"Received trade: {trade}")
+            self.on_trade(trade)
+            self.bar_buffers.on_trade(trade)
+            await strategy_manager.run_strategy_on_trade(trade)
+
+        self._trade_handler = trade_handler
+        self.set_trade_symbols(strategy_manager.active_symbols())
+        self._stream_task = asyncio.create_task(self._run_stream())
+
+    async def _run_stream(self):
+        async for trades in self.stream.batches():
+            for trade in trades:
+                await self._trade_handler(trade)
+
+    async def aclose(self):
+        if self._stream_task is not None:
+            self._stream_task.cancel()
+            self._stream_task = None
+
+    # Market data
+
+    def _history(
+        self, symbol, timeframe, start=None, end=None, limit=None
+    ) -> pd.DataFrame:
+        bars = self.bars.get(symbol, {}).get(str(timeframe))
+        if bars is None:
+            return pd.DataFrame(
+                columns=BUFFER_COLUMNS,
+                index=pd.DatetimeIndex([], tz="UTC", name="timestamp"),
+            )
+        if self.now_ns is not None:
+            bars = bars[bars.index.asi8 < bar_window(self.now_ns, timeframe)[0]]
+        if start is not None:
+            start = _timestamp(start)
+            if self.now_ns is not None and start.value > self.now_ns:
+                # A lookback the live code computed from the wall clock; move it onto the replay clock
+                start -= pd.Timestamp.now(tz="UTC") - pd.Timestamp(
+                    self.now_ns, tz="UTC"
+                )
+            bars = bars[bars.index >= start]
+        if end is not None:
+            bars = bars[bars.index <= _timestamp(end)]
+        if limit:
+            bars = bars.head(int(limit))
+        return bars
+
+    def get_bars(
+        self, symbol, timeframe, start=None, end=None, limit=None, priority=None
+    ):
+        return CachedBars(self._history(symbol, timeframe, start, end, limit))
+
+    async def get_bars_async(
+        self, symbol, timeframe, start=None, end=None, limit=None, priority=None
+    ):
+        return self.get_bars(symbol, timeframe, start, end, limit)
+
+    # Orders
+
+    def _now_iso(self):
+        now = (
+            pd.Timestamp.now(tz="UTC")
+            if self.now_ns is None
+            else pd.Timestamp(self.now_ns, tz="UTC")
+        )
+        return now.isoformat()
+
+    def _new_order(
+        self, symbol, side, type, time_in_force, qty, order_class="", **prices
+    ) -> dict:
+        return {
+            "id": str(next(self._order_ids)),
+            "symbol": symbol,
+            "side": side,
+            "type": type,
+            "time_in_force": time_in_force,
+            "order_class": order_class,
+            "qty": _number(qty),
+            "filled_qty": "0",
+            "filled_avg_price": None,
+            "limit_price": (
+                _number(prices["limit_price"]) if "limit_price" in prices else None
+            ),
+            "stop_price": (
+                _number(prices["stop_price"]) if "stop_price" in prices else None
+            ),
+            "status": "new",
+            "submitted_at": self._now_iso(),
+            "filled_at": None,
+            "legs": None,
+        }
+
+    def _fill(self, order: dict, price: float):
+        """Fills ``order`` at ``price`` and activates its exit legs, if any."""
+        symbol = order["symbol"]
+        qty = float(order["qty"])
+        signed = qty if order["side"] == "buy" else -qty
+        held, entry = self.positions.get(symbol, (0.0, 0.0))
+        total = held + signed
+        if total == 0:
+            self.positions.pop(symbol, None)
+            # Nothing left for the exit legs to close
+            for legs in self._open_legs.pop(symbol, []):
+                for leg in legs:
+                    leg["status"] = "canceled"
+        elif held == 0 or (held > 0) != (total > 0):
+            self.positions[symbol] = (total, price)
+        elif abs(total) > abs(held):
+            self.positions[symbol] = (total, (held * entry + signed * price) / total)
+        else:
+            self.positions[symbol] = (total, entry)
+        self.cash -= signed * price
+        order.update(
+            status="filled",
+            filled_qty=order["qty"],
+            filled_avg_price=_number(price),
+            filled_at=self._now_iso(),
+        )
+        self.fills += 1
+        if order["legs"] and symbol in self.positions:
+            self._open_legs.setdefault(symbol, []).append(order["legs"])
+
+    def _fill_legs(self, symbol: str, price: float):
+        waiting = []
+        for legs in self._open_legs[symbol]:
+            if legs[0]["status"] == "canceled":
+                # Closed out by an earlier group's fill on this trade
+                continue
+            leg = next(
+                (leg for leg in legs if self.fill_model.reached(leg, price)), None
+            )
+            if leg is None:
+                waiting.append(legs)
+                continue
+            for sibling in legs:
+                if sibling is not leg:
+                    sibling["status"] = "canceled"
+            self._fill(leg, self.fill_model.fill_price(leg, price))
+        if symbol in self._open_legs:
+            self._open_legs[symbol] = waiting
+
+    def _fill_resting(self, symbol: str, price: float):
+        waiting = []
+        for order in self._resting[symbol]:
+            if self.fill_model.reached(order, price):
+                self._fill(order, self.fill_model.fill_price(order, price))
+            else:
+                waiting.append(order)
+        self._resting[symbol] = waiting
+
+    def _submit(self, order_data: dict, limit_price=None, stop_price=None) -> dict:
+        symbol, side, type = (
+            order_data["symbol"],
+            order_data["side"],
+            order_data["type"],
+        )
+        prices = {"limit_price": limit_price, "stop_price": stop_price}
+        required = {"market": None, "limit": "limit_price", "stop": "stop_price"}
+        if type not in required:
+            raise ValueError(f"Unsupported order type '{type}'.")
+        if required[type] and prices[required[type]] is None:
+            raise ValueError(f"{type.capitalize()} orders need a {required[type]}.")
+        price = self.last_prices.get(symbol)
+        if price is None:
+            raise ValueError(f"No trade for {symbol} has been replayed yet.")
+        reference = float(limit_price) if type == "limit" else price
+        qty = float(order_data.get("qty") or float(order_data["notional"]) / reference)
+        held = self.positions.get(symbol, (0.0, 0.0))[0]
+        if side == "buy" and qty * reference > self.cash:
+            raise APIError({"code": 40310000, "message": "insufficient buying power"})
+        if side == "sell" and qty > held:
+            raise APIError(
+                {"code": 40310000, "message": "insufficient qty available for order"}
+            )
+
+        order_class = order_data.get("order_class", "")
+        tif = order_data["time_in_force"]
+        order = self._new_order(
+            symbol,
+            side,
+            type,
+            tif,
+            qty,
+            order_class,
+            **{
+                name: float(value)
+                for name, value in prices.items()
+                if value is not None
+            },
+        )
+        exit_side = "sell" if side == "buy" else "buy"
+        legs = []
+        if order_data.get("take_profit"):
+            legs.append(
+                self._new_order(
+                    symbol,
+                    exit_side,
+                    "limit",
+                    tif,
+                    qty,
+                    order_class,
+                    limit_price=float(order_data["take_profit"]["limit_price"]),
+                )
+            )
+        if order_data.get("stop_loss"):
+            legs.append(
+                self._new_order(
+                    symbol,
+                    exit_side,
+                    "stop",
+                    tif,
+                    qty,
+                    order_class,
+                    stop_price=float(order_data["stop_loss"]["stop_price"]),
+                )
+            )
+        order["legs"] = legs or None
+        self.orders.append(order)
+        if self.fill_model.reached(order, price):
+            self._fill(order, self.fill_model.fill_price(order, price, resting=False))
+        else:
+            self._resting.setdefault(symbol, []).append(order)
+        return order
+
+    def submit_order(
+        self,
+        symbol,
+        side,
+        type,
+        time_in_force,
+        qty=None,
+        notional=None,
+        order_class=None,
+        take_profit=None,
+        stop_loss=None,
+        limit_price=None,
+        stop_price=None,
+    ):
+        """
+        Same as ``AlpacaService.submit_order``, plus ``limit_price`` and
+        ``stop_price`` for simulating limit and stop entry orders.
+        """
+        try:
+            order_data = AlpacaService._order_data(
+                symbol,
+                side,
+                type,
+                time_in_force,
+                qty,
+                notional,
+                order_class,
+                take_profit,
+                stop_loss,
+            )
+            order = Order(self._submit(order_data, limit_price, stop_price))
+            logging.info(f"Order submitted: {order}")
+            return order
+        except Exception as e:
+            logging.error(f"Error submitting order: {e}")
+            raise HTTPException(status_code=500, detail=f"Error submitting order: {e}")
+
+    async def submit_order_async(self, *args, **kwargs):
+        return self.submit_order(*args, **kwargs)
+
+    def get_orders(self):
+        # Newest first, like the live listing
+        return self.orders[:-101:-1]
+
+    async def get_orders_async(self):
+        return self.get_orders()
+
+    # Positions and account
+
+    def _position_data(self, symbol: str) -> dict:
+        qty, entry = self.positions[symbol]
+        price = self.last_prices.get(symbol, entry)
+        position = {
+            "symbol": symbol,
+            "qty": _number(qty),
+            "side": "long" if qty > 0 else "short",
+            "avg_entry_price": _number(entry),
+            "current_price": _number(price),
+            "cost_basis": _number(qty * entry),
+            "market_value": _number(qty * price),
+            "unrealized_pl": _number(qty * (price - entry)),
+        }
+        for leg in itertools.chain.from_iterable(self._open_legs.get(symbol, [])):
+            if leg["type"] == "limit":
+                position["take_profit_price"] = leg["limit_price"]
+            else:
+                position["stop_loss_price"] = leg["stop_price"]
+        return position
+
+    async def get_position_async(self, symbol):
+        if symbol not in self.positions:
+            raise APIError({"code": 40410000, "message": "position does not exist"})
+        return Position(self._position_data(symbol))
+
+    def get_open_positions(self):
+        return [self._position_data(symbol) for symbol in self.positions]
+
+    async def get_open_positions_async(self):
+        return self.get_open_positions()
+
+    def equity(self) -> float:
+        return self.cash + sum(
+            qty * self.last_prices.get(symbol, entry)
+            for symbol, (qty, entry) in self.positions.items()
+        )
+
+    async def get_account_info(self):
+        equity = self.equity()
+        return {
+            "id": "simulated",
+            "status": "ACTIVE",
+            "currency": "USD",
+            "cash": _number(round(self.cash, 2)),
+            "buying_power": _number(round(self.cash, 2)),
+            "long_market_value": _number(round(equity - self.cash, 2)),
+            "equity": _number(round(equity, 2)),
+            "portfolio_value": _number(round(equity, 2)),
+            "last_equity": _number(self.initial_capital),
+        }
+
+    def get_clock(self):
+        return Clock({"timestamp": self._now_iso(), "is_open": True})
+
+    async def get_clock_async(self):
+        return self.get_clock()
+
+    def summary(self) -> dict:
+        equity = self.equity()
+        return {
+            "initial_capital": self.initial_capital,
+            "cash": round(self.cash, 2),
+            "equity": round(equity, 2),
+            "return_pct": round((equity / self.initial_capital - 1) * 100, 2),
+            "open_positions": len(self.positions),
+            "orders": len(self.orders),
+            "fills": self.fills,
+        }
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one in-flight call.
+
+    The first caller for a key starts the call; everyone who asks for the same
+    key while it is still running awaits the same result (or exception).
+    Nothing is cached once the call finishes, so later callers always get a
+    fresh result.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._in_flight)
+
+    async def do(self, key, fn):
+        """
+        Runs ``fn()`` for ``key`` unless a call for ``key`` is already running.
+
+        :param key: Hashable identifying the request (endpoint plus parameters).
+        :param fn: Zero-argument coroutine function making the actual call.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Shield so one caller being cancelled doesn't cancel the call for the rest
+            return await asyncio.shield(future)
+
+        self.calls += 1
+        future = asyncio.ensure_future(fn())
+        self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return await asyncio.shield(future)
+
+    def _forget(self, key, future):
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled() and future.exception() is not None:
+            # Mark the exception as retrieved when no caller was left to await it
+            logger.debug(f"Coalesced request {key} failed: {future.exception()}")
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
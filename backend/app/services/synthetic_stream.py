@@ -0,0 +1,105 @@
+import asyncio
+import time
+import numpy as np
+from app.services.simulated_alpaca import ReplayTrade
+
+
+class SyntheticTradeStream:
+    """
+    Random-walk trades for the subscribed symbols, in place of Alpaca's trade stream.
+
+    Trades come in batches every ``interval`` seconds, stamped with the wall
+    clock and spread evenly across the interval. The rate is kept against the
+    wall clock: when the consumer falls behind, the next batch holds every
+    trade that has come due since (up to ``max_batch``), as a real stream's
+    backlog would.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10000,
+        symbols=(),
+        interval: float = 0.01,
+        start_price: float = 100.0,
+        volatility: float = 0.0005,
+        max_batch: int = 10000,
+        seed: int = None,
+    ):
+        """
+        :param rate: Trades per second across all subscribed symbols, or None
+                     for as many as the consumer takes.
+        :param volatility: Standard deviation of each trade's log return.
+        """
+        self.rate = rate
+        self.interval = interval
+        self.start_price = start_price
+        self.volatility = volatility
+        self.max_batch = max_batch
+        self.produced = 0
+        self._rng = np.random.default_rng(seed)
+        self._log_prices = {}
+        self.symbols = []
+        self.subscribe(symbols)
+
+    def subscribe(self, symbols):
+        """Replaces the symbols trades are generated for."""
+        self.symbols = sorted(symbols)
+        for symbol in self.symbols:
+            self._log_prices.setdefault(symbol, np.log(self.start_price))
+
+    def batch(self, n: int, start_ns: int, end_ns: int) -> list:
+        """Generates ``n`` trades timestamped between ``start_ns`` and ``end_ns``."""
+        if not self.symbols or n <= 0:
+            return []
+        ids = self._rng.integers(len(self.symbols), size=n)
+        steps = self._rng.standard_normal(n) * self.volatility
+
+        # Each symbol's walk continues from its last price, in trade order
+        order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[order]
+        walk = np.cumsum(steps[order])
+        group_starts = np.searchsorted(sorted_ids, sorted_ids, side="left")
+        walk -= np.concatenate([[0.0], walk])[group_starts]
+        last = np.array([self._log_prices[symbol] for symbol in self.symbols])
+        log_prices = np.empty(n)
+        log_prices[order] = last[sorted_ids] + walk
+        last_trade = np.full(len(self.symbols), -1)
+        np.maximum.at(last_trade, ids, np.arange(n))
+        for i in np.flatnonzero(last_trade >= 0).tolist():
+            self._log_prices[self.symbols[i]] = log_prices[last_trade[i]]
+
+        prices = np.round(np.exp(log_prices), 2)
+        sizes = self._rng.integers(1, 500, size=n)
+        timestamps = start_ns + (np.arange(n) * (end_ns - start_ns)) // n
+        symbols = self.symbols
+        self.produced += n
+        return [
+            ReplayTrade(symbols[i], timestamp, price, size)
+            for i, timestamp, price, size in zip(
+                ids.tolist(), timestamps.tolist(), prices.tolist(), sizes.tolist()
+            )
+        ]
+
+    async def batches(self):
+        """Yields lists of trades at ``rate`` trades per second, forever."""
+        started = time.monotonic()
+        due_from = 0
+        last_ns = time.time_ns()
+        while True:
+            now_ns = time.time_ns()
+            if self.rate is None:
+                n = self.max_batch
+            elif not self.symbols:
+                # Nothing subscribed: no backlog builds up
+                started, due_from = time.monotonic(), 0
+                n = 0
+            else:
+                n = min(
+                    int((time.monotonic() - started) * self.rate) - due_from,
+                    self.max_batch,
+                )
+            if n > 0:
+                due_from += n
+                yield self.batch(n, last_ns, now_ns)
+                last_ns = now_ns
+            await asyncio.sleep(0 if self.rate is None else self.interval)
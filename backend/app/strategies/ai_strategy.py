@@ -7,18 +7,34 @@ import joblib
 import xgboost as xgb
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
+from app.core.executors import executors
+from app.indicators.volatility import ATR
+from app.ml.features import (
+    FEATURE_WARMUP,
+    feature_cache,
+    feature_feed,
+    latest_features,
+    prepare_features,
+)
+from app.ml.inference import predict_features
+from app.ml.labeling import barrier_labels
 from app.strategies.base import BaseStrategy
+from app.services.rate_limiter import Priority
 import traceback
 
 # Get the absolute path to the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+PROJECT_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "..")
+)
 MODEL_PATH = os.path.join(PROJECT_ROOT, "trained_models", "ai_strategy_model.joblib")
 
 
 class AIStrategy(BaseStrategy):
     name: str = "ai_strategy"
     display_name: str = "AI Strategy"
-    description: str = "A strategy that uses a trained AI model to generate trading signals."
+    description: str = (
+        "A strategy that uses a trained AI model to generate trading signals."
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -45,96 +61,44 @@ class AIStrategy(BaseStrategy):
         if len(bars) < period:
             return pd.Series(index=bars.index, dtype=float)
 
-        high_low = bars["high"] - bars["low"]
-        high_close = np.abs(bars["high"] - bars["close"].shift())
-        low_close = np.abs(bars["low"] - bars["close"].shift())
+        high = bars["high"].to_numpy(dtype="float64")
+        low = bars["low"].to_numpy(dtype="float64")
+        prev_close = bars["close"].shift().to_numpy(dtype="float64")
 
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
+        # fmax skips NaNs like DataFrame.max, e.g. the first bar's missing previous close
+        tr = np.fmax(
+            np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close)
+        )
+        atr = pd.Series(tr, index=bars.index).rolling(window=period).mean()
         return atr
 
     def _prepare_features(self, bars: pd.DataFrame) -> pd.DataFrame:
         """Creates a rich set of features for the model using pandas-ta."""
-        try:
-            import pandas_ta as ta
-
-            features = pd.DataFrame(index=bars.index)
-            
-            # Momentum
-            features['rsi'] = ta.rsi(bars.close)
-            features['macd'] = ta.macd(bars.close).iloc[:, 0]
-            features['macds'] = ta.macd(bars.close).iloc[:, 1]
-            features['macdh'] = ta.macd(bars.close).iloc[:, 2]
-            features['stoch_k'] = ta.stoch(bars.high, bars.low, bars.close).iloc[:, 0]
-            features['stoch_d'] = ta.stoch(bars.high, bars.low, bars.close).iloc[:, 1]
-            
-            # Volatility
-            features['bb_upper'] = ta.bbands(bars.close).iloc[:, 0]
-            features['bb_mid'] = ta.bbands(bars.close).iloc[:, 1]
-            features['bb_lower'] = ta.bbands(bars.close).iloc[:, 2]
-            features['atr'] = ta.atr(bars.high, bars.low, bars.close)
-            
-            # Trend
-            features['sma20'] = ta.sma(bars.close, length=20)
-            features['sma50'] = ta.sma(bars.close, length=50)
-            features['ema20'] = ta.ema(bars.close, length=20)
-            features['ema50'] = ta.ema(bars.close, length=50)
-            
-            features.dropna(inplace=True)
-            return features
-        except ImportError:
-            logging.error(
-                "pandas-ta is not installed. Cannot create advanced features."
-            )
-            # Fallback to simple features
-            features = pd.DataFrame(index=bars.index)
-            features["sma_5"] = bars["close"].rolling(window=5).mean()
-            features["sma_10"] = bars["close"].rolling(window=10).mean()
-            features["sma_20"] = bars["close"].rolling(window=20).mean()
-            features["sma_50"] = bars["close"].rolling(window=50).mean()
-            features.dropna(inplace=True)
-            return features
-        except Exception as e:
-            logging.error(f"Error creating features with pandas-ta: {e}")
-            return pd.DataFrame()  # Return empty dataframe on error
+        return prepare_features(bars)
 
     def _prepare_labels(
         self, bars: pd.DataFrame, look_forward=5, risk_reward_ratio=2.0
     ) -> pd.Series:
         """
         Creates labels for training based on a risk/reward outcome.
-        - 1 (Buy): If the price hits the take profit target before the stop loss target.
-        - 0 (Sell/Hold): If the price hits the stop loss target first or does nothing.
+        - 1 (Buy): If the price reaches the take profit target (``risk_reward_ratio`` ATRs)
+          within ``look_forward`` bars without reaching the stop loss (one ATR).
+        - 0 (Sell/Hold): If the price hits the stop loss target or does nothing.
         """
         atr = self._calculate_atr(bars)
-        labels = pd.Series(0, index=bars.index)
-
-        for i in range(len(bars) - look_forward):
-            entry_price = bars["close"].iloc[i]
-            atr_value = atr.iloc[i]
-
-            if pd.isna(atr_value) or atr_value == 0:
-                continue
-
-            stop_loss_price = entry_price - atr_value
-            take_profit_price = entry_price + (atr_value * risk_reward_ratio)
-
-            future_prices = bars["close"].iloc[i + 1 : i + 1 + look_forward]
-
-            hit_tp = (future_prices >= take_profit_price).any()
-            hit_sl = (future_prices <= stop_loss_price).any()
-
-            if hit_tp and not hit_sl:
-                labels.iloc[i] = 1  # Buy signal
-            # The default is 0, so we don't need an explicit else for sell/hold
-
-        return labels
+        return barrier_labels(
+            bars["close"],
+            atr,
+            take_profit=risk_reward_ratio,
+            stop_loss=1.0,
+            time_limit=look_forward,
+        )
 
     def train(self, symbol, timeframe="1Day", start_date=None, end_date=None):
         logging.info(f"Starting Advanced AI model training for {symbol}...")
         try:
             import pandas_ta as ta
-            
+
             logging.info("Fetching bars...")
             bars = self.alpaca_service.get_bars(
                 symbol, timeframe, start=start_date, end=end_date
@@ -145,7 +109,8 @@ class AIStrategy(BaseStrategy):
                 return {"error": "Not enough data."}
 
             logging.info("Preparing features...")
-            features = self._prepare_features(bars)
+            # Retraining on the same bars reuses the features computed last time
+            features = feature_cache.get(symbol, timeframe, bars)
             logging.info("Preparing labels...")
             labels = self._prepare_labels(bars)
 
@@ -214,28 +179,31 @@ class AIStrategy(BaseStrategy):
             logging.warning("AI model is not trained. Cannot run live strategy.")
             return
 
-        # Fetch latest data to make a prediction
-        bars_data = self.alpaca_service.get_bars(
-            symbol, timeframe, limit=100
-        )  # Need enough for feature calculation
-        if not bars_data or bars_data.df.empty:
+        # The feature indicators keep their state between runs: only new bars are computed
+        feed = await self.get_indicators(
+            symbol,
+            timeframe,
+            FEATURE_WARMUP,
+            lambda: feature_feed(risk_atr=ATR(mamode="sma", include_first_range=True)),
+        )
+        if not feed.bars:
             logging.warning(f"Could not fetch bars for {symbol} for AI prediction.")
             return
 
-        bars = bars_data.df
-        features = self._prepare_features(bars)
-
-        if features.empty:
+        features = latest_features(feed)
+        if features is None:
             logging.warning("Could not generate features for live prediction.")
             return
 
-        # Predict the next move
-        prediction = self.model.predict(features.tail(1))[0]
+        # Inference runs in a worker process, off the event loop
+        prediction = await executors.run_cpu(predict_features, features, MODEL_PATH)
+
         current_position_qty = await self.get_position(symbol)
 
         if prediction == 1 and current_position_qty == 0:  # Buy signal
-            last_price = bars["close"].iloc[-1]
-            atr = self.risk_manager.calculate_atr(bars).iloc[-1]
+            last_price = feed.close
+            # As RiskManager.calculate_atr on the buffered bars
+            atr = feed.current["risk_atr"]
             stop_loss_price = self.risk_manager.calculate_stop_loss(last_price, atr)
             qty_to_buy = self.risk_manager.calculate_position_size(
                 last_price, stop_loss_price
@@ -246,7 +214,7 @@ class AIStrategy(BaseStrategy):
                 message = f"AI TRADE SIGNAL: Buy {symbol} at {last_price:.2f}"
                 logging.info(message)
                 await self.telegram_service.send_message(message)
-                self.alpaca_service.submit_order(
+                await self.alpaca_service.submit_order_async(
                     symbol=symbol,
                     qty=qty_to_buy,
                     side="buy",
@@ -258,6 +226,7 @@ class AIStrategy(BaseStrategy):
                 )
         elif prediction == 0 and current_position_qty > 0:
             logging.info(f"AI TRADE SIGNAL: Sell {symbol}. Closing position.")
-            self.alpaca_service.api.close_position(symbol)
+            await self.alpaca_service.rate_limiter.acquire(Priority.ORDER)
+            await asyncio.to_thread(self.alpaca_service.api.close_position, symbol)
         else:
             logging.info(f"AI Strategy: No signal or position aligned for {symbol}.")
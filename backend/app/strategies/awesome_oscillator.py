@@ -3,6 +3,8 @@ import pandas as pd
 import pandas_ta as ta
 from sqlalchemy.orm import Session
 from app.strategies.base import BaseStrategy
+from app.indicators.feed import IndicatorFeed
+from app.indicators.momentum import AwesomeOscillator
 from app.services.telegram import TelegramService
 from app.services.google_sheets import GoogleSheetsService
 from app.crud import create_trade
@@ -13,7 +15,9 @@ from sqlalchemy.orm import Session
 class AwesomeOscillatorStrategy(BaseStrategy):
     name: str = "awesome_oscillator"
     display_name: str = "Awesome Oscillator"
-    description: str = "An indicator used to measure market momentum. It is calculated as the difference between a 34-period and a 5-period simple moving average."
+    description: str = (
+        "An indicator used to measure market momentum. It is calculated as the difference between a 34-period and a 5-period simple moving average."
+    )
 
     def __init__(
         self,
@@ -34,7 +38,7 @@ class AwesomeOscillatorStrategy(BaseStrategy):
 
     async def get_position(self, symbol: str) -> float:
         try:
-            position = await self.alpaca_service.api.get_position(symbol)
+            position = await self.alpaca_service.get_position_async(symbol)
             return float(position.qty)
         except Exception as e:
             logging.warning(f"Could not get position for {symbol}: {e}")
@@ -45,22 +49,25 @@ class AwesomeOscillatorStrategy(BaseStrategy):
 
     async def run_on_trade(self, trade):
         symbol = trade.symbol
-        timeframe = "1Day"  # Assuming a default timeframe
+        timeframe = self.timeframe
         logging.info(f"Running Awesome Oscillator strategy for {symbol}")
 
-        bars = self.alpaca_service.get_bars(symbol, timeframe, limit=self.slow + 5).df
+        feed = await self.get_indicators(
+            symbol,
+            timeframe,
+            self.slow + 5,
+            lambda: IndicatorFeed(ao=AwesomeOscillator(fast=self.fast, slow=self.slow)),
+        )
         logging.info(
-            f"Fetched {len(bars)} bars for {symbol} with timeframe {timeframe}."
+            f"Updated indicators over {feed.bars} bars for {symbol} with timeframe {timeframe}."
         )
 
-        if len(bars) < self.slow:
+        if feed.bars < self.slow:
             logging.warning(f"Not enough data for {symbol} to run strategy.")
             return
 
-        bars.ta.ao(fast=self.fast, slow=self.slow, append=True)
-
-        latest_ao = bars[f"AO_{self.fast}_{self.slow}"].iloc[-1]
-        previous_ao = bars[f"AO_{self.fast}_{self.slow}"].iloc[-2]
+        latest_ao = feed.current["ao"]
+        previous_ao = feed.previous["ao"]
         logging.info(f"Latest Awesome Oscillator for {symbol}: {latest_ao:.2f}")
 
         current_position = await self.get_position(symbol)
@@ -73,11 +80,11 @@ class AwesomeOscillatorStrategy(BaseStrategy):
 
             account_info = await self.alpaca_service.get_account_info()
             buying_power = float(account_info.buying_power)
-            last_price = bars["close"].iloc[-1]
+            last_price = feed.close
             qty = int((buying_power * self.trade_percentage) / last_price)
 
             if qty > 0:
-                order = self.alpaca_service.submit_order(
+                order = await self.alpaca_service.submit_order_async(
                     symbol=symbol,
                     qty=qty,
                     side="buy",
@@ -96,7 +103,7 @@ class AwesomeOscillatorStrategy(BaseStrategy):
             logging.info(message)
             await self.telegram_service.send_message(message)
             await manager.broadcast_json({"type": "log", "message": message})
-            order = self.alpaca_service.submit_order(
+            order = await self.alpaca_service.submit_order_async(
                 symbol, current_position, "sell", "market", "gtc"
             )
             create_trade(db, symbol, order.qty, order.filled_avg_price, order.side)
@@ -118,11 +125,11 @@ class AwesomeOscillatorStrategy(BaseStrategy):
 
         # Generate buy/sell signals
         bars["signal"] = 0
-        bars.loc[
-            (bars[ao_col] > 0) & (bars[ao_col].shift(1) < 0), "signal"
-        ] = 1  # Buy signal
-        bars.loc[
-            (bars[ao_col] < 0) & (bars[ao_col].shift(1) > 0), "signal"
-        ] = -1  # Sell signal
+        bars.loc[(bars[ao_col] > 0) & (bars[ao_col].shift(1) < 0), "signal"] = (
+            1  # Buy signal
+        )
+        bars.loc[(bars[ao_col] < 0) & (bars[ao_col].shift(1) > 0), "signal"] = (
+            -1
+        )  # Sell signal
 
         return bars
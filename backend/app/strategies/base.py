@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
 from app.services.alpaca import AlpacaService
+from app.core.evaluation import EvaluationGate
+from app.indicators.cache import indicator_cache
+from app.indicators.feed import IndicatorFeed
+from config import settings
 import logging
 from ..core.risk_manager import RiskManager
 
@@ -18,6 +22,10 @@ class BaseStrategy(ABC):
         connection_manager,
         message_queue,
         symbol: str = None,
+        timeframe: str = "1Day",
+        evaluation: str = None,
+        max_evaluations_per_second: float = None,
+        evaluation_timeout: float = None,
         **kwargs,
     ):
         self.alpaca_service = alpaca_service
@@ -27,8 +35,54 @@ class BaseStrategy(ABC):
         self.connection_manager = connection_manager
         self.message_queue = message_queue
         self.symbol = symbol
+        self.timeframe = timeframe
+        # When run_on_trade is called: every trade, throttled, or once per closed bar
+        self.evaluation = EvaluationGate(
+            lambda trade: self.run_on_trade(trade),
+            policy=evaluation or settings.STRATEGY_EVALUATION_POLICY,
+            max_per_second=max_evaluations_per_second
+            or settings.STRATEGY_MAX_EVALUATIONS_PER_SECOND,
+            timeout=evaluation_timeout or settings.STRATEGY_EVALUATION_TIMEOUT,
+        )
+        self._indicator_feeds = {}
         logging.info(f"{self.name} strategy initialized for symbol {self.symbol}.")
 
+    async def get_recent_bars(self, symbol, timeframe, limit):
+        """
+        Returns the latest ``limit`` bars from the stream-fed bar buffer.
+
+        The buffer is seeded through ``AlpacaService.get_bars_async`` the first time a
+        symbol/timeframe is requested and kept current by the trade stream after that.
+        """
+        return await self.alpaca_service.bar_buffers.get_frame(
+            symbol, timeframe, limit, self.alpaca_service.get_bars_async
+        )
+
+    async def get_indicators(self, symbol, timeframe, warmup, build) -> IndicatorFeed:
+        """
+        Returns the strategy's indicators for ``symbol``, caught up with the bar buffer.
+
+        Values come from the shared ``indicator_cache``: each indicator is computed
+        once per bar for the symbol, however many strategies use it.
+
+        :param warmup: Minimum number of bars to seed the buffer with.
+        :param build: Zero-argument callable returning a new ``IndicatorFeed``.
+        """
+        key = (symbol, str(timeframe))
+        feed = self._indicator_feeds.get(key)
+        if feed is None:
+            feed = self._indicator_feeds[key] = build()
+        buffers = self.alpaca_service.bar_buffers
+        buffer = await buffers.ensure(
+            symbol, timeframe, warmup, self.alpaca_service.get_bars_async
+        )
+        return feed.sync(
+            buffer,
+            buffers.aggregator.partial_bar(symbol, timeframe),
+            indicator_cache,
+            symbol,
+        )
+
     @abstractmethod
     async def run(self, symbol, timeframe, db_session):
         raise NotImplementedError("Each strategy must implement its own run method.")
@@ -1,13 +1,17 @@
 import logging
 from sqlalchemy.orm import Session
 from app.strategies.base import BaseStrategy
+from app.indicators.feed import IndicatorFeed
+from app.indicators.volatility import BollingerBands
 import pandas_ta as ta
 
 
 class BollingerBandsStrategy(BaseStrategy):
     name: str = "bollinger_bands"
     display_name: str = "Bollinger Bands"
-    description: str = "A volatility indicator that consists of a middle band (a simple moving average) and two outer bands that are typically two standard deviations away from the middle band."
+    description: str = (
+        "A volatility indicator that consists of a middle band (a simple moving average) and two outer bands that are typically two standard deviations away from the middle band."
+    )
 
     def __init__(self, *args, length=20, std_dev=2, **kwargs):
         super().__init__(*args, **kwargs)
@@ -19,18 +23,23 @@ class BollingerBandsStrategy(BaseStrategy):
 
     async def run_on_trade(self, trade):
         symbol = trade.symbol
-        timeframe = "1Day"
+        timeframe = self.timeframe
         logging.info(f"Running Bollinger Bands strategy for {symbol}")
 
-        bars = self.alpaca_service.get_bars(symbol, timeframe, limit=self.length + 5).df
-        if bars.empty:
+        feed = await self.get_indicators(
+            symbol,
+            timeframe,
+            self.length + 5,
+            lambda: IndicatorFeed(
+                bands=BollingerBands(length=self.length, std=self.std_dev)
+            ),
+        )
+        if not feed.bars:
             return
 
-        bars.ta.bbands(length=self.length, std=self.std_dev, append=True)
-
-        latest_close = bars["close"].iloc[-1]
-        lower_band = bars[f"BBL_{self.length}_{self.std_dev:.1f}"].iloc[-1]
-        upper_band = bars[f"BBU_{self.length}_{self.std_dev:.1f}"].iloc[-1]
+        latest_close = feed.close
+        lower_band = feed.current["bands"].lower
+        upper_band = feed.current["bands"].upper
 
         if latest_close < lower_band:
             logging.info(f"Buy signal for {symbol} (Bollinger Bands)")
@@ -50,4 +59,4 @@ class BollingerBandsStrategy(BaseStrategy):
         bars.loc[bars["close"] < bars[lower_band_col], "signal"] = 1
         bars.loc[bars["close"] > bars[upper_band_col], "signal"] = -1
 
-        return bars
\ No newline at end of file
+        return bars
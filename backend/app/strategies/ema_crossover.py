@@ -1,6 +1,8 @@
 import logging
 from sqlalchemy.orm import Session
 from app.strategies.base import BaseStrategy
+from app.indicators.feed import IndicatorFeed
+from app.indicators.moving_averages import EMA
 import pandas_ta as ta
 import pandas as pd
 
@@ -8,7 +10,9 @@ import pandas as pd
 class EmaCrossoverStrategy(BaseStrategy):
     name: str = "ema_crossover"
     display_name: str = "EMA Crossover"
-    description: str = "Similar to the SMA Crossover, but uses Exponential Moving Averages (EMAs) which give more weight to recent prices."
+    description: str = (
+        "Similar to the SMA Crossover, but uses Exponential Moving Averages (EMAs) which give more weight to recent prices."
+    )
 
     def __init__(self, *args, fast_period=12, slow_period=26, **kwargs):
         super().__init__(*args, **kwargs)
@@ -20,26 +24,30 @@ class EmaCrossoverStrategy(BaseStrategy):
 
     async def run_on_trade(self, trade):
         symbol = trade.symbol
-        timeframe = "1Day"
+        timeframe = self.timeframe
         logging.info(f"Running EMA Crossover strategy for {symbol}")
 
-        bars = self.alpaca_service.get_bars(
-            symbol, timeframe, limit=self.slow_period + 5
-        ).df
-        if bars.empty:
+        feed = await self.get_indicators(
+            symbol,
+            timeframe,
+            self.slow_period + 5,
+            lambda: IndicatorFeed(
+                fast=EMA(self.fast_period), slow=EMA(self.slow_period)
+            ),
+        )
+        if not feed.bars:
             return
 
-        bars.ta.ema(length=self.fast_period, append=True)
-        bars.ta.ema(length=self.slow_period, append=True)
-
-        latest_fast_ema = bars[f"EMA_{self.fast_period}"].iloc[-1]
-        latest_slow_ema = bars[f"EMA_{self.slow_period}"].iloc[-1]
-        previous_fast_ema = bars[f"EMA_{self.fast_period}"].iloc[-2]
-        previous_slow_ema = bars[f"EMA_{self.slow_period}"].iloc[-2]
+        latest_fast_ema = feed.current["fast"]
+        latest_slow_ema = feed.current["slow"]
+        previous_fast_ema = feed.previous["fast"]
+        previous_slow_ema = feed.previous["slow"]
 
         if latest_fast_ema > latest_slow_ema and previous_fast_ema <= previous_slow_ema:
             logging.info(f"Buy signal for {symbol} (EMA Crossover)")
-        elif latest_fast_ema < latest_slow_ema and previous_fast_ema >= previous_slow_ema:
+        elif (
+            latest_fast_ema < latest_slow_ema and previous_fast_ema >= previous_slow_ema
+        ):
             logging.info(f"Sell signal for {symbol} (EMA Crossover)")
 
     def generate_signals(self, bars: pd.DataFrame) -> pd.DataFrame:
@@ -65,4 +73,4 @@ class EmaCrossoverStrategy(BaseStrategy):
             "signal",
         ] = -1
 
-        return bars
\ No newline at end of file
+        return bars
@@ -1,13 +1,17 @@
 import logging
 from sqlalchemy.orm import Session
 from app.strategies.base import BaseStrategy
+from app.indicators.feed import IndicatorFeed
+from app.indicators.trend import Ichimoku
 import pandas_ta as ta
 
 
 class IchimokuCloudStrategy(BaseStrategy):
     name: str = "ichimoku_cloud"
     display_name: str = "Ichimoku Cloud"
-    description: str = "A collection of indicators that show support and resistance levels, as well as momentum and trend direction."
+    description: str = (
+        "A collection of indicators that show support and resistance levels, as well as momentum and trend direction."
+    )
 
     def __init__(self, *args, tenkan=9, kijun=26, senkou=52, **kwargs):
         super().__init__(*args, **kwargs)
@@ -20,22 +24,24 @@ class IchimokuCloudStrategy(BaseStrategy):
 
     async def run_on_trade(self, trade):
         symbol = trade.symbol
-        timeframe = "1Day"
+        timeframe = self.timeframe
         logging.info(f"Running Ichimoku Cloud strategy for {symbol}")
 
-        bars = self.alpaca_service.get_bars(
-            symbol, timeframe, limit=self.senkou + 5
-        ).df
-        if bars.empty:
-            return
-
-        bars.ta.ichimoku(
-            tenkan=self.tenkan, kijun=self.kijun, senkou=self.senkou, append=True
+        # Span B needs `senkou` bars and is then shifted forward by `kijun - 1`
+        feed = await self.get_indicators(
+            symbol,
+            timeframe,
+            self.senkou + self.kijun,
+            lambda: IndicatorFeed(
+                cloud=Ichimoku(tenkan=self.tenkan, kijun=self.kijun, senkou=self.senkou)
+            ),
         )
+        if not feed.bars:
+            return
 
-        latest_close = bars["close"].iloc[-1]
-        span_a = bars[f"ISA_{self.tenkan}_{self.kijun}_{self.senkou}"].iloc[-1]
-        span_b = bars[f"ISB_{self.kijun}_{self.senkou}"].iloc[-1]
+        latest_close = feed.close
+        span_a = feed.current["cloud"].span_a
+        span_b = feed.current["cloud"].span_b
 
         if latest_close > span_a and latest_close > span_b:
             logging.info(f"Buy signal for {symbol} (Ichimoku Cloud)")
@@ -54,7 +60,13 @@ class IchimokuCloudStrategy(BaseStrategy):
         span_b_col = f"ISB_{self.kijun}_{self.senkou}"
 
         bars["signal"] = 0
-        bars.loc[(bars["close"] > bars[span_a_col]) & (bars["close"] > bars[span_b_col]), "signal"] = 1
-        bars.loc[(bars["close"] < bars[span_a_col]) & (bars["close"] < bars[span_b_col]), "signal"] = -1
+        bars.loc[
+            (bars["close"] > bars[span_a_col]) & (bars["close"] > bars[span_b_col]),
+            "signal",
+        ] = 1
+        bars.loc[
+            (bars["close"] < bars[span_a_col]) & (bars["close"] < bars[span_b_col]),
+            "signal",
+        ] = -1
 
-        return bars
\ No newline at end of file
+        return bars
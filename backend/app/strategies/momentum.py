@@ -7,7 +7,9 @@ import pandas_ta as ta
 class MomentumStrategy(BaseStrategy):
     name: str = "momentum"
     display_name: str = "Momentum"
-    description: str = "A strategy that aims to capitalize on the continuance of existing trends in the market."
+    description: str = (
+        "A strategy that aims to capitalize on the continuance of existing trends in the market."
+    )
 
     def __init__(self, *args, momentum_period=14, **kwargs):
         super().__init__(*args, **kwargs)
@@ -18,12 +20,12 @@ class MomentumStrategy(BaseStrategy):
 
     async def run_on_trade(self, trade):
         symbol = trade.symbol
-        timeframe = "1Day"
+        timeframe = self.timeframe
         logging.info(f"Running Momentum strategy for {symbol}")
 
-        bars = self.alpaca_service.get_bars(
+        bars = await self.get_recent_bars(
             symbol, timeframe, limit=self.momentum_period + 5
-        ).df
+        )
         if bars.empty:
             return
 
@@ -46,4 +48,4 @@ class MomentumStrategy(BaseStrategy):
         bars.loc[bars["momentum"] > 0, "signal"] = 1
         bars.loc[bars["momentum"] < 0, "signal"] = -1
 
-        return bars
\ No newline at end of file
+        return bars
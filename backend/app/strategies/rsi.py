@@ -1,13 +1,17 @@
 import logging
 from sqlalchemy.orm import Session
 from app.strategies.base import BaseStrategy
+from app.indicators.feed import IndicatorFeed
+from app.indicators.momentum import RSI
 import pandas_ta as ta
 
 
 class RsiStrategy(BaseStrategy):
     name: str = "rsi"
     display_name: str = "RSI"
-    description: str = "A momentum oscillator that measures the speed and change of price movements. It is used to identify overbought or oversold conditions."
+    description: str = (
+        "A momentum oscillator that measures the speed and change of price movements. It is used to identify overbought or oversold conditions."
+    )
 
     def __init__(self, *args, period=14, overbought=70, oversold=30, **kwargs):
         super().__init__(*args, **kwargs)
@@ -20,18 +24,19 @@ class RsiStrategy(BaseStrategy):
 
     async def run_on_trade(self, trade):
         symbol = trade.symbol
-        timeframe = "1Day"
+        timeframe = self.timeframe
         logging.info(f"Running RSI strategy for {symbol}")
 
-        bars = self.alpaca_service.get_bars(
-            symbol, timeframe, limit=self.period + 5
-        ).df
-        if bars.empty:
+        feed = await self.get_indicators(
+            symbol,
+            timeframe,
+            self.period + 5,
+            lambda: IndicatorFeed(rsi=RSI(self.period)),
+        )
+        if not feed.bars:
             return
 
-        bars.ta.rsi(length=self.period, append=True)
-
-        latest_rsi = bars[f"RSI_{self.period}"].iloc[-1]
+        latest_rsi = feed.current["rsi"]
 
         if latest_rsi > self.overbought:
             logging.info(f"Sell signal for {symbol} (RSI > {self.overbought})")
@@ -50,4 +55,4 @@ class RsiStrategy(BaseStrategy):
         bars.loc[bars[rsi_col] < self.oversold, "signal"] = 1
         bars.loc[bars[rsi_col] > self.overbought, "signal"] = -1
 
-        return bars
\ No newline at end of file
+        return bars
@@ -3,6 +3,8 @@ import pandas as pd
 import pandas_ta as ta
 from sqlalchemy.orm import Session
 from app.strategies.base import BaseStrategy
+from app.indicators.feed import IndicatorFeed
+from app.indicators.moving_averages import SMA
 from app.services.telegram import TelegramService
 from app.services.google_sheets import GoogleSheetsService
 from app.crud import create_trade
@@ -12,7 +14,9 @@ from app.core.connection_manager import manager
 class SmaCrossover(BaseStrategy):
     name: str = "sma_crossover"
     display_name: str = "SMA Crossover"
-    description: str = "A simple strategy that generates buy/sell signals based on the crossover of two Simple Moving Averages (SMAs) of different lengths."
+    description: str = (
+        "A simple strategy that generates buy/sell signals based on the crossover of two Simple Moving Averages (SMAs) of different lengths."
+    )
 
     def __init__(
         self,
@@ -33,7 +37,7 @@ class SmaCrossover(BaseStrategy):
 
     async def get_position(self, symbol: str) -> float:
         try:
-            position = await self.alpaca_service.api.get_position(symbol)
+            position = await self.alpaca_service.get_position_async(symbol)
             return float(position.qty)
         except Exception as e:
             logging.warning(f"Could not get position for {symbol}: {e}")
@@ -44,27 +48,29 @@ class SmaCrossover(BaseStrategy):
 
     async def run_on_trade(self, trade):
         symbol = trade.symbol
-        timeframe = "1Day"
+        timeframe = self.timeframe
         logging.info(f"Running SMA Crossover strategy for {symbol}")
 
-        bars = self.alpaca_service.get_bars(
-            symbol, timeframe, limit=self.slow_period + 5
-        ).df
+        feed = await self.get_indicators(
+            symbol,
+            timeframe,
+            self.slow_period + 5,
+            lambda: IndicatorFeed(
+                fast=SMA(self.fast_period), slow=SMA(self.slow_period)
+            ),
+        )
         logging.info(
-            f"Fetched {len(bars)} bars for {symbol} with timeframe {timeframe}."
+            f"Updated indicators over {feed.bars} bars for {symbol} with timeframe {timeframe}."
         )
 
-        if len(bars) < self.slow_period:
+        if feed.bars < self.slow_period:
             logging.warning(f"Not enough data for {symbol} to run strategy.")
             return
 
-        bars.ta.sma(length=self.fast_period, append=True)
-        bars.ta.sma(length=self.slow_period, append=True)
-
-        latest_fast_sma = bars[f"SMA_{self.fast_period}"].iloc[-1]
-        latest_slow_sma = bars[f"SMA_{self.slow_period}"].iloc[-1]
-        previous_fast_sma = bars[f"SMA_{self.fast_period}"].iloc[-2]
-        previous_slow_sma = bars[f"SMA_{self.slow_period}"].iloc[-2]
+        latest_fast_sma = feed.current["fast"]
+        latest_slow_sma = feed.current["slow"]
+        previous_fast_sma = feed.previous["fast"]
+        previous_slow_sma = feed.previous["slow"]
 
         logging.info(
             f"Latest fast SMA for {symbol}: {latest_fast_sma:.2f}, slow SMA: {latest_slow_sma:.2f}"
@@ -84,11 +90,11 @@ class SmaCrossover(BaseStrategy):
 
             account_info = await self.alpaca_service.get_account_info()
             buying_power = float(account_info.buying_power)
-            last_price = bars["close"].iloc[-1]
+            last_price = feed.close
             qty = int((buying_power * self.trade_percentage) / last_price)
 
             if qty > 0:
-                order = self.alpaca_service.submit_order(
+                order = await self.alpaca_service.submit_order_async(
                     symbol=symbol,
                     qty=qty,
                     side="buy",
@@ -112,7 +118,7 @@ class SmaCrossover(BaseStrategy):
             logging.info(message)
             await self.telegram_service.send_message(message)
             await manager.broadcast_json({"type": "log", "message": message})
-            order = self.alpaca_service.submit_order(
+            order = await self.alpaca_service.submit_order_async(
                 symbol, current_position, "sell", "market", "gtc"
             )
             create_trade(db, symbol, order.qty, order.filled_avg_price, order.side)
@@ -145,4 +151,4 @@ class SmaCrossover(BaseStrategy):
             "signal",
         ] = -1
 
-        return bars
\ No newline at end of file
+        return bars
@@ -7,7 +7,9 @@ import pandas_ta as ta
 class VwapStrategy(BaseStrategy):
     name: str = "vwap"
     display_name: str = "VWAP"
-    description: str = "Volume-Weighted Average Price (VWAP) is a trading benchmark that gives the average price a security has traded at throughout the day, based on both volume and price."
+    description: str = (
+        "Volume-Weighted Average Price (VWAP) is a trading benchmark that gives the average price a security has traded at throughout the day, based on both volume and price."
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -17,10 +19,10 @@ class VwapStrategy(BaseStrategy):
 
     async def run_on_trade(self, trade):
         symbol = trade.symbol
-        timeframe = "1Day"
+        timeframe = self.timeframe
         logging.info(f"Running VWAP strategy for {symbol}")
 
-        bars = self.alpaca_service.get_bars(symbol, timeframe, limit=2).df
+        bars = await self.get_recent_bars(symbol, timeframe, limit=2)
         if bars.empty:
             return
 
@@ -46,4 +48,4 @@ class VwapStrategy(BaseStrategy):
         bars.loc[bars["close"] > bars[vwap_col], "signal"] = 1
         bars.loc[bars["close"] < bars[vwap_col], "signal"] = -1
 
-        return bars
\ No newline at end of file
+        return bars
@@ -0,0 +1,95 @@
+import argparse
+import logging
+import sys
+from benchmarks import runner
+from benchmarks.data import synthetic_bars
+
+DEFAULT_SIZES = [1_000, 100_000, 10_000_000]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Times strategies, feature/label preparation, the market scanner and ATR on synthetic bars.",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=DEFAULT_SIZES,
+        help="Bar counts to time at.",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        metavar="PATTERN",
+        help="Only benchmarks matching these globs.",
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the results to this JSON file, e.g. to record a baseline.",
+    )
+    parser.add_argument(
+        "--compare", metavar="BASELINE", help="Compare the results with this baseline."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Slowdown that counts as a regression (0.25 = 25%%).",
+    )
+    return parser.parse_args()
+
+
+def print_result(key, result):
+    if "best" in result:
+        print(
+            f"{key:<60} {result['best']:>12.6f}s  (median {result['median']:.6f}s)",
+            flush=True,
+        )
+    else:
+        print(f"{key:<60} {'error':>13}  {result['error']}", flush=True)
+
+
+def print_comparison(rows):
+    print(f"\n{'benchmark':<60} {'baseline':>12} {'current':>12} {'ratio':>7}  status")
+    for row in rows:
+        baseline = "-" if row["baseline"] is None else f"{row['baseline']:.6f}"
+        current = "-" if row["current"] is None else f"{row['current']:.6f}"
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.2f}x"
+        print(
+            f"{row['name']:<60} {baseline:>12} {current:>12} {ratio:>7}  {row['status']}"
+        )
+
+
+def main() -> int:
+    args = parse_args()
+    # Strategies log every signal; only their warnings and errors are shown
+    logging.disable(logging.INFO)
+    from benchmarks.cases import all_benchmarks
+
+    report = runner.run(
+        all_benchmarks(), args.sizes, synthetic_bars, args.only, print_result
+    )
+    if args.output:
+        runner.save(report, args.output)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        rows = runner.compare(runner.load(args.compare), report, args.tolerance)
+        print_comparison(rows)
+        regressed = [row["name"] for row in rows if row["status"] == "regressed"]
+        failed = [row["name"] for row in rows if row["status"] == "failed"]
+        if regressed:
+            print(
+                f"\n{len(regressed)} benchmark(s) regressed by more than {args.tolerance:.0%}."
+            )
+        if failed:
+            print(f"\n{len(failed)} benchmark(s) failed that ran in the baseline.")
+        if regressed or failed:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
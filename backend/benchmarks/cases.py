@@ -0,0 +1,75 @@
+import asyncio
+from app.backtester.batch import _strategy_classes, build_strategy
+from app.backtester.replay import replay_bars
+from app.core.risk_manager import RiskManager
+from app.services.market_scanner import MarketScanner
+from benchmarks.data import FakeUniverseService
+from benchmarks.runner import Benchmark
+
+# Bars replayed through the live path; each becomes four trades
+LIVE_PATH_MAX_ROWS = 1_000
+
+# The whole US equity universe is ~12k symbols of 30 sessions each
+SCANNER_MAX_ROWS = 1_000_000
+
+
+def _generate_signals(name):
+    def setup(bars):
+        strategy = build_strategy(name, "SPY")
+        # Strategies add their indicator columns to the bars they are given
+        return lambda: strategy.generate_signals(bars.copy())
+
+    return setup
+
+
+def _run_on_trade(name):
+    def setup(bars):
+        return lambda: asyncio.run(
+            replay_bars(name, "SPY", bars, timeframe="1Min", warmup=100)
+        )
+
+    return setup
+
+
+def _prepare_features(bars):
+    strategy = build_strategy("ai_strategy")
+    return lambda: strategy._prepare_features(bars)
+
+
+def _prepare_labels(bars):
+    strategy = build_strategy("ai_strategy")
+    return lambda: strategy._prepare_labels(bars)
+
+
+def _scan(bars):
+    service = FakeUniverseService(len(bars))
+    scanner = MarketScanner(service)
+    symbols = service.symbols
+    return lambda: scanner.scan(symbols)
+
+
+def _calculate_atr(bars):
+    risk_manager = RiskManager(account_equity=100000)
+    return lambda: risk_manager.calculate_atr(bars)
+
+
+def all_benchmarks() -> list:
+    benchmarks = []
+    for name in sorted(_strategy_classes()):
+        benchmarks.append(
+            Benchmark(f"strategies.{name}.generate_signals", _generate_signals(name))
+        )
+        benchmarks.append(
+            Benchmark(
+                f"strategies.{name}.run_on_trade",
+                _run_on_trade(name),
+                max_rows=LIVE_PATH_MAX_ROWS,
+            )
+        )
+    benchmarks += [
+        Benchmark("ai_strategy._prepare_features", _prepare_features),
+        Benchmark("ai_strategy._prepare_labels", _prepare_labels),
+        Benchmark("market_scanner.scan", _scan, max_rows=SCANNER_MAX_ROWS),
+        Benchmark("risk_manager.calculate_atr", _calculate_atr),
+    ]
+    return benchmarks
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+
+def synthetic_bars(
+    rows: int,
+    freq: str = "1min",
+    volatility: float = 0.001,
+    start: str = "2020-01-02 14:30",
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    OHLCV bars following a random walk, shaped like the bars Alpaca returns.
+
+    :param rows: Number of bars.
+    :param freq: Spacing of the bars' timestamps.
+    :param volatility: Standard deviation of each bar's log return.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(rows) * volatility))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    spread = np.abs(rng.standard_normal(rows)) * close * volatility / 2
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.integers(100, 100_000, size=rows).astype("float64"),
+        },
+        index=pd.date_range(start, periods=rows, freq=freq, tz="UTC", name="timestamp"),
+    )
+
+
+class FakeUniverseService:
+    """
+    Stands in for ``AlpacaService`` in ``MarketScanner``, serving daily bars for a
+    synthetic universe of ``rows // sessions`` symbols.
+    """
+
+    def __init__(self, rows: int, sessions: int = 30, seed: int = 0):
+        self.api = None
+        self.data_api = None
+        # Volatile enough that some symbols pass the scanner's ATR filter
+        bars = synthetic_bars(
+            rows - rows % sessions or sessions, volatility=0.03, seed=seed
+        )
+        index = pd.date_range(
+            "2024-01-02", periods=sessions, freq="B", tz="UTC", name="timestamp"
+        )
+        values = bars.to_numpy().reshape(-1, sessions, bars.shape[1])
+        self.bars = {
+            f"S{i:06d}": pd.DataFrame(block, index=index, columns=bars.columns)
+            for i, block in enumerate(values)
+        }
+
+    @property
+    def symbols(self) -> list:
+        return list(self.bars)
+
+    def get_multi_bars(self, symbols, timeframe, start=None, end=None, **kwargs):
+        return {symbol: self.bars[symbol] for symbol in symbols}
@@ -0,0 +1,186 @@
+import datetime
+import fnmatch
+import json
+import logging
+import os
+import platform
+import time
+import numpy as np
+import pandas as pd
+
+# Each case is timed in rounds of at least MIN_ROUND_SECONDS, for up to
+# MAX_ROUNDS rounds or CASE_BUDGET_SECONDS, whichever ends first
+MIN_ROUND_SECONDS = 0.2
+MAX_ROUNDS = 5
+CASE_BUDGET_SECONDS = 10.0
+
+
+class Benchmark:
+    """
+    A timed operation.
+
+    :param name: Dotted name, used for filtering and as the key in results.
+    :param setup: Called with the synthetic bars of the current size; returns
+                  the zero-argument callable that is timed.
+    :param max_rows: Sizes above this are skipped, e.g. for code that is too
+                     slow to time on millions of rows.
+    """
+
+    def __init__(self, name: str, setup, max_rows: int = None):
+        self.name = name
+        self.setup = setup
+        self.max_rows = max_rows
+
+
+def measure(func) -> dict:
+    """
+    Times ``func`` the way ``timeit`` does: a warm-up call, then rounds of
+    repeated calls. Calls that take longer than the whole budget are timed once.
+
+    :return: Seconds per call of the best and median round, and how it was timed.
+    """
+    started = time.perf_counter()
+    func()
+    first = time.perf_counter() - started
+    if first >= CASE_BUDGET_SECONDS:
+        return {"best": first, "median": first, "rounds": 1, "loops": 1}
+
+    loops = max(1, int(MIN_ROUND_SECONDS / first)) if first > 0 else 1000
+    rounds = int(
+        min(MAX_ROUNDS, max(1, CASE_BUDGET_SECONDS // (first * loops or 1e-9)))
+    )
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - started) / loops)
+    return {
+        "best": min(timings),
+        "median": float(np.median(timings)),
+        "rounds": rounds,
+        "loops": loops,
+    }
+
+
+def result_key(name: str, rows: int) -> str:
+    return f"{name}[{rows}]"
+
+
+def run(benchmarks, sizes, make_bars, patterns=None, on_result=None) -> dict:
+    """
+    Times every benchmark matching one of ``patterns`` (globs on the name) at every size.
+
+    Bars are generated once per size and shared by the benchmarks. A benchmark
+    that raises is recorded with its error instead of stopping the run.
+
+    :param on_result: Called with each result's key and result as it comes in.
+    """
+    if patterns:
+        benchmarks = [
+            b for b in benchmarks if any(fnmatch.fnmatch(b.name, p) for p in patterns)
+        ]
+    results = {}
+    for rows in sizes:
+        bars = make_bars(rows)
+        for benchmark in benchmarks:
+            key = result_key(benchmark.name, rows)
+            if benchmark.max_rows is not None and rows > benchmark.max_rows:
+                results[key] = {
+                    "rows": rows,
+                    "skipped": f"above {benchmark.max_rows} rows",
+                }
+                continue
+            try:
+                results[key] = {"rows": rows, **measure(benchmark.setup(bars))}
+            except Exception as e:
+                logging.error(f"{key} failed: {e}")
+                results[key] = {"rows": rows, "error": str(e)}
+            if on_result is not None:
+                on_result(key, results[key])
+        del bars
+    return {"meta": environment(), "results": results}
+
+
+def environment() -> dict:
+    """Where the results were measured; timings only compare on the same machine."""
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(
+            timespec="seconds"
+        ),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.node(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def save(report: dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(
+    baseline: dict, current: dict, tolerance: float = 0.25, min_seconds: float = 0.001
+) -> list:
+    """
+    Compares the best time of every benchmark measured in both reports.
+
+    :param tolerance: Slowdown, as a fraction of the baseline, that counts as a regression.
+    :param min_seconds: Differences smaller than this are noise, whatever the ratio.
+    :return: One row per benchmark, with ``status`` "regressed", "improved",
+             "unchanged", "new" (not in the baseline) or "failed" (measured in
+             the baseline, raising now).
+    """
+    rows = []
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key, {})
+        if "best" not in result:
+            if "error" in result and "best" in base:
+                rows.append(
+                    {
+                        "name": key,
+                        "baseline": base["best"],
+                        "current": None,
+                        "ratio": None,
+                        "status": "failed",
+                    }
+                )
+            continue
+        if "best" not in base:
+            rows.append(
+                {
+                    "name": key,
+                    "baseline": None,
+                    "current": result["best"],
+                    "ratio": None,
+                    "status": "new",
+                }
+            )
+            continue
+        ratio = result["best"] / base["best"] if base["best"] > 0 else float("inf")
+        significant = abs(result["best"] - base["best"]) >= min_seconds
+        if significant and ratio > 1 + tolerance:
+            status = "regressed"
+        elif significant and ratio < 1 / (1 + tolerance):
+            status = "improved"
+        else:
+            status = "unchanged"
+        rows.append(
+            {
+                "name": key,
+                "baseline": base["best"],
+                "current": result["best"],
+                "ratio": ratio,
+                "status": status,
+            }
+        )
+    return rows
@@ -23,6 +23,52 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(
         30, description="Access token expiration time in minutes"
     )
+    ALPACA_MAX_CONNECTIONS: int = Field(
+        20,
+        description="Size of the pooled keep-alive connection pool for async API calls",
+    )
+    ALPACA_MAX_CONCURRENT_REQUESTS: int = Field(
+        10, description="Maximum number of async API requests in flight at once"
+    )
+    ALPACA_REQUEST_TIMEOUT: float = Field(
+        10.0, description="Timeout in seconds for async API requests"
+    )
+    ALPACA_RATE_LIMIT_PER_MINUTE: int = Field(
+        200, description="Request budget per minute shared by all Alpaca API calls"
+    )
+    STRATEGY_EVALUATION_POLICY: str = Field(
+        "every_trade",
+        description="Default strategy evaluation policy: every_trade, throttle or bar_close",
+    )
+    STRATEGY_MAX_EVALUATIONS_PER_SECOND: float = Field(
+        1.0, description="Evaluations per second per strategy under the throttle policy"
+    )
+    STRATEGY_EVALUATION_TIMEOUT: float = Field(
+        10.0,
+        description="Seconds a single strategy evaluation may run before it is cancelled",
+    )
+    STRATEGY_MAX_CONCURRENT_EVALUATIONS: int = Field(
+        32, description="Maximum number of strategy evaluations running at once"
+    )
+    CPU_WORKERS: int = Field(
+        0, description="Worker processes for CPU-bound work (0 uses every core)"
+    )
+    IO_WORKERS: int = Field(16, description="Worker threads for blocking I/O")
+    BAR_STORE_DIR: str = Field(
+        "./bar_store", description="Directory of the local on-disk bar cache"
+    )
+    BAR_STORE_REFRESH_SECONDS: float = Field(
+        15.0,
+        description="Minimum seconds between tail refreshes of a cached bar series",
+    )
+    BAR_STORE_MAX_SERIES: int = Field(
+        256,
+        description="Bar series the bar cache keeps in memory (least recently used are dropped)",
+    )
+    TRADE_TAPE_DIR: str | None = Field(
+        None,
+        description="Directory to record every streamed trade to, one tape per day (off when empty)",
+    )
 
 
 settings = Settings()
@@ -2,12 +2,22 @@ import logging
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import account, strategy, google_sheets, websocket, trades, market, scanner
+from app.api import (
+    account,
+    strategy,
+    google_sheets,
+    websocket,
+    trades,
+    market,
+    scanner,
+    metrics,
+    backtester,
+)
 from app.core.logging import setup_logging
 from app.core.database import engine
 from app.models import trade
 import asyncio
-from app.services.alpaca import AlpacaService
+from app.services.alpaca import get_alpaca_service
 from app.core.connection_manager import manager
 from app.core.strategy_manager import StrategyManager
 from app.core.risk_manager import RiskManager
@@ -15,6 +25,7 @@ from app.services.telegram import TelegramService
 from app.services.google_sheets import GoogleSheetsService
 from app.core.market_watcher import watch_market_status
 from app.core.queue import message_queue
+from app.core.executors import executors
 
 trade.Base.metadata.create_all(bind=engine)
 
@@ -23,15 +34,16 @@ setup_logging()
 app = FastAPI()
 
 
-
-alpaca_service = AlpacaService()
+alpaca_service = get_alpaca_service()
 
 
 async def broadcast_updates():
     while True:
         try:
-            positions = alpaca_service.get_open_positions()
-            orders = alpaca_service.get_orders()
+            positions, orders = await asyncio.gather(
+                alpaca_service.get_open_positions_async(),
+                alpaca_service.get_orders_async(),
+            )
             await manager.broadcast_json(
                 {"type": "positions_update", "data": positions}
             )
@@ -40,6 +52,7 @@ async def broadcast_updates():
             logging.error(f"Error broadcasting updates: {e}")
         await asyncio.sleep(5)
 
+
 async def process_message_queue():
     while True:
         if not message_queue.empty():
@@ -47,6 +60,7 @@ async def process_message_queue():
             await manager.broadcast_json(message)
         await asyncio.sleep(0.1)
 
+
 @app.on_event("startup")
 async def startup_event():
     asyncio.create_task(broadcast_updates())
@@ -57,11 +71,22 @@ async def startup_event():
     telegram_service = TelegramService()
     google_sheets_service = GoogleSheetsService()
     app.state.strategy_manager = StrategyManager(
-        alpaca_service, risk_manager, telegram_service, google_sheets_service, manager, message_queue
+        alpaca_service,
+        risk_manager,
+        telegram_service,
+        google_sheets_service,
+        manager,
+        message_queue,
     )
     await alpaca_service.start_stream(app.state.strategy_manager)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await alpaca_service.aclose()
+    executors.shutdown()
+
+
 origins = [
     "http://localhost:3000",
 ]
@@ -81,6 +106,8 @@ app.include_router(websocket.router)
 app.include_router(trades.router, prefix="/api")
 app.include_router(market.router, prefix="/api/market")
 app.include_router(scanner.router, prefix="/api/scanner")
+app.include_router(metrics.router, prefix="/api")
+app.include_router(backtester.router, prefix="/api")
 
 
 @app.exception_handler(HTTPException)
@@ -0,0 +1,95 @@
+import argparse
+import asyncio
+import json
+import time
+from app.backtester.replay import ReplayBacktester, trades_from_tape
+from app.core.trade_tape import TradeTape, TradeTapeWriter
+from app.services.simulated_alpaca import FillModel, SimulatedAlpacaService
+from app.services.synthetic_stream import SyntheticTradeStream
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Replays a recorded or synthetic trade tape through the live trading path."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--tape", help="Directory of tapes recorded with TRADE_TAPE_DIR."
+    )
+    source.add_argument(
+        "--synthetic", type=float, metavar="RATE", help="Random-walk trades per second."
+    )
+    parser.add_argument(
+        "--day", help="Recorded day to replay (YYYY-MM-DD); the latest if omitted."
+    )
+    parser.add_argument(
+        "--start", help="Replay from this New York time, e.g. '2024-05-01 09:30'."
+    )
+    parser.add_argument("--end", help="Replay up to this New York time.")
+    parser.add_argument(
+        "--seconds", type=float, default=60, help="Length of a synthetic tape."
+    )
+    parser.add_argument(
+        "--symbols", nargs="+", default=["SPY"], help="Symbols to replay."
+    )
+    parser.add_argument(
+        "--speed",
+        default="max",
+        help="Multiple of the tape's pace (1 is real time), or 'max'.",
+    )
+    parser.add_argument(
+        "--strategy",
+        action="append",
+        default=[],
+        help="Strategy to run on every symbol.",
+    )
+    parser.add_argument("--timeframe", default="1Min")
+    parser.add_argument("--params", default="{}", help="Strategy parameters as JSON.")
+    parser.add_argument("--capital", type=float, default=100000)
+    parser.add_argument("--slippage-bps", type=float, default=0.0)
+    parser.add_argument(
+        "--record", help="Also record the replay to tapes in this directory."
+    )
+    parser.add_argument("--verbose", action="store_true", help="Keep info logging on.")
+    return parser.parse_args()
+
+
+def load_trades(args):
+    if args.tape:
+        tape = TradeTape(args.tape)
+        day = args.day or tape.days()[-1]
+        return trades_from_tape(tape, day, args.symbols, args.start, args.end)
+    stream = SyntheticTradeStream(symbols=args.symbols, seed=0)
+    end_ns = time.time_ns()
+    return stream.batch(
+        int(args.synthetic * args.seconds), end_ns - int(args.seconds * 10**9), end_ns
+    )
+
+
+async def main():
+    args = parse_args()
+    trades = load_trades(args)
+
+    service = SimulatedAlpacaService(
+        initial_capital=args.capital,
+        fill_model=FillModel(slippage_bps=args.slippage_bps),
+    )
+    replay = ReplayBacktester(service)
+    for name in args.strategy:
+        for symbol in args.symbols:
+            replay.add_strategy(
+                name, symbol, timeframe=args.timeframe, **json.loads(args.params)
+            )
+
+    tape = TradeTapeWriter(args.record) if args.record else None
+    speed = None if args.speed == "max" else float(args.speed)
+    results = await replay.run(trades, quiet=not args.verbose, speed=speed, tape=tape)
+    if tape is not None:
+        tape.close()
+
+    print("Replay Results:")
+    print(json.dumps(results, indent=4, default=str))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -27,6 +27,20 @@ def mock_all_services_and_config(session_mocker: MockerFixture):
     mock_config_module.settings.TELEGRAM_BOT_TOKEN = "test_token"
     mock_config_module.settings.TELEGRAM_CHAT_ID = "test_chat_id"
     mock_config_module.settings.GOOGLE_SHEETS_CREDENTIALS = "{}"
+    mock_config_module.settings.ALPACA_MAX_CONNECTIONS = 20
+    mock_config_module.settings.ALPACA_MAX_CONCURRENT_REQUESTS = 10
+    mock_config_module.settings.ALPACA_REQUEST_TIMEOUT = 10.0
+    mock_config_module.settings.ALPACA_RATE_LIMIT_PER_MINUTE = 200
+    mock_config_module.settings.STRATEGY_EVALUATION_POLICY = "every_trade"
+    mock_config_module.settings.STRATEGY_MAX_EVALUATIONS_PER_SECOND = 1.0
+    mock_config_module.settings.STRATEGY_EVALUATION_TIMEOUT = 10.0
+    mock_config_module.settings.STRATEGY_MAX_CONCURRENT_EVALUATIONS = 32
+    mock_config_module.settings.CPU_WORKERS = 2
+    mock_config_module.settings.IO_WORKERS = 4
+    mock_config_module.settings.BAR_STORE_DIR = "./bar_store"
+    mock_config_module.settings.BAR_STORE_REFRESH_SECONDS = 15.0
+    mock_config_module.settings.BAR_STORE_MAX_SERIES = 256
+    mock_config_module.settings.TRADE_TAPE_DIR = None
 
     # Patch sys.modules to return our mock objects when modules are imported
     session_mocker.patch.dict(
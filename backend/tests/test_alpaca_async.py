@@ -0,0 +1,158 @@
+import asyncio
+
+import httpx
+import pytest
+from alpaca_trade_api.rest import APIError
+
+from app.services.alpaca_async import AsyncAlpacaClient
+
+
+def make_client(handler, **kwargs):
+    return AsyncAlpacaClient(
+        "key",
+        "secret",
+        "https://paper-api.alpaca.markets",
+        transport=httpx.MockTransport(handler),
+        retry_wait=0,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_bars_follows_page_tokens():
+    pages = {
+        None: {
+            "bars": [
+                {
+                    "t": "2024-01-02T05:00:00Z",
+                    "o": 1,
+                    "h": 2,
+                    "l": 0.5,
+                    "c": 1.5,
+                    "v": 10,
+                }
+            ],
+            "next_page_token": "p2",
+        },
+        "p2": {
+            "bars": [
+                {
+                    "t": "2024-01-03T05:00:00Z",
+                    "o": 2,
+                    "h": 3,
+                    "l": 1.5,
+                    "c": 2.5,
+                    "v": 20,
+                }
+            ],
+            "next_page_token": None,
+        },
+    }
+
+    def handler(request):
+        assert request.url.path == "/v2/stocks/SPY/bars"
+        assert request.headers["APCA-API-KEY-ID"] == "key"
+        return httpx.Response(200, json=pages[request.url.params.get("page_token")])
+
+    client = make_client(handler)
+    bars = await client.get_bars("SPY", "1Day", start="2024-01-01")
+    await client.aclose()
+
+    assert list(bars.df["close"]) == [1.5, 2.5]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_raised_as_api_error():
+    client = make_client(
+        lambda request: httpx.Response(403, json={"message": "forbidden"})
+    )
+
+    with pytest.raises(APIError) as exc_info:
+        await client.get_clock()
+    await client.aclose()
+
+    assert exc_info.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_requests_are_retried():
+    responses = iter(
+        [
+            httpx.Response(429, json={"message": "slow down"}),
+            httpx.Response(200, json={"is_open": True}),
+        ]
+    )
+    client = make_client(lambda request: next(responses))
+
+    clock = await client.get_clock()
+    await client.aclose()
+
+    assert clock.is_open is True
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"symbol": request.url.path.rsplit("/", 1)[-1]})
+
+    client = make_client(handler, max_concurrency=3)
+    await asyncio.gather(*(client.get_position(f"SYM{i}") for i in range(12)))
+    await client.aclose()
+
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_gets_are_coalesced():
+    calls = []
+
+    async def handler(request):
+        calls.append((request.method, request.url.path))
+        call_id = str(len(calls))
+        await asyncio.sleep(0.01)
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": call_id})
+        return httpx.Response(200, json={"is_open": True})
+
+    client = make_client(handler)
+    clocks = await asyncio.gather(*(client.get_clock() for _ in range(10)))
+    orders = await asyncio.gather(
+        *(
+            client.submit_order(
+                symbol="SPY", side="buy", type="market", time_in_force="day", qty=1
+            )
+            for _ in range(3)
+        )
+    )
+    await client.get_clock()
+    await client.aclose()
+
+    assert all(clock.is_open for clock in clocks)
+    assert calls.count(("GET", "/v2/clock")) == 2
+    assert calls.count(("POST", "/v2/orders")) == 3
+    assert len({order.id for order in orders}) == 3
+    assert client.single_flight.coalesced == 9
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_share_failures():
+    client = make_client(
+        lambda request: httpx.Response(404, json={"message": "position does not exist"})
+    )
+
+    results = await asyncio.gather(
+        *(client.get_position("SPY") for _ in range(3)), return_exceptions=True
+    )
+    await client.aclose()
+
+    assert all(isinstance(result, APIError) for result in results)
+    assert client.single_flight.calls == 1
+    assert len(client.single_flight) == 0
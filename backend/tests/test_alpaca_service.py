@@ -1,3 +1,6 @@
+import asyncio
+import time
+import pandas as pd
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -81,3 +84,79 @@ def test_submit_order_failure(alpaca_service, mock_alpaca_api):
     assert exc_info.value.status_code == 500
     assert "Order Error" in exc_info.value.detail
     mock_alpaca_api.submit_order.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_trade_subscriptions_follow_active_symbols(alpaca_service):
+    alpaca_service.stream = MagicMock()
+    alpaca_service._trade_handler = AsyncMock()
+    alpaca_service.subscription_batch_delay = 0
+
+    alpaca_service.set_trade_symbols({"AAPL"})
+    alpaca_service.set_trade_symbols({"AAPL", "MSFT"})
+    await alpaca_service._subscription_task
+
+    alpaca_service.stream.subscribe_trades.assert_called_once_with(
+        alpaca_service._trade_handler, "AAPL", "MSFT"
+    )
+
+    alpaca_service.set_trade_symbols({"MSFT"})
+    await alpaca_service._subscription_task
+
+    alpaca_service.stream.unsubscribe_trades.assert_called_once_with("AAPL")
+    assert alpaca_service._subscribed_symbols == {"MSFT"}
+
+
+@pytest.mark.asyncio
+async def test_stream_closes_bars_without_a_next_trade(alpaca_service):
+    alpaca_service.bar_close_interval = 0.01
+    alpaca_service.bar_close_delay = 0
+    aggregator = alpaca_service.bar_buffers.aggregator
+    bars = []
+    aggregator.add_listener(
+        lambda symbol, timeframe, bar: bars.append((symbol, timeframe))
+    )
+    aggregator.track("SPY", "1Min")
+    # The last print of a minute that has already ended
+    aggregator.add_trade("SPY", time.time_ns() - 120 * 10**9, 10.0, 100)
+    strategy_manager = MagicMock()
+    strategy_manager.active_symbols.return_value = set()
+
+    with patch("app.services.alpaca.Stream") as stream:
+        stream.return_value._run_forever = AsyncMock()
+        await alpaca_service.start_stream(strategy_manager)
+        await asyncio.sleep(0.1)
+
+    assert bars == [("SPY", "1Min")]
+
+    task = alpaca_service._bar_close_task
+    await alpaca_service.aclose()
+    await asyncio.sleep(0)
+    assert task.cancelled()
+
+
+def test_multi_bars_only_update_series_already_cached(alpaca_service, tmp_path):
+    from app.core.bar_store import BarStore
+
+    index = pd.date_range("2024-01-02", periods=3, freq="D", tz="UTC", name="timestamp")
+    frame = pd.concat(
+        [
+            pd.DataFrame({"close": [1.0, 2.0, 3.0], "symbol": symbol}, index=index)
+            for symbol in ("SPY", "AAPL", "MSFT")
+        ]
+    )
+    alpaca_service.data_api = MagicMock()
+    alpaca_service.data_api.get_bars.return_value.df = frame
+    alpaca_service.bar_store = BarStore(str(tmp_path))
+    alpaca_service.bar_store.merge(
+        "SPY", "1Day", frame[frame.symbol == "SPY"].iloc[:1], {}
+    )
+
+    bars = alpaca_service.get_multi_bars(
+        ["SPY", "AAPL", "MSFT"], "1Day", start="2024-01-02"
+    )
+
+    assert sorted(bars) == ["AAPL", "MSFT", "SPY"]
+    assert len(alpaca_service.bar_store.read("SPY", "1Day")) == 3
+    assert not alpaca_service.bar_store.cached("AAPL", "1Day")
+    assert sorted(p.name for p in (tmp_path / "1Day").iterdir()) == ["SPY.npz"]
@@ -0,0 +1,106 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.backtester.backtester import Backtester
+from app.core.risk_manager import RiskManager
+from app.backtester.engine import VectorizedBacktester, holding_mask, rolling_atr
+
+
+def make_bars(n=2000, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum() * 0.1
+    index = pd.date_range(
+        "2024-01-02 14:30", periods=n, freq="1min", tz="UTC", name="timestamp"
+    )
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": 100.0,
+        },
+        index=index,
+    )
+
+
+def make_signals(bars, seed=2):
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, 40, len(bars))
+    signals = pd.DataFrame(index=bars.index)
+    signals["signal"] = np.where(draws == 0, 1, np.where(draws == 1, -1, 0))
+    return signals
+
+
+def test_holding_ignores_repeated_events():
+    events = np.array([0, -1, 1, 0, 1, -1, -1, 0, 1, 0], dtype=float)
+
+    holding = holding_mask(events)
+
+    assert holding.tolist() == [
+        False,
+        False,
+        True,
+        True,
+        True,
+        False,
+        False,
+        False,
+        True,
+        True,
+    ]
+
+
+def test_rolling_atr_recovers_after_a_missing_bar():
+    bars = make_bars(100)
+    bars.iloc[5, bars.columns.get_loc("high")] = np.nan
+    bars.iloc[5, bars.columns.get_loc("low")] = np.nan
+
+    atr = rolling_atr(bars)
+
+    expected = RiskManager(account_equity=100000).calculate_atr(bars)
+    np.testing.assert_allclose(atr, expected, rtol=1e-9, equal_nan=True)
+    # Only the windows holding bar 5 are missing
+    assert np.isnan(atr[5:19]).all() and np.isfinite(atr[19:]).all()
+
+
+def test_matches_loop_backtester():
+    bars = make_bars()
+    signals = make_signals(bars)
+    alpaca_service = MagicMock()
+    alpaca_service.get_bars.return_value.df = bars
+    strategy = MagicMock()
+    strategy.generate_signals.return_value = signals.assign(position=signals["signal"])
+
+    expected = Backtester(alpaca_service, strategy, "2024-01-02", "2024-01-04").run(
+        "SPY"
+    )
+    strategy.generate_signals.return_value = signals
+    results = VectorizedBacktester(
+        alpaca_service, strategy, "2024-01-02", "2024-01-04"
+    ).run("SPY")
+
+    assert results["total_trades"] == expected["total_trades"] > 0
+    assert results["final_portfolio_value"] == pytest.approx(
+        expected["final_portfolio_value"]
+    )
+    for trade, legacy in zip(results["trades"], expected["trades"]):
+        assert (trade["side"], trade["date"]) == (
+            legacy["side"],
+            legacy["date"].isoformat(),
+        )
+        assert trade["qty"] == pytest.approx(legacy["qty"])
+
+
+def test_equity_curve_and_no_trades():
+    bars = make_bars(100)
+    signals = pd.DataFrame({"signal": 0}, index=bars.index)
+    backtester = VectorizedBacktester(None, None, None, None)
+
+    results = backtester.simulate(bars, signals, "SPY")
+
+    assert results["message"] == "No trades were executed."
+    assert (backtester.equity_curve == 100000).all()
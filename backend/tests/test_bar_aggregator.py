@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from app.core.bar_aggregator import BarAggregator
+
+
+def ns(ts):
+    return pd.Timestamp(ts, tz="UTC").value
+
+
+def collect(aggregator):
+    bars = []
+    aggregator.add_listener(
+        lambda symbol, timeframe, bar: bars.append((symbol, timeframe, bar))
+    )
+    return bars
+
+
+def test_bars_are_finalized_at_boundaries():
+    aggregator = BarAggregator(timeframes=["1Min", "5Min"], track_all=True)
+    bars = collect(aggregator)
+
+    aggregator.add_trade("SPY", ns("2024-01-02 14:30:01"), 10.0, 100)
+    aggregator.add_trade("SPY", ns("2024-01-02 14:30:20"), 11.0, 100)
+    aggregator.add_trade("QQQ", ns("2024-01-02 14:30:30"), 400.0, 10)
+    aggregator.add_trade("SPY", ns("2024-01-02 14:30:50"), 9.0, 200)
+    aggregator.add_trade("SPY", ns("2024-01-02 14:31:05"), 12.0, 50)
+
+    assert [(s, tf) for s, tf, _ in bars] == [("SPY", "1Min"), ("QQQ", "1Min")]
+    spy = bars[0][2]
+    assert spy.timestamp == ns("2024-01-02 14:30")
+    assert (spy.open, spy.high, spy.low, spy.close, spy.volume, spy.trade_count) == (
+        10.0,
+        11.0,
+        9.0,
+        9.0,
+        400.0,
+        3,
+    )
+    assert spy.vwap == (10.0 * 100 + 11.0 * 100 + 9.0 * 200) / 400
+
+    partial = aggregator.partial_bar("SPY", "5Min")
+    assert partial.timestamp == ns("2024-01-02 14:30")
+    assert (partial.open, partial.high, partial.close, partial.volume) == (
+        10.0,
+        12.0,
+        12.0,
+        450.0,
+    )
+    assert aggregator.partial_bar("SPY", "1Min").close == 12.0
+
+
+def test_untracked_symbols_are_ignored():
+    aggregator = BarAggregator(timeframes=["1Min"])
+    aggregator.track("SPY", "1Min")
+
+    aggregator.add_trade("QQQ", ns("2024-01-02 14:30:01"), 400.0, 10)
+    aggregator.add_trade("SPY", ns("2024-01-02 14:30:02"), 10.0, 10)
+
+    assert aggregator.partial_bar("QQQ", "1Min") is None
+    assert aggregator.partial_bar("SPY", "1Min").close == 10.0
+
+
+def test_batch_ingestion_matches_trade_by_trade():
+    rng = np.random.default_rng(7)
+    n = 5000
+    symbols = rng.choice(["AAPL", "MSFT", "SPY", "TSLA"], size=n)
+    timestamps = np.sort(
+        ns("2024-01-02 14:30") + rng.integers(0, 3 * 3600 * 10**9, size=n)
+    )
+    prices = rng.uniform(90, 110, size=n).round(2)
+    sizes = rng.integers(1, 500, size=n).astype(float)
+
+    scalar = BarAggregator(track_all=True)
+    batched = BarAggregator(track_all=True)
+    scalar_bars, batched_bars = collect(scalar), collect(batched)
+    for args in zip(symbols, timestamps, prices, sizes):
+        scalar.add_trade(str(args[0]), int(args[1]), float(args[2]), float(args[3]))
+    batched.add_trades(list(symbols), timestamps, prices, sizes)
+    scalar.close_elapsed(ns("2024-01-03"))
+    batched.close_elapsed(ns("2024-01-03"))
+
+    key = lambda item: (item[1], item[2].timestamp, item[0])
+    assert len(scalar_bars) == len(batched_bars)
+    for (s1, tf1, b1), (s2, tf2, b2) in zip(
+        sorted(scalar_bars, key=key), sorted(batched_bars, key=key)
+    ):
+        assert (s1, tf1, b1.timestamp, b1.trade_count) == (
+            s2,
+            tf2,
+            b2.timestamp,
+            b2.trade_count,
+        )
+        np.testing.assert_allclose(b1[1:], b2[1:])
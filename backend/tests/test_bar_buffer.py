@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pandas as pd
+import pytest
+
+from app.core.bar_aggregator import Bar
+from app.core.bar_buffer import BarBuffer, BarBuffers
+from app.core.timeframes import bar_window
+
+
+def make_trade(symbol, ts, price, size=100):
+    return SimpleNamespace(
+        symbol=symbol, price=price, size=size, timestamp=pd.Timestamp(ts, tz="UTC")
+    )
+
+
+def seed_bars():
+    index = pd.date_range(
+        "2024-01-02 14:30", periods=3, freq="1min", tz="UTC", name="timestamp"
+    )
+    return pd.DataFrame(
+        {
+            "open": [10.0, 11.0, 12.0],
+            "high": [10.5, 11.5, 12.5],
+            "low": [9.5, 10.5, 11.5],
+            "close": [10.2, 11.2, 12.2],
+            "volume": [100.0, 200.0, 300.0],
+            "vwap": [10.1, 11.1, 12.1],
+        },
+        index=index,
+    )
+
+
+@pytest.mark.asyncio
+async def test_trades_update_current_bar_and_open_new_bars():
+    buffers = BarBuffers()
+    get_bars = AsyncMock(return_value=MagicMock(df=seed_bars()))
+    await buffers.ensure("SPY", "1Min", 3, get_bars)
+
+    buffers.on_trade(make_trade("SPY", "2024-01-02 14:32:30", 13.0, 50))
+    buffers.on_trade(make_trade("SPY", "2024-01-02 14:33:05", 12.0, 10))
+    buffers.on_trade(make_trade("SPY", "2024-01-02 14:33:40", 12.8, 10))
+    buffers.on_trade(make_trade("QQQ", "2024-01-02 14:33:40", 400.0, 10))
+
+    frame = await buffers.get_frame("SPY", "1Min", 3, get_bars)
+
+    get_bars.assert_awaited_once()
+    assert list(frame.index.strftime("%H:%M")) == ["14:31", "14:32", "14:33"]
+    assert frame.loc["2024-01-02 14:32", "high"].item() == 13.0
+    assert frame.loc["2024-01-02 14:32", "close"].item() == 13.0
+    assert frame.loc["2024-01-02 14:32", "volume"].item() == 350.0
+    last = frame.iloc[-1]
+    assert (last.open, last.high, last.low, last.close, last.volume) == (
+        12.0,
+        12.8,
+        12.0,
+        12.8,
+        20.0,
+    )
+
+
+def test_ring_buffer_keeps_most_recent_bars():
+    buffer = BarBuffer("1Min", capacity=3)
+    start = pd.Timestamp("2024-01-02 14:30", tz="UTC").value
+    for i in range(5):
+        price = 10.0 + i
+        buffer.commit(
+            Bar(start + i * 60 * 10**9, price, price, price, price, 1.0, 1, price)
+        )
+
+    frame = buffer.to_frame()
+
+    assert len(frame) == 3
+    assert list(frame["close"]) == [12.0, 13.0, 14.0]
+
+
+def test_partial_bar_is_appended_within_limit():
+    buffer = BarBuffer("1Min")
+    buffer.seed(seed_bars())
+    partial = Bar(
+        pd.Timestamp("2024-01-02 14:33", tz="UTC").value,
+        13.0,
+        13.5,
+        12.9,
+        13.2,
+        10.0,
+        2,
+        13.1,
+    )
+
+    frame = buffer.to_frame(2, partial=partial)
+
+    assert list(frame.index.strftime("%H:%M")) == ["14:32", "14:33"]
+    assert frame["close"].iloc[-1] == 13.2
+
+
+@pytest.mark.parametrize(
+    "trade, start, end",
+    [
+        ("2024-01-02 12:00", "2024-01-02", "2024-01-03"),
+        # Fall back: a 25-hour day
+        ("2024-11-03 12:00", "2024-11-03", "2024-11-04"),
+        # Spring forward: a 23-hour day
+        ("2024-03-10 12:00", "2024-03-10", "2024-03-11"),
+    ],
+)
+def test_daily_window_is_a_calendar_day_in_market_time(trade, start, end):
+    ts = pd.Timestamp(trade, tz="America/New_York").value
+
+    window = bar_window(ts, "1Day")
+
+    assert window == (
+        pd.Timestamp(start, tz="America/New_York").value,
+        pd.Timestamp(end, tz="America/New_York").value,
+    )
+    assert window[0] <= ts < window[1]
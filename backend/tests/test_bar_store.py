@@ -0,0 +1,186 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from app.core.bar_store import BarStore
+
+
+def make_bars(start, periods, freq="1min"):
+    index = pd.date_range(start, periods=periods, freq=freq, tz="UTC", name="timestamp")
+    close = pd.Series(range(periods), index=index, dtype=float) + 100
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": 1000.0,
+        },
+        index=index,
+    )
+
+
+@pytest.fixture
+def history():
+    return make_bars("2024-01-02 14:30", 120)
+
+
+@pytest.fixture
+def fetch(history):
+    calls = []
+
+    def _fetch(start=None, end=None, limit=None):
+        calls.append({"start": start, "end": end, "limit": limit})
+        bars = history
+        if start is not None:
+            bars = bars[bars.index >= pd.Timestamp(start)]
+        if end is not None:
+            bars = bars[bars.index <= pd.Timestamp(end)]
+        if limit is not None:
+            bars = bars.tail(limit)
+        return bars.copy()
+
+    _fetch.calls = calls
+    return _fetch
+
+
+def test_range_is_served_from_cache_after_first_fetch(tmp_path, fetch, history):
+    store = BarStore(str(tmp_path))
+    start, end = "2024-01-02T14:30:00+00:00", "2024-01-02T15:29:00+00:00"
+
+    first = store.get_bars("SPY", "1Min", fetch, start=start, end=end)
+    second = store.get_bars("SPY", "1Min", fetch, start=start, end=end)
+
+    assert len(fetch.calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    pd.testing.assert_frame_equal(first, history.iloc[:60], check_freq=False)
+
+
+def test_only_missing_range_is_fetched(tmp_path, fetch, history):
+    store = BarStore(str(tmp_path))
+    store.get_bars(
+        "SPY",
+        "1Min",
+        fetch,
+        start="2024-01-02T14:30:00+00:00",
+        end="2024-01-02T15:00:00+00:00",
+    )
+    bars = store.get_bars(
+        "SPY",
+        "1Min",
+        fetch,
+        start="2024-01-02T14:30:00+00:00",
+        end="2024-01-02T16:00:00+00:00",
+    )
+
+    assert len(fetch.calls) == 2
+    assert fetch.calls[1]["start"] == "2024-01-02T15:00:00+00:00"
+    pd.testing.assert_frame_equal(bars, history.iloc[:91], check_freq=False)
+
+
+def test_cache_is_persisted_to_disk(tmp_path, fetch, history):
+    start, end = "2024-01-02T14:30:00+00:00", "2024-01-02T15:29:00+00:00"
+    BarStore(str(tmp_path)).get_bars("SPY", "1Min", fetch, start=start, end=end)
+
+    bars = BarStore(str(tmp_path)).get_bars("SPY", "1Min", fetch, start=start, end=end)
+
+    assert len(fetch.calls) == 1
+    pd.testing.assert_frame_equal(bars, history.iloc[:60], check_freq=False)
+
+
+def test_limit_request_refreshes_tail_only_after_interval(tmp_path, fetch, history):
+    store = BarStore(str(tmp_path), refresh_interval=60)
+    store.get_bars("SPY", "1Min", fetch, limit=30)
+    bars = store.get_bars("SPY", "1Min", fetch, limit=30)
+
+    assert len(fetch.calls) == 1
+    pd.testing.assert_frame_equal(bars, history.tail(30), check_freq=False)
+
+    store.refresh_interval = 0
+    store.get_bars("SPY", "1Min", fetch, limit=30)
+
+    assert len(fetch.calls) == 2
+    assert fetch.calls[1]["start"] == history.index[-1].isoformat()
+    assert fetch.calls[1]["end"] is None
+
+
+def test_larger_limit_request_backfills_the_head(tmp_path):
+    # Bars up to now, so the limit-only requests below end inside the history
+    history = make_bars(
+        pd.Timestamp.now(tz="UTC").floor("min") - pd.Timedelta(minutes=119), 120
+    )
+    calls = []
+
+    def fetch(start=None, end=None, limit=None):
+        calls.append({"start": start, "end": end, "limit": limit})
+        bars = history
+        if start is not None:
+            bars = bars[bars.index >= pd.Timestamp(start)]
+        if end is not None:
+            bars = bars[bars.index <= pd.Timestamp(end)]
+        if limit is not None:
+            bars = bars.tail(limit)
+        return bars.copy()
+
+    store = BarStore(str(tmp_path), refresh_interval=60)
+    store.get_bars("SPY", "1Min", fetch, limit=10)
+    bars = store.get_bars("SPY", "1Min", fetch, limit=60)
+
+    assert len(calls) == 2
+    assert calls[1]["end"] == history.index[-10].isoformat()
+    pd.testing.assert_frame_equal(bars, history.tail(60), check_freq=False)
+
+    # The head is covered now, so the same request is answered from the cache
+    store.get_bars("SPY", "1Min", fetch, limit=60)
+    assert len(calls) == 2
+
+
+def test_reads_do_not_wait_for_a_cache_write(tmp_path, fetch, history):
+    store = BarStore(str(tmp_path))
+    start, end = "2024-01-02T14:30:00+00:00", "2024-01-02T15:29:00+00:00"
+    store.get_bars("SPY", "1Min", fetch, start=start, end=end)
+    store.get_bars("QQQ", "1Min", fetch, start=start, end=end)
+
+    saving, release = threading.Event(), threading.Event()
+    save = store._save
+
+    def slow_save(*args):
+        saving.set()
+        release.wait(5)
+        save(*args)
+
+    store._save = slow_save
+    writer = threading.Thread(
+        target=store.merge, args=("SPY", "1Min", history.iloc[60:], {"start": end})
+    )
+    writer.start()
+    try:
+        assert saving.wait(5)
+        # Both series are readable while SPY's file is being rewritten
+        assert len(store.read("QQQ", "1Min")) == 60
+        assert len(store.read("SPY", "1Min")) == 120
+        assert store.missing_ranges("QQQ", "1Min", start=start, end=end) == []
+        assert writer.is_alive()
+    finally:
+        release.set()
+        writer.join()
+
+
+def test_least_recently_used_series_leave_memory(tmp_path, fetch, history):
+    store = BarStore(str(tmp_path), max_series=2)
+    start, end = "2024-01-02T14:30:00+00:00", "2024-01-02T15:29:00+00:00"
+    for symbol in ("SPY", "QQQ"):
+        store.get_bars(symbol, "1Min", fetch, start=start, end=end)
+    store.read("SPY", "1Min")
+    store.get_bars("IWM", "1Min", fetch, start=start, end=end)
+
+    assert [store.cached(s, "1Min") for s in ("SPY", "QQQ", "IWM")] == [
+        True,
+        False,
+        True,
+    ]
+    # Dropped series are reloaded from disk
+    bars = store.get_bars("QQQ", "1Min", fetch, start=start, end=end)
+    assert len(fetch.calls) == 3
+    pd.testing.assert_frame_equal(bars, history.iloc[:60], check_freq=False)
@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+
+
+class AlwaysLong:
+    def __init__(self, *services, symbol=None, **params):
+        self.symbol = symbol
+
+    def generate_signals(self, bars):
+        bars["signal"] = 0
+        bars.iloc[0, bars.columns.get_loc("signal")] = 1
+        return bars
+
+
+class InlineExecutors:
+    """Runs pool jobs in the test process, still going through shared memory."""
+
+    def __init__(self):
+        self.jobs = 0
+
+    async def run_io(self, fn, *args):
+        return fn(*args)
+
+    async def run_on_shared(self, fn, shared, *args, **kwargs):
+        from app.core.executors import SharedBars
+
+        self.jobs += 1
+        return fn(SharedBars.read(shared.handle), *args, **kwargs)
+
+
+def make_bars(rows=30):
+    index = pd.date_range(
+        "2024-01-01", periods=rows, freq="D", tz="UTC", name="timestamp"
+    )
+    close = np.linspace(100, 129, rows)
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": 1000.0,
+        },
+        index=index,
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_streams_every_job_and_isolates_failures(monkeypatch):
+    from app.backtester import batch
+
+    inline = InlineExecutors()
+    monkeypatch.setattr(batch, "executors", inline)
+    monkeypatch.setattr(
+        batch, "_strategy_classes", lambda: {"always_long": {"class": AlwaysLong}}
+    )
+    alpaca_service = MagicMock()
+
+    def get_bars(symbol, timeframe, start=None, end=None):
+        if symbol == "NOPE":
+            raise HTTPException(status_code=500, detail="Error fetching bars")
+        return MagicMock(df=make_bars())
+
+    alpaca_service.get_bars.side_effect = get_bars
+
+    results = [
+        result
+        async for result in batch.run_batch(
+            alpaca_service,
+            ["SPY", "QQQ", "NOPE"],
+            ["always_long", "missing"],
+            "2024-01-01",
+            "2024-02-01",
+        )
+    ]
+
+    assert len(results) == 6
+    assert alpaca_service.get_bars.call_count == 3
+    assert inline.jobs == 4
+    by_job = {(r["symbol"], r["strategy_name"]): r for r in results}
+    assert by_job[("SPY", "always_long")]["total_trades"] == 1
+    assert by_job[("SPY", "always_long")]["net_profit"] > 0
+    assert "trades" not in by_job[("SPY", "always_long")]
+    assert "not found" in by_job[("QQQ", "missing")]["error"]
+    assert by_job[("NOPE", "always_long")]["error"] == "Error fetching bars"
@@ -0,0 +1,99 @@
+import logging
+import sys
+from types import SimpleNamespace
+
+import pytest
+from benchmarks import runner
+from benchmarks.data import FakeUniverseService, synthetic_bars
+
+
+def test_run_times_skips_and_records_errors():
+    calls = []
+
+    def failing(bars):
+        raise ValueError("no data")
+
+    benchmarks = [
+        runner.Benchmark(
+            "fast.sum", lambda bars: lambda: calls.append(bars["close"].sum())
+        ),
+        runner.Benchmark("slow.loop", lambda bars: lambda: None, max_rows=100),
+        runner.Benchmark("broken", failing),
+    ]
+
+    report = runner.run(
+        benchmarks, [50, 500], synthetic_bars, patterns=["fast.*", "slow.*", "broken"]
+    )
+    results = report["results"]
+
+    assert results["fast.sum[500]"]["best"] > 0 and calls
+    assert results["slow.loop[50]"]["rounds"] >= 1
+    assert "skipped" in results["slow.loop[500]"]
+    assert results["broken[50]"]["error"] == "no data"
+    assert set(report["meta"]) >= {"python", "pandas", "created"}
+
+
+def test_compare_flags_slowdowns_beyond_tolerance_and_noise():
+    baseline = {
+        "results": {
+            "a[1]": {"best": 1.0},
+            "b[1]": {"best": 1.0},
+            "c[1]": {"best": 0.0001},
+            "f[1]": {"best": 1.0},
+        }
+    }
+    current = {
+        "results": {
+            "a[1]": {"best": 1.3},
+            "b[1]": {"best": 0.5},
+            "c[1]": {"best": 0.0005},
+            "d[1]": {"best": 2.0},
+            "e[1]": {"error": "boom"},
+            "f[1]": {"error": "boom"},
+        }
+    }
+
+    rows = {
+        row["name"]: row for row in runner.compare(baseline, current, tolerance=0.25)
+    }
+
+    assert rows["a[1]"]["status"] == "regressed" and rows["a[1]"][
+        "ratio"
+    ] == pytest.approx(1.3)
+    assert rows["b[1]"]["status"] == "improved"
+    # Five times slower, but well under a millisecond
+    assert rows["c[1]"]["status"] == "unchanged"
+    assert rows["d[1]"]["status"] == "new"
+    assert "e[1]" not in rows
+    # Ran in the baseline, raises now
+    assert rows["f[1]"]["status"] == "failed" and rows["f[1]"]["current"] is None
+
+
+def test_main_fails_when_a_baseline_benchmark_now_raises(tmp_path, monkeypatch):
+    from benchmarks.__main__ import main
+
+    def broken(bars):
+        raise ValueError("no data")
+
+    baseline = tmp_path / "baseline.json"
+    runner.save({"meta": {}, "results": {"case[50]": {"best": 0.01}}}, str(baseline))
+    cases = SimpleNamespace(all_benchmarks=lambda: [runner.Benchmark("case", broken)])
+    monkeypatch.setitem(sys.modules, "benchmarks.cases", cases)
+    monkeypatch.setattr(
+        sys, "argv", ["benchmarks", "--sizes", "50", "--compare", str(baseline)]
+    )
+
+    try:
+        assert main() == 1
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def test_fake_universe_serves_thirty_sessions_per_symbol():
+    service = FakeUniverseService(3000)
+
+    bars = service.get_multi_bars(service.symbols[:2], "1Day")
+
+    assert len(service.symbols) == 100
+    assert [len(b) for b in bars.values()] == [30, 30]
+    assert (bars["S000001"]["high"] >= bars["S000001"]["close"]).all()
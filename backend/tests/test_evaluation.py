@@ -0,0 +1,113 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.evaluation import BAR_CLOSE, EVERY_TRADE, THROTTLE, EvaluationGate
+
+
+def make_trade(price):
+    return SimpleNamespace(symbol="SPY", price=price)
+
+
+def recorder():
+    evaluated = []
+
+    async def evaluate(trade):
+        evaluated.append(trade.price)
+
+    return evaluated, evaluate
+
+
+@pytest.mark.asyncio
+async def test_every_trade_evaluates_each_print():
+    evaluated, evaluate = recorder()
+    gate = EvaluationGate(evaluate, EVERY_TRADE)
+
+    for price in (1, 2, 3):
+        await gate.on_trade(make_trade(price))
+
+    assert evaluated == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_throttle_coalesces_to_latest_trade():
+    evaluated, evaluate = recorder()
+    gate = EvaluationGate(evaluate, THROTTLE, max_per_second=20)
+
+    for price in range(1, 11):
+        await gate.on_trade(make_trade(price))
+    await asyncio.sleep(0.01)
+    for price in range(11, 21):
+        await gate.on_trade(make_trade(price))
+    await gate._task
+
+    assert evaluated == [10, 20]
+    assert gate.stats() == {
+        "policy": THROTTLE,
+        "trades": 20,
+        "evaluations": 2,
+        "timeouts": 0,
+        "errors": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_bar_close_evaluates_once_per_bar():
+    evaluated, evaluate = recorder()
+    gate = EvaluationGate(evaluate, BAR_CLOSE)
+
+    for price in (1, 2, 3):
+        await gate.on_trade(make_trade(price))
+    assert gate._task is None
+
+    gate.on_bar_close()
+    await gate.on_trade(make_trade(4))
+    await gate._task
+
+    assert evaluated == [4]
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        EvaluationGate(recorder()[1], "sometimes")
+
+
+@pytest.mark.asyncio
+async def test_slow_and_failing_evaluations_are_isolated():
+    async def slow(trade):
+        await asyncio.sleep(1)
+
+    async def failing(trade):
+        raise RuntimeError("boom")
+
+    slow_gate = EvaluationGate(slow, EVERY_TRADE, timeout=0.01)
+    failing_gate = EvaluationGate(failing, EVERY_TRADE)
+
+    await asyncio.gather(
+        slow_gate.on_trade(make_trade(1)), failing_gate.on_trade(make_trade(1))
+    )
+
+    assert slow_gate.stats()["timeouts"] == 1
+    assert failing_gate.stats()["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_semaphore_caps_concurrent_evaluations():
+    running = 0
+    peak = 0
+
+    async def evaluate(trade):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    semaphore = asyncio.Semaphore(2)
+    gates = [
+        EvaluationGate(evaluate, EVERY_TRADE, semaphore=semaphore) for _ in range(6)
+    ]
+    await asyncio.gather(*(gate.on_trade(make_trade(1)) for gate in gates))
+
+    assert peak == 2
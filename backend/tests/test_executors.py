@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.executors import Executors, SharedBars
+
+
+def close_range(bars, scale):
+    return float(bars["close"].max() - bars["close"].min()) * scale
+
+
+def make_bars(rows=50):
+    index = pd.date_range(
+        "2024-01-01", periods=rows, freq="D", tz="UTC", name="timestamp"
+    )
+    close = np.linspace(100, 149, rows)
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": 1000.0,
+        },
+        index=index,
+    )
+
+
+def test_shared_bars_round_trip():
+    bars = make_bars()
+
+    with SharedBars(bars) as shared:
+        restored = SharedBars.read(shared.handle)
+
+    pd.testing.assert_frame_equal(restored, bars, check_freq=False)
+
+
+@pytest.mark.asyncio
+async def test_run_on_bars_uses_worker_process():
+    executors = Executors(cpu_workers=1, io_workers=1)
+    try:
+        result = await executors.run_on_bars(close_range, make_bars(), 2)
+        io_result = await executors.run_io(sum, [1, 2, 3])
+    finally:
+        executors.shutdown()
+
+    assert result == 98.0
+    assert io_result == 6
@@ -0,0 +1,161 @@
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.bar_aggregator import Bar
+from app.core.bar_buffer import BarBuffer
+from app.ml import features
+
+
+def make_bars(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    index = pd.date_range(
+        "2024-01-02 14:30", periods=n, freq="1min", tz="UTC", name="timestamp"
+    )
+    return pd.DataFrame(
+        {
+            "open": np.concatenate([[100.0], close[:-1]]),
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": rng.integers(100, 1000, n).astype(float),
+        },
+        index=index,
+    )
+
+
+def buffered(bars):
+    buffer = BarBuffer("1Min", capacity=500)
+    for timestamp, row in zip(bars.index.asi8, bars.itertuples(index=False)):
+        buffer.commit(
+            Bar(
+                timestamp,
+                row.open,
+                row.high,
+                row.low,
+                row.close,
+                row.volume,
+                1,
+                row.close,
+            )
+        )
+    return buffer
+
+
+def counting_ta():
+    """A pandas-ta stand-in whose outputs tell their columns apart, counting calls per indicator."""
+    calls = Counter()
+
+    def indicator(name, width):
+        def compute(*series, **kwargs):
+            calls[name] += 1
+            close = series[-1] if name in ("stoch", "atr") else series[0]
+            return pd.DataFrame({f"{name}{i}": close + i for i in range(width)})
+
+        return compute
+
+    ta = SimpleNamespace(
+        rsi=indicator("rsi", 1),
+        macd=indicator("macd", 3),
+        stoch=indicator("stoch", 2),
+        bbands=indicator("bbands", 5),
+        atr=indicator("atr", 1),
+        sma=indicator("sma", 1),
+        ema=indicator("ema", 1),
+    )
+    return ta, calls
+
+
+def test_each_indicator_is_computed_once(monkeypatch):
+    ta, calls = counting_ta()
+    monkeypatch.setattr(features, "_pandas_ta", lambda: ta)
+    bars = make_bars(50)
+
+    frame = features.prepare_features(bars)
+
+    assert list(frame.columns) == [
+        "rsi",
+        "macd",
+        "macds",
+        "macdh",
+        "stoch_k",
+        "stoch_d",
+        "bb_upper",
+        "bb_mid",
+        "bb_lower",
+        "atr",
+        "sma20",
+        "sma50",
+        "ema20",
+        "ema50",
+    ]
+    assert calls == {
+        "rsi": 1,
+        "macd": 1,
+        "stoch": 1,
+        "bbands": 1,
+        "atr": 1,
+        "sma": 2,
+        "ema": 2,
+    }
+    # Columns are picked from the indicator's output by position
+    assert (frame["macdh"] == bars["close"] + 2).all()
+    assert (frame["bb_lower"] == bars["close"] + 2).all()
+
+
+def test_latest_features_match_the_last_prepared_row(monkeypatch):
+    monkeypatch.setattr(features, "_pandas_ta", lambda: None)
+    bars = make_bars()
+    buffer = buffered(bars)
+
+    feed = features.feature_feed().sync(buffer)
+    latest = features.latest_features(feed)
+
+    expected = features.prepare_features(buffer.to_frame())
+    assert (
+        list(latest.columns)
+        == list(expected.columns)
+        == ["sma_5", "sma_10", "sma_20", "sma_50"]
+    )
+    np.testing.assert_allclose(latest.iloc[0], expected.iloc[-1], rtol=1e-9)
+
+    # Too few bars for the slowest feature yet
+    assert (
+        features.latest_features(features.feature_feed().sync(buffered(bars.iloc[:30])))
+        is None
+    )
+
+
+def test_latest_features_match_pandas_ta():
+    pytest.importorskip("pandas_ta")
+    buffer = buffered(make_bars())
+
+    latest = features.latest_features(features.feature_feed().sync(buffer))
+
+    expected = features.prepare_features(buffer.to_frame())
+    assert list(latest.columns) == list(expected.columns)
+    np.testing.assert_allclose(latest.iloc[0], expected.iloc[-1], rtol=1e-9)
+
+
+def test_feature_cache_is_keyed_by_the_bars_range(monkeypatch):
+    computed = []
+    monkeypatch.setattr(
+        features,
+        "prepare_features",
+        lambda bars: computed.append(len(bars)) or bars[["close"]],
+    )
+    cache = features.FeatureCache(max_entries=2)
+    bars = make_bars(100)
+
+    first = cache.get("SPY", "1Min", bars)
+    assert cache.get("SPY", "1Min", bars.copy()) is first
+    cache.get("SPY", "1Min", make_bars(101))
+    cache.get("QQQ", "1Min", bars)
+    cache.get("SPY", "1Min", bars)
+
+    assert computed == [100, 101, 100, 100]
+    assert (cache.hits, cache.misses) == (1, 4)
@@ -0,0 +1,277 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.bar_aggregator import Bar
+from app.core.bar_buffer import BarBuffer
+from app.indicators.cache import IndicatorCache
+from app.indicators.feed import IndicatorFeed
+from app.indicators.momentum import MACD, RSI, AwesomeOscillator, Stochastic
+from app.indicators.moving_averages import EMA, RMA, SMA
+from app.indicators.trend import Ichimoku
+from app.indicators.volatility import ATR, BollingerBands, RollingStd
+
+
+def make_bars(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = pd.Series(100 + rng.standard_normal(n).cumsum())
+    return pd.DataFrame(
+        {
+            "open": close.shift(fill_value=100.0),
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": rng.integers(100, 1000, n).astype(float),
+        }
+    )
+
+
+def run(indicator, bars):
+    """Feeds ``bars`` one at a time, returning the updated and the peeked values."""
+    updated, peeked = [], []
+    for row in bars[list(indicator.inputs)].itertuples(index=False):
+        peeked.append(indicator.peek(*row))
+        updated.append(indicator.update(*row))
+    return updated, peeked
+
+
+def assert_matches(values, expected):
+    np.testing.assert_allclose(
+        np.asarray(values, dtype=float),
+        np.asarray(expected, dtype=float),
+        rtol=1e-9,
+        equal_nan=True,
+    )
+
+
+def seeded_ema(series, length):
+    """``ta.ema``: the SMA of the first ``length`` values, then a recursive EMA."""
+    start = series.first_valid_index()
+    values = series.loc[start:].copy()
+    seed = values.iloc[:length].mean()
+    values.iloc[: length - 1] = np.nan
+    values.iloc[length - 1] = seed
+    ema = values.ewm(span=length, adjust=False).mean()
+    ema.iloc[: length - 1] = np.nan
+    return ema.reindex(series.index)
+
+
+def true_range(bars):
+    previous = bars["close"].shift()
+    ranges = pd.concat(
+        [
+            bars["high"] - bars["low"],
+            (bars["high"] - previous).abs(),
+            (previous - bars["low"]).abs(),
+        ],
+        axis=1,
+    )
+    return ranges.max(axis=1)
+
+
+def midprice(bars, length):
+    return 0.5 * (
+        bars["low"].rolling(length).min() + bars["high"].rolling(length).max()
+    )
+
+
+@pytest.mark.parametrize(
+    "indicator, reference",
+    [
+        (SMA(10), lambda b: b["close"].rolling(10).mean()),
+        (EMA(10), lambda b: seeded_ema(b["close"], 10)),
+        (RMA(14), lambda b: b["close"].ewm(alpha=1 / 14, min_periods=14).mean()),
+        (RollingStd(20), lambda b: b["close"].rolling(20).std()),
+        (
+            AwesomeOscillator(),
+            lambda b: midprice(b, 1).rolling(5).mean()
+            - midprice(b, 1).rolling(34).mean(),
+        ),
+        (
+            ATR(14),
+            lambda b: true_range(b)
+            .where(b.index > 0)
+            .ewm(alpha=1 / 14, min_periods=14)
+            .mean(),
+        ),
+        (
+            ATR(14, mamode="sma", include_first_range=True),
+            lambda b: true_range(b).rolling(14).mean(),
+        ),
+    ],
+)
+def test_scalar_indicators_match_pandas(indicator, reference):
+    bars = make_bars()
+    updated, peeked = run(indicator, bars)
+
+    assert_matches(updated, reference(bars))
+    assert_matches(peeked, reference(bars))
+
+
+def test_rsi_matches_wilder_smoothing():
+    bars = make_bars()
+    change = bars["close"].diff()
+    gains = change.clip(lower=0).ewm(alpha=1 / 14, min_periods=14).mean()
+    losses = change.clip(upper=0).ewm(alpha=1 / 14, min_periods=14).mean()
+
+    updated, peeked = run(RSI(14), bars)
+
+    assert_matches(updated, 100 * gains / (gains + losses.abs()))
+    assert_matches(peeked, 100 * gains / (gains + losses.abs()))
+
+
+def test_macd_signal_starts_at_first_macd_value():
+    bars = make_bars()
+    macd = seeded_ema(bars["close"], 12) - seeded_ema(bars["close"], 26)
+    signal = seeded_ema(macd, 9)
+
+    updated, peeked = run(MACD(12, 26, 9), bars)
+
+    assert_matches([v.macd for v in updated], macd)
+    assert_matches([v.signal for v in updated], signal)
+    assert_matches([v.histogram for v in peeked], macd - signal)
+
+
+def test_band_and_range_indicators():
+    bars = make_bars()
+    close = bars["close"]
+    mid, deviation = close.rolling(5).mean(), close.rolling(5).std(ddof=0)
+    highest, lowest = bars["high"].rolling(14).max(), bars["low"].rolling(14).min()
+    raw = 100 * (close - lowest) / (highest - lowest)
+    k = raw.dropna().rolling(3).mean().reindex(bars.index)
+    d = k.dropna().rolling(3).mean().reindex(bars.index)
+
+    bands, _ = run(BollingerBands(5, 2.0), bars)
+    _, stochastic = run(Stochastic(14, 3, 3), bars)
+    cloud, peeked_cloud = run(Ichimoku(9, 26, 52), bars)
+
+    assert_matches([v.lower for v in bands], mid - 2 * deviation)
+    assert_matches(
+        [v.percent for v in bands], (close - mid + 2 * deviation) / (4 * deviation)
+    )
+    assert_matches([v.k for v in stochastic], k)
+    assert_matches([v.d for v in stochastic], d)
+    span_a = (0.5 * (midprice(bars, 9) + midprice(bars, 26))).shift(25)
+    assert_matches([v.span_a for v in cloud], span_a)
+    assert_matches([v.span_b for v in peeked_cloud], midprice(bars, 52).shift(25))
+
+
+def test_constant_window_has_zero_deviation():
+    updated, _ = run(RollingStd(5), pd.DataFrame({"close": [1.1] * 3 + [2.3] * 6}))
+
+    assert updated[-1] == 0.0
+
+
+def test_matches_pandas_ta():
+    ta = pytest.importorskip("pandas_ta")
+    bars = make_bars()
+
+    rsi, _ = run(RSI(14), bars)
+    macd, _ = run(MACD(12, 26, 9), bars)
+    stochastic, _ = run(Stochastic(14, 3, 3), bars)
+
+    assert_matches(rsi, ta.rsi(bars["close"], length=14))
+    assert_matches(
+        [v.signal for v in macd], ta.macd(bars["close"], 12, 26, 9).iloc[:, 2]
+    )
+    expected = ta.stoch(bars["high"], bars["low"], bars["close"], k=14, d=3)
+    assert_matches([v.k for v in stochastic][-len(expected) :], expected.iloc[:, 0])
+
+
+def buffer_bars(n):
+    start = pd.Timestamp("2024-01-02 14:30", tz="UTC").value
+    rows = make_bars(n).itertuples(index=False)
+    return [
+        Bar(
+            start + i * 60 * 10**9,
+            row.open,
+            row.high,
+            row.low,
+            row.close,
+            row.volume,
+            1,
+            row.close,
+        )
+        for i, row in enumerate(rows)
+    ]
+
+
+def test_feed_folds_final_bars_and_peeks_forming_bar():
+    bars = buffer_bars(60)
+    buffer = BarBuffer("1Min", capacity=100)
+    feed = IndicatorFeed(fast=SMA(5), rsi=RSI(14))
+
+    for bar in bars[:-1]:
+        buffer.commit(bar)
+    partial = bars[-1]._replace(close=bars[-1].close + 1, high=bars[-1].high + 1)
+    feed.sync(buffer, partial)
+
+    frame = buffer.to_frame(partial=partial)
+    assert feed.bars == 60
+    assert feed.close == frame["close"].iloc[-1]
+    assert feed.current["fast"] == pytest.approx(
+        frame["close"].rolling(5).mean().iloc[-1]
+    )
+    assert feed.previous["fast"] == pytest.approx(
+        frame["close"].rolling(5).mean().iloc[-2]
+    )
+
+    # Same bar still forming: nothing new is folded
+    value = feed.indicators["fast"].value
+    feed.sync(buffer, partial._replace(close=partial.close + 1))
+    assert feed.indicators["fast"].value == value
+    assert feed.current["fast"] == pytest.approx(
+        value + (1 + partial.close - bars[-6].close) / 5
+    )
+
+
+def test_feed_restarts_when_buffer_is_reseeded_or_overrun():
+    bars = buffer_bars(30)
+    buffer = BarBuffer("1Min", capacity=10)
+    feed = IndicatorFeed(fast=SMA(3))
+
+    for bar in bars[:12]:
+        buffer.commit(bar)
+    feed.sync(buffer)
+    for bar in bars[12:]:
+        buffer.commit(bar)
+    feed.sync(buffer)
+
+    expected = buffer.to_frame()["close"].rolling(3).mean()
+    assert feed.current["fast"] == pytest.approx(expected.iloc[-1])
+    assert feed.previous["fast"] == pytest.approx(expected.iloc[-2])
+
+    buffer.seed(buffer.to_frame().iloc[:4])
+    feed.sync(buffer)
+    assert feed.bars == 4
+
+
+def test_cache_shares_values_between_feeds():
+    bars = buffer_bars(40)
+    buffer = BarBuffer("1Min", capacity=100)
+    for bar in bars[:-1]:
+        buffer.commit(bar)
+    cache = IndicatorCache()
+    crossover = IndicatorFeed(fast=SMA(5), slow=SMA(20))
+    reversion = IndicatorFeed(sma=SMA(length=20), std_dev=RollingStd(20))
+    uncached = IndicatorFeed(slow=SMA(20))
+
+    crossover.sync(buffer, bars[-1], cache, "SPY")
+    reversion.sync(buffer, bars[-1], cache, "SPY")
+    uncached.sync(buffer, bars[-1])
+
+    assert cache.stats()["misses"] == 3
+    assert cache.stats()["hits"] == 1
+    assert (
+        reversion.current["sma"]
+        == crossover.current["slow"]
+        == uncached.current["slow"]
+    )
+    assert reversion.previous["sma"] == uncached.previous["slow"]
+
+    buffer.commit(bars[-1])
+    crossover.sync(buffer, None, cache, "SPY")
+    assert cache.stats()["misses"] == 5
+
+    cache.discard("SPY")
+    assert cache.stats()["values"] == cache.stats()["states"] == 0
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml.labeling import barrier_labels
+
+
+def loop_labels(close, atr, look_forward, risk_reward_ratio):
+    """The per-bar loop ``AIStrategy._prepare_labels`` used to run."""
+    labels = pd.Series(0, index=close.index)
+    for i in range(len(close) - look_forward):
+        entry_price = close.iloc[i]
+        atr_value = atr.iloc[i]
+        if pd.isna(atr_value) or atr_value == 0:
+            continue
+        future_prices = close.iloc[i + 1 : i + 1 + look_forward]
+        hit_tp = (future_prices >= entry_price + (atr_value * risk_reward_ratio)).any()
+        hit_sl = (future_prices <= entry_price - atr_value).any()
+        if hit_tp and not hit_sl:
+            labels.iloc[i] = 1
+    return labels
+
+
+def make_bars(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(n) * 0.01))
+    index = pd.date_range("2024-01-02", periods=n, freq="1min", tz="UTC")
+    return pd.DataFrame(
+        {"high": close * 1.004, "low": close * 0.996, "close": close}, index=index
+    )
+
+
+@pytest.mark.parametrize(
+    "look_forward, risk_reward_ratio", [(5, 2.0), (1, 0.5), (20, 1.5)]
+)
+def test_labels_match_the_per_bar_loop(look_forward, risk_reward_ratio):
+    from app.strategies.ai_strategy import AIStrategy
+
+    bars = make_bars(2000)
+    # Prices repeating exactly on a barrier, a gap in the data and a flat stretch (zero ATR)
+    bars.iloc[100:110, bars.columns.get_loc("close")] = bars["close"].iloc[100]
+    bars.iloc[500, bars.columns.get_loc("close")] = np.nan
+    bars.iloc[300:330] = bars["close"].iloc[300]
+    strategy = AIStrategy(None, None, None, None, None, None)
+    atr = strategy._calculate_atr(bars)
+    assert (atr.iloc[320:330] == 0).all()
+
+    labels = strategy._prepare_labels(bars, look_forward, risk_reward_ratio)
+
+    expected = loop_labels(bars["close"], atr, look_forward, risk_reward_ratio)
+    pd.testing.assert_series_equal(labels, expected)
+    assert labels.sum() > 0
+
+
+def test_first_touch_counts_the_take_profit_only_when_reached_first():
+    close = pd.Series([100.0, 103.0, 98.0, 100.0, 97.0, 100.0, 100.0])
+    width = pd.Series(1.0, index=close.index)
+
+    any_touch = barrier_labels(close, width, take_profit=2, stop_loss=1, time_limit=3)
+    first_touch = barrier_labels(
+        close, width, take_profit=2, stop_loss=1, time_limit=3, first_touch=True
+    )
+
+    # Bar 0 reaches 103 before 98, bar 2 reaches 100 before 97: losses when any stop-loss touch counts
+    assert any_touch.tolist() == [0, 0, 0, 0, 0, 0, 0]
+    assert first_touch.tolist() == [1, 0, 1, 0, 0, 0, 0]
+
+
+def test_short_series_and_invalid_time_limit():
+    close = pd.Series([1.0, 2.0])
+
+    assert barrier_labels(close, close, time_limit=5).tolist() == [0, 0]
+    with pytest.raises(ValueError):
+        barrier_labels(close, close, time_limit=0)
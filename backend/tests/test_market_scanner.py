@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+
+def make_bars(close, volume=1_000_000, spread=0.05):
+    close = np.asarray(close, dtype=float)
+    index = pd.date_range(
+        "2024-01-02", periods=len(close), freq="B", tz="UTC", name="timestamp"
+    )
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close * (1 + spread),
+            "low": close * (1 - spread),
+            "close": close,
+            "volume": float(volume),
+        },
+        index=index,
+    )
+
+
+def legacy_scan(bars, min_price=10, min_avg_volume=1000000, atr_threshold=0.03):
+    """The original per-symbol filter, used as the reference."""
+    if len(bars) < 30:
+        return None
+    last_price = bars["close"].iloc[-1]
+    avg_volume = (bars["volume"] * bars["close"]).mean()
+    high_low = bars["high"] - bars["low"]
+    high_close = abs(bars["high"] - bars["close"].shift())
+    low_close = abs(bars["low"] - bars["close"].shift())
+    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+    atr_pct = tr.rolling(window=14).mean().iloc[-1] / last_price
+    sma_20 = bars["close"].rolling(window=20).mean().iloc[-1]
+    if last_price < min_price or avg_volume < min_avg_volume:
+        return None
+    if atr_pct < atr_threshold or last_price < sma_20:
+        return None
+    return {
+        "symbol": None,
+        "price": last_price,
+        "avg_volume": avg_volume,
+        "atr_pct": atr_pct,
+    }
+
+
+def test_scan_matches_per_symbol_filters():
+    from app.services.market_scanner import MarketScanner
+
+    rng = np.random.default_rng(3)
+    universe = {
+        "UPTREND": make_bars(np.linspace(20, 40, 35)),
+        "DOWNTREND": make_bars(np.linspace(40, 20, 35)),
+        "PENNY": make_bars(np.linspace(2, 4, 35)),
+        "ILLIQUID": make_bars(np.linspace(20, 40, 35), volume=100),
+        "CALM": make_bars(np.linspace(20, 40, 35), spread=0.001),
+        "SHORT": make_bars(np.linspace(20, 40, 10)),
+        "RANDOM": make_bars(30 + rng.normal(0, 1, 35).cumsum()),
+    }
+    alpaca_service = MagicMock()
+    alpaca_service.get_multi_bars.return_value = universe
+
+    results = MarketScanner(alpaca_service).scan(list(universe))
+
+    expected = {}
+    for symbol, bars in universe.items():
+        legacy = legacy_scan(bars.tail(30))
+        if legacy:
+            expected[symbol] = legacy
+    assert {r["symbol"] for r in results} == set(expected)
+    assert "UPTREND" in expected
+    for result in results:
+        reference = expected[result["symbol"]]
+        assert np.isclose(result["price"], reference["price"])
+        assert np.isclose(result["avg_volume"], reference["avg_volume"])
+        assert np.isclose(result["atr_pct"], reference["atr_pct"])
+    alpaca_service.get_multi_bars.assert_called_once()
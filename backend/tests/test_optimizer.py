@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+class SmaCrossoverLike:
+    """Mirrors SmaCrossover.generate_signals without pandas-ta."""
+
+    def __init__(
+        self, *services, symbol=None, fast_period=10, slow_period=30, **kwargs
+    ):
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+
+    def generate_signals(self, bars):
+        fast = bars["close"].rolling(self.fast_period).mean()
+        slow = bars["close"].rolling(self.slow_period).mean()
+        bars["signal"] = 0
+        bars.loc[(fast > slow) & (fast.shift(1) < slow.shift(1)), "signal"] = 1
+        bars.loc[(fast < slow) & (fast.shift(1) > slow.shift(1)), "signal"] = -1
+        return bars
+
+
+def make_bars(n=600, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    index = pd.date_range("2020-01-01", periods=n, freq="B", tz="UTC", name="timestamp")
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + rng.random(n) * 2,
+            "low": close - rng.random(n) * 2,
+            "close": close,
+            "volume": 1000.0,
+        },
+        index=index,
+    )
+
+
+@pytest.fixture
+def optimizer(monkeypatch):
+    from app.backtester import optimizer
+
+    monkeypatch.setattr(optimizer, "get_strategy_class", lambda name: SmaCrossoverLike)
+    monkeypatch.setattr(
+        optimizer,
+        "build_strategy",
+        lambda name, symbol=None, params=None: SmaCrossoverLike(**params),
+    )
+    return optimizer
+
+
+def test_broadcast_grid_matches_per_combination_signals(optimizer):
+    bars = make_bars()
+    grid = {"fast_period": [3, 5, 10], "slow_period": [20, 40]}
+
+    broadcast = optimizer.optimize(bars, "sma_crossover", grid, top=100)
+    per_combination = optimizer.optimize(bars, "unknown_to_the_kernels", grid, top=100)
+
+    assert broadcast["combinations"] == 6
+    assert broadcast["results"] == per_combination["results"]
+    assert any(result["total_trades"] for result in broadcast["results"])
+
+
+def test_results_are_ranked_by_metric(optimizer):
+    bars = make_bars()
+    grid = {"fast_period": [3, 5, 10], "slow_period": [20, 40]}
+
+    by_return = optimizer.optimize(bars, "sma_crossover", grid, top=3)
+    by_drawdown = optimizer.optimize(
+        bars, "sma_crossover", grid, metric="max_drawdown_pct"
+    )
+
+    returns = [result["return_pct"] for result in by_return["results"]]
+    drawdowns = [result["max_drawdown_pct"] for result in by_drawdown["results"]]
+    assert len(returns) == 3 and returns == sorted(returns, reverse=True)
+    assert drawdowns == sorted(drawdowns)
+    with pytest.raises(ValueError):
+        optimizer.optimize(bars, "sma_crossover", grid, metric="luck")
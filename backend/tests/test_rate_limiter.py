@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app.services.rate_limiter import Priority, RateLimiter
+
+
+def test_low_priority_backs_off_before_bucket_is_empty():
+    limiter = RateLimiter(rate_per_minute=60, burst=10)
+
+    for _ in range(5):
+        limiter.acquire_sync(Priority.BACKGROUND)
+
+    # Background work has used up everything above its reserve...
+    with limiter._lock:
+        assert limiter._try_take(Priority.BACKGROUND) > 0
+    # ...while orders can still drain the bucket.
+    for _ in range(4):
+        limiter.acquire_sync(Priority.ORDER)
+    assert limiter.stats()["priorities"]["order"]["granted"] == 4
+
+
+@pytest.mark.asyncio
+async def test_waiting_orders_go_before_background_requests():
+    limiter = RateLimiter(rate_per_minute=600, burst=2, reserves={})
+    limiter.acquire_sync(Priority.ORDER)
+    limiter.acquire_sync(Priority.ORDER)
+    served = []
+
+    async def request(priority, name):
+        await limiter.acquire(priority)
+        served.append(name)
+
+    background = asyncio.create_task(request(Priority.BACKGROUND, "scan"))
+    await asyncio.sleep(0)
+    order = asyncio.create_task(request(Priority.ORDER, "order"))
+    await asyncio.gather(background, order)
+
+    assert served == ["order", "scan"]
+
+
+def test_rate_limit_feedback_empties_bucket():
+    limiter = RateLimiter(rate_per_minute=200)
+
+    limiter.observe(remaining=50)
+    assert limiter.stats()["tokens"] <= 51
+
+    limiter.penalize(retry_after=30)
+    stats = limiter.stats()
+    assert stats["throttled"] == 1
+    with limiter._lock:
+        assert limiter._try_take(Priority.ORDER) > 29
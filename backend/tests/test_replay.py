@@ -0,0 +1,174 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def trade(symbol, timestamp, price, size=10):
+    return SimpleNamespace(
+        symbol=symbol, price=price, size=size, _raw={"timestamp": timestamp}
+    )
+
+
+def make_bars(closes, start="2024-03-04 14:30", freq="1Min"):
+    closes = np.asarray(closes, dtype="float64")
+    index = pd.date_range(
+        start, periods=len(closes), freq=freq, tz="UTC", name="timestamp"
+    )
+    return pd.DataFrame(
+        {
+            "open": closes,
+            "high": closes + 0.5,
+            "low": closes - 0.5,
+            "close": closes,
+            "volume": 400.0,
+        },
+        index=index,
+    )
+
+
+@pytest.fixture
+def breakout_strategy(monkeypatch):
+    """Buys a bracket when the close is above its 3-bar SMA, through the same calls the live strategies make."""
+    from app.core.strategy_manager import StrategyManager
+    from app.indicators.feed import IndicatorFeed
+    from app.indicators.moving_averages import SMA
+    from app.strategies.base import BaseStrategy
+
+    class Breakout(BaseStrategy):
+        name = "breakout"
+
+        async def run(self, symbol, timeframe, db_session):
+            pass
+
+        async def run_on_trade(self, trade):
+            feed = await self.get_indicators(
+                trade.symbol, self.timeframe, 5, lambda: IndicatorFeed(sma=SMA(3))
+            )
+            try:
+                await self.alpaca_service.get_position_async(trade.symbol)
+                return
+            except Exception:
+                pass
+            if feed.close > feed.current["sma"] + 1:
+                account = await self.alpaca_service.get_account_info()
+                await self.alpaca_service.submit_order_async(
+                    symbol=trade.symbol,
+                    qty=int(float(account["buying_power"]) * 0.1 / feed.close),
+                    side="buy",
+                    type="market",
+                    time_in_force="gtc",
+                    order_class="bracket",
+                    take_profit={"limit_price": feed.close + 3},
+                    stop_loss={"stop_price": feed.close - 3},
+                )
+
+        def generate_signals(self, bars):
+            return bars
+
+    monkeypatch.setattr(
+        StrategyManager,
+        "_discover_strategies",
+        lambda self: {"breakout": {"class": Breakout}},
+    )
+    return Breakout
+
+
+def test_bracket_legs_cancel_each_other():
+    from app.services.simulated_alpaca import SimulatedAlpacaService
+
+    service = SimulatedAlpacaService(initial_capital=10000)
+    service.on_trade(trade("SPY", 1, 100.0))
+    order = service.submit_order(
+        "SPY",
+        "buy",
+        "market",
+        "gtc",
+        qty=10,
+        order_class="bracket",
+        take_profit={"limit_price": 105},
+        stop_loss={"stop_price": 98},
+    )
+    assert order.filled_avg_price == "100"
+    assert service.get_open_positions()[0]["take_profit_price"] == "105"
+
+    service.on_trade(trade("SPY", 2, 104.0))
+    service.on_trade(trade("SPY", 3, 106.0))
+    service.on_trade(trade("SPY", 4, 90.0))
+
+    take_profit, stop_loss = order.legs
+    assert (take_profit.status, take_profit.filled_avg_price) == ("filled", "105")
+    assert stop_loss.status == "canceled"
+    assert service.positions == {}
+    assert service.cash == pytest.approx(10050)
+
+
+def test_bars_are_served_up_to_the_replay_clock():
+    from app.core.timeframes import lookback_start
+    from app.services.simulated_alpaca import SimulatedAlpacaService
+
+    bars = make_bars(np.arange(100, 130))
+    service = SimulatedAlpacaService({"SPY": {"1Min": bars}})
+    service.on_trade(trade("SPY", bars.index[20].value + 30 * 10**9, 120.0))
+
+    # The live code asks for a lookback from the wall clock
+    seed = service.get_bars(
+        "SPY", "1Min", start=lookback_start("1Min", 5).isoformat()
+    ).df
+
+    assert seed.index[-1] == bars.index[19]
+    assert len(seed) == 20
+
+
+@pytest.mark.asyncio
+async def test_replay_runs_trades_through_run_on_trade(breakout_strategy):
+    from app.backtester.replay import replay_bars
+
+    bars = make_bars([100] * 10 + [103, 104, 105, 106, 107, 108] + [100] * 4)
+
+    results = await replay_bars("breakout", "SPY", bars, timeframe="1Min", warmup=10)
+
+    assert results["trades"] == 40
+    (evaluations,) = results["evaluations"]
+    assert evaluations["evaluations"] == 40 and evaluations["errors"] == 0
+    account = results["account"]
+    # Two take-profits re-entered on the way up, then the stop on the drop
+    assert (account["orders"], account["fills"], account["open_positions"]) == (3, 6, 0)
+    assert account["equity"] == account["cash"]
+    assert results["latency_us"]["p50"] > 0
+
+
+@pytest.mark.asyncio
+async def test_paced_replay_keeps_to_the_trades_schedule(breakout_strategy, tmp_path):
+    from app.backtester.replay import ReplayBacktester, trades_from_tape
+    from app.core.trade_tape import TradeTape, TradeTapeWriter
+    from app.services.simulated_alpaca import SimulatedAlpacaService
+
+    open_ns = pd.Timestamp("2024-03-04 09:30", tz="America/New_York").value
+    writer = TradeTapeWriter(str(tmp_path))
+    for i in range(200):
+        writer.write("SPY" if i % 2 else "QQQ", open_ns + i * 10**6, 100.0 + i % 7, 10)
+    writer.close()
+    trades = trades_from_tape(TradeTape(str(tmp_path)), "2024-03-04", symbols=["SPY"])
+    assert len(trades) == 100 and {t.symbol for t in trades} == {"SPY"}
+
+    replay = ReplayBacktester(SimulatedAlpacaService())
+    replay.add_strategy("breakout", "SPY", timeframe="1Min")
+    # 0.2s of trades at double speed
+    copy = TradeTapeWriter(str(tmp_path / "copy"))
+    results = await replay.run(trades, speed=2, tape=copy)
+    copy.close()
+
+    assert results["seconds"] >= 0.099
+    assert results["offered_trades_per_second"] == pytest.approx(1000, rel=0.02)
+    assert set(results["stage_latency_us"]) == {
+        "tape",
+        "fills",
+        "bars",
+        "strategies",
+        "handler",
+    }
+    assert results["delay_ms"]["p50"] < 50
+    assert results["loop_lag_ms"]["max"] >= 0
+    assert len(TradeTape(str(tmp_path / "copy")).records("2024-03-04")) == 100
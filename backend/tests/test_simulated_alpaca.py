@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+
+def trade(symbol, timestamp, price, size=10):
+    return SimpleNamespace(
+        symbol=symbol, price=price, size=size, _raw={"timestamp": timestamp}
+    )
+
+
+def test_limit_entry_activates_bracket_legs_once_filled():
+    from app.services.simulated_alpaca import FillModel, SimulatedAlpacaService
+
+    service = SimulatedAlpacaService(
+        initial_capital=10000, fill_model=FillModel(slippage_bps=10)
+    )
+    service.on_trade(trade("SPY", 1, 100.0))
+    order = service.submit_order(
+        "SPY",
+        "buy",
+        "limit",
+        "day",
+        qty=10,
+        limit_price=99,
+        order_class="bracket",
+        take_profit={"limit_price": 110},
+        stop_loss={"stop_price": 97},
+    )
+    service.on_trade(trade("SPY", 2, 99.5))
+    assert order._raw["status"] == "new" and service.positions == {}
+
+    service.on_trade(trade("SPY", 3, 98.0))
+    assert order._raw["filled_avg_price"] == "99"
+    assert service.get_open_positions()[0]["stop_loss_price"] == "97"
+
+    service.on_trade(trade("SPY", 4, 96.0))
+    take_profit, stop_loss = order._raw["legs"]
+    assert take_profit["status"] == "canceled"
+    # The triggered stop fills at the market, with slippage
+    assert float(stop_loss["filled_avg_price"]) == pytest.approx(96 * 0.999)
+    assert service.cash == pytest.approx(10000 - 990 + 959.04)
+
+
+def test_marketable_limit_fills_at_the_market_and_orders_are_validated():
+    from fastapi import HTTPException
+    from app.services.simulated_alpaca import SimulatedAlpacaService
+
+    service = SimulatedAlpacaService(initial_capital=1000)
+    service.on_trade(trade("SPY", 1, 100.0))
+
+    assert (
+        service.submit_order(
+            "SPY", "buy", "limit", "day", qty=2, limit_price=105
+        ).filled_avg_price
+        == "100"
+    )
+    with pytest.raises(HTTPException):
+        service.submit_order("SPY", "buy", "market", "day", qty=50)
+    with pytest.raises(HTTPException):
+        service.submit_order("SPY", "sell", "market", "day", qty=5)
+    with pytest.raises(HTTPException):
+        service.submit_order("SPY", "buy", "stop", "day", qty=1)
+    assert [o["status"] for o in service.get_orders()] == ["filled"]
+
+
+def test_synthetic_batches_continue_each_symbols_walk():
+    from app.services.synthetic_stream import SyntheticTradeStream
+
+    stream = SyntheticTradeStream(symbols=["SPY", "QQQ"], seed=7)
+    first = stream.batch(1000, 0, 10**9)
+    second = stream.batch(1000, 10**9, 2 * 10**9)
+
+    timestamps = [t._raw["timestamp"] for t in first + second]
+    assert timestamps == sorted(timestamps)
+    assert {t.symbol for t in first} == {"SPY", "QQQ"}
+    last_spy = [t.price for t in first if t.symbol == "SPY"][-1]
+    next_spy = [t.price for t in second if t.symbol == "SPY"][0]
+    assert abs(np.log(next_spy / last_spy)) < 0.01
+    assert stream.produced == 2000
+
+
+@pytest.mark.asyncio
+async def test_start_stream_feeds_subscribed_symbols_at_the_rate():
+    from app.services.simulated_alpaca import SimulatedAlpacaService
+    from app.services.synthetic_stream import SyntheticTradeStream
+
+    stream = SyntheticTradeStream(rate=20000, seed=1)
+    service = SimulatedAlpacaService(stream=stream)
+    strategy_manager = SimpleNamespace(
+        active_symbols=lambda: {"SPY"}, run_strategy_on_trade=AsyncMock()
+    )
+
+    await service.start_stream(strategy_manager)
+    await asyncio.sleep(0.2)
+    await service.aclose()
+
+    calls = strategy_manager.run_strategy_on_trade.await_count
+    assert 1000 < calls <= 20000 * 0.3
+    assert set(service.last_prices) == {"SPY"}
@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def strategy_manager(monkeypatch):
+    from app.core.strategy_manager import StrategyManager
+
+    monkeypatch.setattr(StrategyManager, "_discover_strategies", lambda self: {})
+    alpaca_service = MagicMock()
+    return StrategyManager(
+        alpaca_service, MagicMock(), MagicMock(), MagicMock(), MagicMock(), MagicMock()
+    )
+
+
+def make_strategy(name, symbol):
+    evaluation = SimpleNamespace(
+        policy="every_trade", on_trade=AsyncMock(), cancel=MagicMock()
+    )
+    return SimpleNamespace(
+        name=name, symbol=symbol, timeframe="1Day", evaluation=evaluation
+    )
+
+
+@pytest.mark.asyncio
+async def test_trades_reach_only_strategies_on_their_symbol(strategy_manager):
+    rsi_spy, macd_spy, rsi_qqq = (
+        make_strategy("rsi", "SPY"),
+        make_strategy("macd", "SPY"),
+        make_strategy("rsi", "QQQ"),
+    )
+    for strategy in (rsi_spy, macd_spy, rsi_qqq):
+        strategy_manager.add_strategy(strategy)
+
+    trade = SimpleNamespace(symbol="SPY")
+    await strategy_manager.run_strategy_on_trade(trade)
+
+    rsi_spy.evaluation.on_trade.assert_awaited_once_with(trade)
+    macd_spy.evaluation.on_trade.assert_awaited_once_with(trade)
+    rsi_qqq.evaluation.on_trade.assert_not_awaited()
+    assert strategy_manager.get_strategy("rsi", "QQQ") is rsi_qqq
+
+
+def test_add_replaces_and_remove_updates_subscriptions(strategy_manager):
+    first, second = make_strategy("rsi", "SPY"), make_strategy("rsi", "SPY")
+    strategy_manager.add_strategy(first)
+    strategy_manager.add_strategy(second)
+
+    assert strategy_manager.strategies_for("SPY") == (second,)
+    first.evaluation.cancel.assert_called_once()
+    second.evaluation.cancel.assert_not_called()
+
+    snapshot = strategy_manager.strategies_for("SPY")
+    assert strategy_manager.remove_strategy("rsi", "SPY") is second
+    assert strategy_manager.remove_strategy("rsi", "SPY") is None
+
+    assert snapshot == (second,)
+    second.evaluation.cancel.assert_called_once()
+    assert strategy_manager.active_strategies == ()
+    strategy_manager.alpaca_service.set_trade_symbols.assert_called_with(set())
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_pending_throttled_evaluation(strategy_manager):
+    from app.core.evaluation import THROTTLE, EvaluationGate
+
+    evaluated = []
+
+    async def evaluate(trade):
+        evaluated.append(trade.price)
+
+    strategy = make_strategy("rsi", "SPY")
+    strategy.evaluation = EvaluationGate(evaluate, THROTTLE, max_per_second=10)
+    strategy_manager.add_strategy(strategy)
+
+    await strategy_manager.run_strategy_on_trade(SimpleNamespace(symbol="SPY", price=1))
+    await asyncio.sleep(0.01)
+    # Throttled: evaluated once the interval has passed, unless stopped first
+    await strategy_manager.run_strategy_on_trade(SimpleNamespace(symbol="SPY", price=2))
+    strategy_manager.remove_strategy("rsi", "SPY")
+    # A trade the stream handler had already routed before the stop
+    await strategy.evaluation.on_trade(SimpleNamespace(symbol="SPY", price=3))
+    await asyncio.sleep(0.15)
+
+    assert evaluated == [1]
+    await strategy.evaluation.wait_idle()
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from app.core.trade_tape import TAPE_DTYPE, TradeTape, TradeTapeWriter
+
+
+def trade(symbol, when, price, size=100, conditions=("@",)):
+    return SimpleNamespace(
+        symbol=symbol,
+        price=price,
+        size=size,
+        conditions=list(conditions),
+        _raw={"timestamp": pd.Timestamp(when, tz="America/New_York").value},
+    )
+
+
+def test_trades_are_recorded_per_market_day(tmp_path):
+    writer = TradeTapeWriter(str(tmp_path), buffer_records=2)
+    writer.record(trade("SPY", "2024-03-04 09:30", 510.1, conditions=("@", "F", "T")))
+    writer.record(trade("QQQ", "2024-03-04 09:30:01", 440.5))
+    writer.record(trade("SPY", "2024-03-04 23:59", 511.0))
+    writer.record(trade("SPY", "2024-03-05 00:01", 512.0, size=7))
+    writer.close()
+
+    tape = TradeTape(str(tmp_path))
+    assert tape.days() == ["2024-03-04", "2024-03-05"]
+    assert tape.symbols == ["SPY", "QQQ"]
+
+    records = tape.records("2024-03-04")
+    assert isinstance(records, np.memmap) and records.dtype == TAPE_DTYPE
+    assert records["price"].tolist() == [510.1, 440.5, 511.0]
+    assert records["symbol_id"].tolist() == [0, 1, 0]
+
+    frame = tape.frame("2024-03-05")
+    assert frame["symbol"].tolist() == ["SPY"] and frame["size"].tolist() == [7]
+    assert tape.frame("2024-03-04")["conditions"].iloc[0] == ["@", "F", "T"]
+
+
+def test_reopening_appends_and_drops_a_torn_record(tmp_path):
+    writer = TradeTapeWriter(str(tmp_path))
+    writer.record(trade("SPY", "2024-03-04 10:00", 510.0))
+    writer.close()
+    # A crash mid-write leaves part of a record behind
+    with open(tmp_path / "2024-03-04.tape", "ab") as f:
+        f.write(b"\x01" * 5)
+    assert len(TradeTape(str(tmp_path)).records("2024-03-04")) == 1
+
+    writer = TradeTapeWriter(str(tmp_path))
+    writer.record(trade("IWM", "2024-03-04 10:01", 200.0))
+    writer.record(trade("SPY", "2024-03-04 10:02", 511.0))
+    writer.close()
+
+    tape = TradeTape(str(tmp_path))
+    assert tape.symbols == ["SPY", "IWM"]
+    assert tape.frame("2024-03-04")["symbol"].tolist() == ["SPY", "IWM", "SPY"]
+    assert (tmp_path / "2024-03-04.tape").stat().st_size == 3 * TAPE_DTYPE.itemsize
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+class SmaCrossoverLike:
+    def __init__(
+        self, *services, symbol=None, fast_period=10, slow_period=30, **kwargs
+    ):
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+
+
+def make_bars(n=600, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    index = pd.date_range("2020-01-01", periods=n, freq="B", tz="UTC", name="timestamp")
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + rng.random(n) * 2,
+            "low": close - rng.random(n) * 2,
+            "close": close,
+            "volume": 1000.0,
+        },
+        index=index,
+    )
+
+
+class InlineExecutors:
+    async def run_cpu(self, fn, *args):
+        return fn(*args)
+
+
+@pytest.fixture
+def walk_forward(monkeypatch):
+    from app.backtester import optimizer, walk_forward
+
+    monkeypatch.setattr(optimizer, "get_strategy_class", lambda name: SmaCrossoverLike)
+    monkeypatch.setattr(walk_forward, "executors", InlineExecutors())
+    walk_forward._columns_by_block.clear()
+    return walk_forward
+
+
+def test_windows_roll_or_anchor(walk_forward):
+    rolling = walk_forward.walk_forward_windows(100, 50, 20)
+    anchored = walk_forward.walk_forward_windows(100, 50, 10, anchored=True)
+    gapped = walk_forward.walk_forward_windows(100, 50, 10, step=25)
+
+    assert rolling == [(slice(0, 50), slice(50, 70)), (slice(20, 70), slice(70, 90))]
+    assert [train.start for train, _ in anchored] == [0, 0, 0, 0, 0]
+    assert [test.start for _, test in anchored] == [50, 60, 70, 80, 90]
+    assert [test.start for _, test in gapped] == [50, 75]
+
+
+@pytest.mark.asyncio
+async def test_overlapping_test_windows_are_rejected(walk_forward):
+    with pytest.raises(ValueError):
+        walk_forward.walk_forward_windows(40, 10, 10, step=5)
+    with pytest.raises(ValueError):
+        await walk_forward.walk_forward(
+            make_bars(40),
+            "sma_crossover",
+            {"fast_period": [3]},
+            train_bars=10,
+            test_bars=10,
+            step=5,
+        )
+
+
+@pytest.mark.asyncio
+async def test_out_of_sample_curve_chains_test_windows(walk_forward):
+    bars = make_bars(600)
+    grid = {"fast_period": [3, 5, 10], "slow_period": [20, 40]}
+
+    result = await walk_forward.walk_forward(
+        bars, "sma_crossover", grid, train_bars=200, test_bars=100
+    )
+
+    assert len(result["windows"]) == 4
+    assert len(result["equity_curve"]) == 400
+    assert result["equity_curve"][0]["date"] == bars.index[200].isoformat()
+    # Each window's out-of-sample return compounds into the stitched curve
+    growth = np.prod(
+        [1 + w["out_of_sample_return_pct"] / 100 for w in result["windows"]]
+    )
+    assert result["out_of_sample"]["final_portfolio_value"] == pytest.approx(
+        100000 * growth, rel=1e-3
+    )
+    # Every window reused the indicators computed for the first one
+    assert len(walk_forward._columns_by_block) == 1